@@ -1,53 +1,116 @@
 import base64
+from typing import Dict, Any, Callable, List
 
 import rapidjson
 
+_encoder = rapidjson.Encoder()
+_decoder = rapidjson.Decoder()
+_unparsed = object()
 
-def _format_record(object_type, record_payload):
-    if object_type == 'Encounter':
-        return _format_encounter_record(record_payload)
-    raise RuntimeError(f'do not know how to manage {record_payload} for object_type: {object_type}')
-
-
-def _format_encounter_record(record_payload):
-    extracted_data = record_payload.get('extracted_data', {})
-    source_data = extracted_data.get('source', {})
-    patient_data = extracted_data.get('patient_data', [{}])
-    standard_record = {
-        'object_type': record_payload.get('object_type'),
-        'identifier': record_payload.get('identifier'),
-        'id_value': record_payload.get('id_value'),
-        'extracted_data': {
-            'source': {
-                'id_source': source_data.get('id_source'),
-                'encounter_id': source_data.get('encounter_id'),
-                'provider_id': source_data.get('provider_id'),
-                'patient_id': source_data.get('patient_id'),
-                'encounter_type': source_data.get('encounter_type'),
-                'encounter_datetime_in': source_data.get('encounter_datetime_in'),
-                'encounter_datetime_out': source_data.get('encounter_datetime_out'),
-                'documentation': source_data.get('documentation')
-            },
-            'patient_data': [
-                {
-                    'last_name': x.get('last_name'),
-                    'first_name': x.get('first_name'),
-                    'dob': x.get('dob')
-                } for x in patient_data
-            ]
-        }
+_encounter_template = {
+    'object_type': None,
+    'identifier': None,
+    'id_value': None,
+    'extracted_data': {
+        'source': {
+            'id_source': None,
+            'encounter_id': None,
+            'provider_id': None,
+            'patient_id': None,
+            'encounter_type': None,
+            'encounter_datetime_in': None,
+            'encounter_datetime_out': None,
+            'documentation': None
+        },
+        'patient_data': [{
+            'last_name': None,
+            'first_name': None,
+            'dob': None
+        }]
     }
-    return rapidjson.dumps(standard_record)
+}
+
+
+def _compile_projection(template: Dict[str, Any]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """compiles a nested template into a function which projects a record onto the shape of the template
+
+        each key of the template is read from the record with .get, a value of None copies the field as it is, a
+            dict projects the nested object (defaulting to {}), and a list holding one dict projects every member of
+            the nested list (defaulting to [{}])
+
+    Args:
+        template: the shape of the projected record
+
+    Returns:
+        a function taking a record and returning its projection
+
+    """
+    steps = []
+    for field_name, field_template in template.items():
+        if field_template is None:
+            steps.append((field_name, 'field', None))
+            continue
+        if isinstance(field_template, dict):
+            steps.append((field_name, 'object', _compile_projection(field_template)))
+            continue
+        steps.append((field_name, 'list', _compile_projection(field_template[0])))
+    steps = tuple(steps)
+
+    def _project(record: Dict[str, Any]) -> Dict[str, Any]:
+        projected = {}
+        for name, kind, nested in steps:
+            if kind == 'field':
+                projected[name] = record.get(name)
+            elif kind == 'object':
+                projected[name] = nested(record.get(name, {}))
+            else:
+                projected[name] = [nested(x) for x in record.get(name, [{}])]
+        return projected
+    return _project
+
+
+_transformers = {
+    'Encounter': _compile_projection(_encounter_template)
+}
+
+
+def _format_record(object_type, record_payload):
+    try:
+        transformer = _transformers[object_type]
+    except KeyError:
+        raise RuntimeError(f'do not know how to manage {record_payload} for object_type: {object_type}')
+    return _encoder(transformer(record_payload))
+
+
+def _decode_payloads(original_payloads: List[bytes]) -> List[Any]:
+    """parses each payload of the batch on its own, with the module level decoder
+
+        the payloads are not joined and parsed as a whole, a malformed payload can combine with its neighbours into
+            valid JSON, which would attribute records to the wrong recordId
+
+    Returns:
+        the parsed payloads, with _unparsed in place of those which could not be parsed
+
+    """
+    parsed_payloads = []
+    for original_payload in original_payloads:
+        try:
+            parsed_payloads.append(_decoder(original_payload))
+        except rapidjson.JSONDecodeError:
+            parsed_payloads.append(_unparsed)
+    return parsed_payloads
 
 
 def format_fire_hosed_extractions(event, context):
     output = []
-
-    for record in event['records']:
+    records = event['records']
+    original_payloads = [base64.b64decode(x['data']) for x in records]
+    parsed_payloads = _decode_payloads(original_payloads)
+    for record, original_payload, record_payload in zip(records, original_payloads, parsed_payloads):
         record_id = record['recordId']
-        original_payload = base64.b64decode(record['data'])
         try:
-            record_payload = rapidjson.loads(original_payload)
+            if record_payload is _unparsed:
+                raise RuntimeError(f'could not parse the payload of record: {record_id}')
             object_type = record_payload['object_type']
             payload = _format_record(object_type, record_payload)
             payload = f'{payload}\n'
@@ -57,7 +120,7 @@ def format_fire_hosed_extractions(event, context):
                 'result': 'Ok',
                 'data': base64.b64encode(payload.encode())
             }
-        except (rapidjson.JSONDecodeError, KeyError, RuntimeError):
+        except (KeyError, RuntimeError):
             output_record = {
                 'recordId': record_id,
                 'result': 'ProcessingFailed',
@@ -1,11 +1,15 @@
+import asyncio
 import logging
 from collections import deque
-from copy import deepcopy
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from queue import Queue
 from threading import Thread
+from typing import Dict, List, Tuple
 
-import boto3
-
+from toll_booth.obj import config
+from toll_booth.obj.data_objects import SensitiveWriteBuffer
 from toll_booth.obj.index.index_manager import IndexManager
 from toll_booth.obj.progress_tracking import Overseer
 from toll_booth.obj.regulators import ObjectRegulator, EdgeRegulator
@@ -30,12 +34,7 @@ def _startup(target_fn, num_workers):
 
 
 def _lookup_resource(resource_name):
-    client = boto3.client('ssm')
-    response = client.get_parameter(
-        Name=resource_name
-    )
-    parameter = response['Parameter']
-    return parameter['Value']
+    return config.lookup_parameter(resource_name)
 
 
 class AioMaster:
@@ -47,113 +46,236 @@ class AioMaster:
                  schema: Schema,
                  num_potential_workers: int,
                  num_identified_workers: int,
-                 progress_table_name: str):
+                 progress_table_name: str,
+                 buffer_progress: bool = True,
+                 batch_lookups: bool = False,
+                 index_manager: IndexManager = None,
+                 progress_table=None,
+                 buffer_sensitive: bool = True,
+                 sensitive_writes: SensitiveWriteBuffer = None):
         self._schema = schema
         self._num_potential_workers = num_potential_workers
         self._num_identified_workers = num_identified_workers
         self._potential_queue = Queue()
         self._identified_queue = Queue()
         self._results = deque()
+        self._worker_errors = deque()
         self._source_vertex = None
         self._source_vertex_schema_entry = schema[source_object_type]
         self._extracted_data = extracted_data
         self._source_object_type = source_object_type
-        self._overseer = Overseer(progress_table_name, identifier, id_value)
+        self._overseer = Overseer(
+            progress_table_name, identifier, id_value, buffered=buffer_progress, table=progress_table)
+        self._batch_lookups = batch_lookups
+        self._index_manager = index_manager
+        if sensitive_writes is None and buffer_sensitive:
+            sensitive_writes = SensitiveWriteBuffer()
+        self._sensitive_writes = sensitive_writes
 
     def work(self):
-        potential_workers = _startup(self._check_for_existing_vertexes, self._num_potential_workers)
-        identified_workers = _startup(self._generate_potential_edge, self._num_identified_workers)
-        self._generate_source_vertex()
-        self._derive_potential_connections()
-        self._potential_queue.join()
-        self._identified_queue.join()
-        _shutdown(self._potential_queue, potential_workers)
-        _shutdown(self._identified_queue, identified_workers)
-        results = [x for x in self._results]
-        self._overseer.mark_stage_completed('leech', [{a: b.for_gql for a, b in x.items()} for x in results])
+        with self._recording_progress():
+            potential_workers = _startup(self._check_for_existing_vertexes, self._num_potential_workers)
+            identified_workers = _startup(self._generate_potential_edge, self._num_identified_workers)
+            try:
+                self._generate_source_vertex()
+                self._flush_progress()
+                self._derive_potential_connections()
+                self._flush_progress()
+                self._potential_queue.join()
+                self._identified_queue.join()
+            finally:
+                _shutdown(self._potential_queue, potential_workers)
+                _shutdown(self._identified_queue, identified_workers)
+            if self._worker_errors:
+                raise self._worker_errors[0]
+            self._flush_progress()
+            results = [x for x in self._results]
+            self._mark_stage_completed('leech', [{a: b.for_gql for a, b in x.items()} for x in results])
         return results
 
+    def _flush_sensitive_writes(self):
+        """stores the sensitive values queued while regulating, they must be stored before the leech returns"""
+        if self._sensitive_writes is not None:
+            self._sensitive_writes.flush()
+
+    def _flush_progress(self):
+        """stores the queued sensitive values, then the buffered stage results
+
+            the values are always stored first, so a stage is never recorded as completed while the sensitive
+                values it produced are not yet stored. if the values can not be stored, neither are the stages
+        """
+        self._flush_sensitive_writes()
+        self._overseer.flush()
+
+    def _mark_stage_completed(self, stage_name, stage_results):
+        if not self._overseer.is_buffered:
+            self._flush_sensitive_writes()
+        self._overseer.mark_stage_completed(stage_name, stage_results)
+
+    @contextmanager
+    def _recording_progress(self):
+        """flushes the progress of the leech on the way out, whether or not the work succeeded"""
+        try:
+            yield
+        except Exception:
+            try:
+                self._flush_progress()
+            except Exception as e:
+                logging.error(f'could not record the progress of a failed leech: {e}')
+            raise
+        self._flush_progress()
+
     def _generate_source_vertex(self):
         schema_entry = self._source_vertex_schema_entry
-        regulator = ObjectRegulator(schema_entry)
+        regulator = ObjectRegulator(schema_entry, self._sensitive_writes)
         object_data = self._extracted_data['source']
         vertex_data = regulator.create_potential_vertex_data(object_data)
         if not vertex_data.is_schema_complete(schema_entry):
             raise RuntimeError(f'could not completely construct a source vertex from: {self._extracted_data}')
-        self._source_vertex = vertex_data
-        self._overseer.mark_stage_completed('generate_source_vertex', vertex_data.for_gql)
+        self._source_vertex = vertex_data.freeze()
+        self._mark_stage_completed('generate_source_vertex', vertex_data.for_gql)
 
     def _derive_potential_connections(self):
-        schema_entry = self._source_vertex_schema_entry
-        arbiter = RuleArbiter(self._source_vertex, self._schema, schema_entry)
-        potential_vertexes = arbiter.process_rules(self._extracted_data)
-        stage_results = [{'potential_vertex': x[0].for_gql, 'rule_name': str(x[1])} for x in potential_vertexes]
-        self._overseer.mark_stage_completed('derive_potential_connections', stage_results)
+        potential_vertexes = self._derive_potential_vertexes()
+        if self._batch_lookups:
+            for rule_entry, results in self._identify_vertexes_batched(potential_vertexes):
+                self._queue_identified_vertexes(rule_entry, results)
+            return
         for vertex_entry in potential_vertexes:
             vertex = vertex_entry[0]
             rule_entry = vertex_entry[1]
             self._potential_queue.put({'potential_vertex': vertex, 'rule_entry': rule_entry})
 
+    def _derive_potential_vertexes(self):
+        schema_entry = self._source_vertex_schema_entry
+        arbiter = RuleArbiter(self._source_vertex, self._schema, schema_entry, self._sensitive_writes)
+        potential_vertexes = arbiter.process_rules(self._extracted_data)
+        stage_results = [{'potential_vertex': x[0].for_gql, 'rule_name': str(x[1])} for x in potential_vertexes]
+        self._mark_stage_completed('derive_potential_connections', stage_results)
+        return potential_vertexes
+
+    @property
+    def index_manager(self) -> IndexManager:
+        if self._index_manager is None:
+            self._index_manager = IndexManager()
+        return self._index_manager
+
     def _check_for_existing_vertexes(self):
-        index_manager = IndexManager()
+        index_manager = self.index_manager
         while True:
             potential_vertex_data = self._potential_queue.get()
             if potential_vertex_data is None:
                 return
-            potential_vertex = potential_vertex_data['potential_vertex']
-            rule_entry = potential_vertex_data['rule_entry']
-            results = self.__check_for_existing_vertexes(potential_vertex, rule_entry, index_manager)
-            stage_name = f'check_for_existing_vertexes_{potential_vertex.internal_id}_{rule_entry.edge_type}'
-            stage_results = {'status': results['status'], 'existing_vertexes': [x.for_gql for x in results['vertexes']]}
-            self._overseer.mark_stage_completed(stage_name, stage_results)
-            self._potential_queue.task_done()
-
-    def __check_for_existing_vertexes(self, potential_vertex, rule_entry, index_manager: IndexManager):
-        edge_type = rule_entry.edge_type
-        edge_schema_entry = self._schema[edge_type]
-        identified_kwargs = {
-            'rule_entry': rule_entry,
-            'edge_schema': edge_schema_entry
-        }
+            try:
+                potential_vertex = potential_vertex_data['potential_vertex']
+                rule_entry = potential_vertex_data['rule_entry']
+                results = self._identify_vertexes(potential_vertex, rule_entry, index_manager)
+                self._queue_identified_vertexes(rule_entry, results)
+            except Exception as e:
+                logging.error(f'failed to check for existing vertexes for {potential_vertex_data}: {e}')
+                self._worker_errors.append(e)
+            finally:
+                self._potential_queue.task_done()
+
+    def _identify_vertexes(self, potential_vertex, rule_entry, index_manager: IndexManager) -> Dict:
         if potential_vertex.is_schema_complete(self._schema[potential_vertex.object_type]):
             logging.info(f'potential_vertex: {potential_vertex} is fully ready to graph')
-            identified_kwargs['identified_vertex'] = potential_vertex
-            self._identified_queue.put(identified_kwargs)
-            return {'vertexes': [potential_vertex], 'status': 'fully_ready_to_graph'}
-        found_vertexes = index_manager.find_potential_vertexes(
-            potential_vertex.object_type, potential_vertex.vertex_properties, self._schema)
+            results = {'vertexes': [potential_vertex], 'status': 'fully_ready_to_graph'}
+        else:
+            found_vertexes = index_manager.find_potential_vertexes(
+                potential_vertex.object_type, potential_vertex.vertex_properties, self._schema)
+            results = self._route_found_vertexes(potential_vertex, rule_entry, found_vertexes)
+        self._mark_existing_vertexes(potential_vertex, rule_entry, results)
+        return results
+
+    def _identify_vertexes_batched(self, potential_vertexes) -> List[Tuple]:
+        """checks the index for every incomplete potential vertex with a single multi-search request
+
+            used in place of the potential vertex workers when batch_lookups is set
+
+        a lookup whose search failed is marked as failed for its rule alone, and connects to no vertexes
+
+        Returns:
+            a list of (rule_entry, results) tuples, one for each potential vertex
+
+        """
+        identified = []
+        pending = []
+        for potential_vertex, rule_entry in potential_vertexes:
+            if potential_vertex.is_schema_complete(self._schema[potential_vertex.object_type]):
+                logging.info(f'potential_vertex: {potential_vertex} is fully ready to graph')
+                results = {'vertexes': [potential_vertex], 'status': 'fully_ready_to_graph'}
+                self._mark_existing_vertexes(potential_vertex, rule_entry, results)
+                identified.append((rule_entry, results))
+                continue
+            pending.append((potential_vertex, rule_entry))
+        if not pending:
+            return identified
+        index_manager = self.index_manager
+        lookups = [(x[0].object_type, x[0].vertex_properties) for x in pending]
+        found = index_manager.find_potential_vertexes_many(lookups, self._schema)
+        for pending_entry, found_vertexes in zip(pending, found):
+            potential_vertex, rule_entry = pending_entry
+            if isinstance(found_vertexes, Exception):
+                logging.error(f'could not check the index for {potential_vertex}, '
+                              f'{rule_entry.edge_type}: {found_vertexes}')
+                results = {'vertexes': [], 'status': 'lookup_failed', 'message': str(found_vertexes)}
+            else:
+                results = self._route_found_vertexes(potential_vertex, rule_entry, found_vertexes)
+            self._mark_existing_vertexes(potential_vertex, rule_entry, results)
+            identified.append((rule_entry, results))
+        return identified
+
+    def _mark_existing_vertexes(self, potential_vertex, rule_entry, results):
+        stage_name = f'check_for_existing_vertexes_{potential_vertex.internal_id}_{rule_entry.edge_type}'
+        stage_results = {'status': results['status'], 'existing_vertexes': [x.for_gql for x in results['vertexes']]}
+        if 'message' in results:
+            stage_results['message'] = results['message']
+        self._mark_stage_completed(stage_name, stage_results)
+
+    @staticmethod
+    def _route_found_vertexes(potential_vertex, rule_entry, found_vertexes) -> Dict:
         if found_vertexes:
-            results = []
-            for identified_vertex in found_vertexes:
-                logging.info(f'found an existing vertex which matches: {potential_vertex}, send it to graph')
-                identified_kwargs['identified_vertex'] = identified_vertex
-                self._identified_queue.put(identified_kwargs)
-                results.append(identified_vertex)
-            return {'vertexes': results, 'status': 'found_existing_vertexes'}
+            logging.info(f'found {len(found_vertexes)} existing vertexes which match: {potential_vertex}, '
+                         f'send them to graph')
+            return {'vertexes': found_vertexes, 'status': 'found_existing_vertexes'}
         if rule_entry.is_create:
             raise RuntimeError(f'could not satisfy rule for {rule_entry.edge_type}, unable to create vertex from data')
+        return {'vertexes': [], 'status': 'no_existing_vertexes'}
+
+    def _queue_identified_vertexes(self, rule_entry, results):
+        for identified_vertex in results['vertexes']:
+            self._identified_queue.put({'rule_entry': rule_entry, 'identified_vertex': identified_vertex})
 
     def _generate_potential_edge(self):
         while True:
             identified_vertex_data = self._identified_queue.get()
             if identified_vertex_data is None:
                 return
-            edge_schema_entry = identified_vertex_data['edge_schema']
-            rule_entry = identified_vertex_data['rule_entry']
-            identified_vertex = identified_vertex_data['identified_vertex']
-            potential_edge = self.__generate_potential_edge(edge_schema_entry, identified_vertex, rule_entry)
-            result_package = {
-                'source_vertex': deepcopy(self._source_vertex),
-                'other_vertex': deepcopy(identified_vertex),
-                'edge': potential_edge
-            }
-            self._results.append(result_package)
-            stage_name = f'generate_potential_edge_{identified_vertex.internal_id}_{potential_edge.object_type}'
-            self._overseer.mark_stage_completed(stage_name, potential_edge.for_gql)
-            self._identified_queue.task_done()
+            try:
+                rule_entry = identified_vertex_data['rule_entry']
+                identified_vertex = identified_vertex_data['identified_vertex']
+                self._results.append(self._generate_result_package(rule_entry, identified_vertex))
+            except Exception as e:
+                logging.error(f'failed to generate a potential edge for {identified_vertex_data}: {e}')
+                self._worker_errors.append(e)
+            finally:
+                self._identified_queue.task_done()
+
+    def _generate_result_package(self, rule_entry, identified_vertex) -> Dict:
+        edge_schema_entry = self._schema[rule_entry.edge_type]
+        potential_edge = self.__generate_potential_edge(edge_schema_entry, identified_vertex, rule_entry)
+        result_package = {
+            'source_vertex': self._source_vertex,
+            'other_vertex': identified_vertex.freeze(),
+            'edge': potential_edge.freeze()
+        }
+        stage_name = f'generate_potential_edge_{identified_vertex.internal_id}_{potential_edge.object_type}'
+        self._mark_stage_completed(stage_name, potential_edge.for_gql)
+        return result_package
 
     def __generate_potential_edge(self, edge_schema_entry, identified_vertex, rule_entry):
-        edge_regulator = EdgeRegulator(edge_schema_entry)
+        edge_regulator = EdgeRegulator(edge_schema_entry, self._sensitive_writes)
         inbound = rule_entry.inbound
         edge_kwargs = {
             'source_vertex': self._source_vertex,
@@ -163,3 +285,50 @@ class AioMaster:
         }
         edge_data = edge_regulator.generate_potential_edge_data(**edge_kwargs)
         return edge_data
+
+
+class AsyncAioMaster(AioMaster):
+    """runs the same stages as the AioMaster, as coroutines on an event loop instead of queues and worker threads
+
+        index lookups, progress updates and edge generation are scheduled as coroutines, each potential vertex
+            flowing straight from lookup into edge generation, with at most max_concurrency blocking calls in
+            flight at once. the work() contract is identical to that of the AioMaster
+    """
+    def __init__(self, *args, max_concurrency: int = 10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._max_concurrency = max_concurrency
+
+    def work(self):
+        return asyncio.run(self._work())
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor, self._recording_progress():
+            async def _bounded(fn, *args):
+                async with semaphore:
+                    return await loop.run_in_executor(executor, partial(fn, *args))
+
+            async def _connect(rule_entry, results):
+                return await asyncio.gather(
+                    *[_bounded(self._generate_result_package, rule_entry, x) for x in results['vertexes']])
+
+            async def _identify_and_connect(potential_vertex, rule_entry, index_manager):
+                results = await _bounded(self._identify_vertexes, potential_vertex, rule_entry, index_manager)
+                return await _connect(rule_entry, results)
+
+            await _bounded(self._generate_source_vertex)
+            await _bounded(self._flush_progress)
+            potential_vertexes = await _bounded(self._derive_potential_vertexes)
+            await _bounded(self._flush_progress)
+            if self._batch_lookups:
+                identified = await _bounded(self._identify_vertexes_batched, potential_vertexes)
+                connected = await asyncio.gather(*[_connect(x, y) for x, y in identified])
+            else:
+                index_manager = self.index_manager
+                connected = await asyncio.gather(
+                    *[_identify_and_connect(x, y, index_manager) for x, y in potential_vertexes])
+            await _bounded(self._flush_progress)
+            results = [x for packages in connected for x in packages]
+            self._mark_stage_completed('leech', [{a: b.for_gql for a, b in x.items()} for x in results])
+        return results
@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+import time
+from typing import List, Dict, Any
+
+import boto3
+
+_MAX_NAMES_PER_CALL = 10
+
+_module_loaded_at = time.monotonic()
+_lock = threading.Lock()
+_parameters = {}
+_timings = {
+    'cold_start_seconds': None,
+    'ssm_calls': 0,
+    'ssm_seconds': 0.0
+}
+
+
+def _ttl():
+    ttl = os.getenv('CONFIG_TTL')
+    if ttl is None:
+        return None
+    return float(ttl)
+
+
+def _is_stale(parameter_name: str, now: float, ttl: float = None) -> bool:
+    cached = _parameters.get(parameter_name)
+    if cached is None:
+        return True
+    if ttl is None:
+        return False
+    return now - cached['loaded_at'] >= ttl
+
+
+def _fetch_parameters(parameter_names: List[str]) -> Dict[str, Any]:
+    client = boto3.client('ssm')
+    values = {}
+    for start in range(0, len(parameter_names), _MAX_NAMES_PER_CALL):
+        names = parameter_names[start:start + _MAX_NAMES_PER_CALL]
+        call_started = time.monotonic()
+        response = client.get_parameters(Names=names)
+        _timings['ssm_calls'] += 1
+        _timings['ssm_seconds'] += time.monotonic() - call_started
+        for parameter in response['Parameters']:
+            values[parameter['Name']] = parameter['Value']
+        for invalid_name in response.get('InvalidParameters', []):
+            logging.warning(f'parameter: {invalid_name} was requested, but is not present in SSM')
+    return values
+
+
+def load_config(variable_names: List[str]):
+    """resolves the named variables from SSM into the environment, once per container
+
+        variables already set in the environment (and not by this module) are left alone. everything else is fetched
+            with as few get_parameters calls as the SSM limit of 10 names per call allows, and held for the life of
+            the container, or until CONFIG_TTL seconds have passed, if that is set. names SSM does not hold are
+            remembered as missing for the same period
+
+    Args:
+        variable_names: the names of the SSM parameters, which are also the names of the environment variables
+
+    Returns: None
+
+    """
+    with _lock:
+        now = time.monotonic()
+        ttl = _ttl()
+        needed = [
+            x for x in variable_names
+            if (x not in os.environ or x in _parameters) and _is_stale(x, now, ttl)]
+        if needed:
+            values = _fetch_parameters(needed)
+            for parameter_name in needed:
+                parameter_value = values.get(parameter_name)
+                _parameters[parameter_name] = {'value': parameter_value, 'loaded_at': now}
+                if parameter_value is not None:
+                    os.environ[parameter_name] = parameter_value
+        if _timings['cold_start_seconds'] is None:
+            _timings['cold_start_seconds'] = time.monotonic() - _module_loaded_at
+
+
+def lookup_parameter(parameter_name: str) -> str:
+    """returns the value of a single SSM parameter, through the same cache as load_config"""
+    with _lock:
+        now = time.monotonic()
+        if _is_stale(parameter_name, now, _ttl()):
+            values = _fetch_parameters([parameter_name])
+            _parameters[parameter_name] = {'value': values.get(parameter_name), 'loaded_at': now}
+        parameter_value = _parameters[parameter_name]['value']
+    if parameter_value is None:
+        raise KeyError(parameter_name)
+    return parameter_value
+
+
+def config_timings() -> Dict[str, Any]:
+    """cold_start_seconds runs from the import of this module to the end of the first load_config"""
+    with _lock:
+        return dict(_timings)
+
+
+def invalidate():
+    with _lock:
+        _parameters.clear()
@@ -1,2 +1,2 @@
 from toll_booth.obj.data_objects.identifiers import InternalId, IdentifierStem, MissingObjectProperty
-from toll_booth.obj.data_objects.object_properties.sensitive_property import SensitivePropertyValue
+from toll_booth.obj.data_objects.object_properties.sensitive_property import SensitivePropertyValue, SensitiveWriteBuffer
@@ -1,4 +1,5 @@
 import ast
+import sys
 from datetime import datetime
 from decimal import Decimal
 from typing import Dict, Union, List, Tuple
@@ -10,6 +11,18 @@ from toll_booth.obj.schemata.schema_entry import SchemaVertexEntry
 from toll_booth.obj.utils import set_property_data_type
 
 
+_property_types = ('local_properties', 'stored_properties', 'sensitive_properties')
+
+
+def _intern_properties(object_properties: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    for object_property in object_properties:
+        for field_name in ('property_name', 'data_type'):
+            field_value = object_property.get(field_name)
+            if isinstance(field_value, str):
+                object_property[field_name] = sys.intern(field_value)
+    return object_properties
+
+
 def _parse_gql_property(gql_property_data: Dict[str, str]) -> Tuple[str, Dict[str, str]]:
     property_type = gql_property_data['__typename']
     del(gql_property_data['__typename'])
@@ -29,6 +42,11 @@ def _parse_gql_property(gql_property_data: Dict[str, str]) -> Tuple[str, Dict[st
 
 
 class VertexData(AlgObject):
+    __slots__ = (
+        '_object_type', '_internal_id', '_identifier', '_id_value', '_local_properties', '_stored_properties',
+        '_sensitive_properties', '_property_index', '_present_local_names', '_frozen', '_gql'
+    )
+
     def __init__(self,
                  object_type: str,
                  internal_id: str,
@@ -47,9 +65,13 @@ class VertexData(AlgObject):
         self._internal_id = internal_id
         self._identifier = identifier
         self._id_value = id_value
-        self._local_properties = local_properties
-        self._stored_properties = stored_properties
-        self._sensitive_properties = sensitive_properties
+        self._local_properties = _intern_properties(local_properties)
+        self._stored_properties = _intern_properties(stored_properties)
+        self._sensitive_properties = _intern_properties(sensitive_properties)
+        self._property_index = None
+        self._present_local_names = None
+        self._frozen = False
+        self._gql = None
 
     @classmethod
     def from_source_data(cls, source_dict):
@@ -87,6 +109,18 @@ class VertexData(AlgObject):
             json_dict.get('stored_properties'), json_dict.get('sensitive_properties')
         )
 
+    @property
+    def to_json(self):
+        return {
+            'object_type': self._object_type,
+            'internal_id': self._internal_id,
+            'identifier': self._identifier,
+            'id_value': self._id_value,
+            'local_properties': self._local_properties,
+            'stored_properties': self._stored_properties,
+            'sensitive_properties': self._sensitive_properties
+        }
+
     @property
     def local_properties(self):
         return self._local_properties
@@ -118,8 +152,20 @@ class VertexData(AlgObject):
             vertex_properties['stored_properties'] = self._stored_properties
         return vertex_properties
 
+    @property
+    def is_frozen(self) -> bool:
+        return self._frozen
+
     @property
     def for_gql(self):
+        if self._gql is not None:
+            return self._gql
+        gql = self._generate_gql()
+        if self._frozen:
+            self._gql = gql
+        return gql
+
+    def _generate_gql(self):
         return {
             'id_value': self._id_value,
             'identifier': self._identifier,
@@ -128,6 +174,19 @@ class VertexData(AlgObject):
             'vertex_properties': self.vertex_properties
         }
 
+    def freeze(self):
+        """marks this object as an immutable snapshot which can be shared freely between result packages
+
+            once frozen, the serialized form is built once and reused by every call to for_gql, so the object and
+                its properties must not be modified after freezing
+
+        Returns:
+            the frozen object, for chaining
+
+        """
+        self._frozen = True
+        return self
+
     @property
     def is_identifier_set(self):
         try:
@@ -138,19 +197,33 @@ class VertexData(AlgObject):
         except AttributeError:
             return False
 
+    def _index_properties(self) -> Dict[Tuple[str, str], Dict[str, str]]:
+        """builds the (property_type, property_name) index over the object properties, once per object
+
+            where a name is repeated within a property type, the first property wins, as it did for the linear scan
+        """
+        if self._property_index is None:
+            property_index = {}
+            present_local_names = set()
+            for property_type in _property_types:
+                for object_property in getattr(self, f'_{property_type}'):
+                    property_name = object_property['property_name']
+                    property_index.setdefault((property_type, property_name), object_property)
+                    if property_type == 'local_properties':
+                        if not isinstance(object_property['property_value'], MissingObjectProperty):
+                            present_local_names.add(property_name)
+            self._present_local_names = present_local_names
+            self._property_index = property_index
+        return self._property_index
+
     def get_vertex_property(self, property_type, property_name) -> Dict[str, str]:
-        object_properties = getattr(self, f'_{property_type}')
-        for object_property in object_properties:
-            if object_property['property_name'] == property_name:
-                return object_property
-        raise KeyError(property_name)
+        try:
+            return self._index_properties()[(property_type, property_name)]
+        except KeyError:
+            raise KeyError(property_name)
 
     def contains_vertex_property(self, property_type, property_name) -> bool:
-        object_properties = getattr(self, f'_{property_type}')
-        for object_property in object_properties:
-            if object_property['property_name'] == property_name:
-                return True
-        return False
+        return (property_type, property_name) in self._index_properties()
 
     def __getitem__(self, item):
         if item == 'object_type':
@@ -167,24 +240,17 @@ class VertexData(AlgObject):
         return self.is_identifiable(schema_entry) and self.is_properties_complete(schema_entry)
 
     def is_properties_complete(self, schema_entry: SchemaVertexEntry):
-        filtered_properties = {}
-        for property_class, vertex_properties in self.vertex_properties.items():
-            filtered = {x['property_name']: x for x in vertex_properties}
-            if property_class == 'local_properties':
-                filtered = {
-                    x['property_name']: x for x in vertex_properties
-                    if not isinstance(x['property_value'], MissingObjectProperty)}
-            filtered_properties[property_class] = filtered
+        property_index = self._index_properties()
         for property_name, property_schema in schema_entry.vertex_properties.items():
             if property_schema.sensitive:
-                if property_name not in filtered_properties['sensitive_properties']:
+                if ('sensitive_properties', property_name) not in property_index:
                     return False
                 continue
             if property_schema.is_stored:
-                if property_name not in filtered_properties['stored_properties']:
+                if ('stored_properties', property_name) not in property_index:
                     return False
                 continue
-            if property_name not in filtered_properties['local_properties']:
+            if property_name not in self._present_local_names:
                 return False
         return True
 
@@ -206,6 +272,8 @@ class VertexData(AlgObject):
 
 
 class EdgeData(VertexData):
+    __slots__ = ('_source_vertex_internal_id', '_target_vertex_internal_id')
+
     def __init__(self,
                  object_type: str,
                  internal_id: str,
@@ -256,6 +324,18 @@ class EdgeData(VertexData):
     def from_gql(cls, gql_dict):
         raise NotImplementedError()
 
+    @property
+    def to_json(self):
+        return {
+            'object_type': self._object_type,
+            'internal_id': self._internal_id,
+            'source_vertex_internal_id': self._source_vertex_internal_id,
+            'target_vertex_internal_id': self._target_vertex_internal_id,
+            'local_properties': self._local_properties,
+            'stored_properties': self._stored_properties,
+            'sensitive_properties': self._sensitive_properties
+        }
+
     @property
     def source_vertex_internal_id(self) -> str:
         return self._source_vertex_internal_id
@@ -268,8 +348,7 @@ class EdgeData(VertexData):
     def edge_properties(self):
         return self.vertex_properties
 
-    @property
-    def for_gql(self):
+    def _generate_gql(self):
         return {
             'edge_label': self.object_type,
             'internal_id': self.internal_id,
@@ -1,15 +1,29 @@
+import hashlib
+import os
+from functools import lru_cache
+
 from algernon import AlgObject
 
+_hash_cache_size = int(os.getenv('HASH_CACHE_SIZE', 8192))
+
+
+@lru_cache(maxsize=_hash_cache_size)
+def hash_internal_id(internal_id: str) -> str:
+    """the md5 hexdigest of an internal_id key string, memoized in a bounded cache (HASH_CACHE_SIZE, default 8192)"""
+    return hashlib.md5(internal_id.encode('utf-8')).hexdigest()
+
 
 class InternalId:
+    """the hashed key of a graph object, hashed once, when the InternalId is created"""
+    __slots__ = ('_internal_id', '_id_value')
+
     def __init__(self, internal_id):
         self._internal_id = internal_id
+        self._id_value = hash_internal_id(internal_id)
 
     @property
     def id_value(self):
-        import hashlib
-
-        return hashlib.md5(self._internal_id.encode('utf-8')).hexdigest()
+        return self._id_value
 
     def __str__(self):
         return self.id_value
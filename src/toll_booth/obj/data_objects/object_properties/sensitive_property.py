@@ -1,17 +1,42 @@
 import hashlib
 import logging
 import os
+import threading
+import time
+from functools import lru_cache
 
 import boto3
+from boto3.dynamodb.types import TypeSerializer
 
 from toll_booth.obj.utils import set_property_data_type
 
+_hash_cache_size = int(os.getenv('HASH_CACHE_SIZE', 8192))
+_MAX_TRANSACT_ITEMS = 100
+
+_UPDATE_EXPRESSION = 'SET sensitive_entry = if_not_exists(sensitive_entry, :s)'
+_retried_codes = (
+    'TransactionCanceledException', 'TransactionInProgressException', 'ThrottlingException',
+    'ProvisionedThroughputExceededException', 'InternalServerError'
+)
+
+
+@lru_cache(maxsize=_hash_cache_size)
+def _hash_pointer(property_name: str, source_internal_id: str) -> str:
+    pointer_string = ''.join([property_name, source_internal_id])
+    return hashlib.sha3_512(pointer_string.encode('utf-8')).hexdigest()
+
+
+def _log_dropped(entry, error):
+    logging.error(f'dropped the sensitive data entry for pointer: {entry[0]}, it can not be written: {error}')
+
 
 class SensitivePropertyValue:
     """
         data that is HIPAA relevant does not get stored directly onto the public graph, instead it is stored into
             a separate table and referenced by pointer
     """
+    __slots__ = ('_source_internal_id', '_property_name', '_sensitive_value', '_pointer')
+
     def __init__(self, source_internal_id, property_name, sensitive_value):
         """SensitiveData is any information that might be considered relevant to HIPAA
 
@@ -27,6 +52,7 @@ class SensitivePropertyValue:
         self._source_internal_id = source_internal_id
         self._property_name = property_name
         self._sensitive_value = sensitive_value
+        self._pointer = None
 
     @classmethod
     def from_insensitive_pointer(cls, pointer):
@@ -54,38 +80,44 @@ class SensitivePropertyValue:
 
     @property
     def pointer(self):
-        return self._create_pointer()
+        if self._pointer is None:
+            self._pointer = self._create_pointer()
+        return self._pointer
 
     def _create_pointer(self):
-        """ generates opaque pointer
+        """ generates opaque pointer, memoized per property_name and source_internal_id
 
         Returns:
 
         """
-        pointer_string = ''.join([self._property_name, self._source_internal_id])
-        return hashlib.sha3_512(pointer_string.encode('utf-8')).hexdigest()
+        return _hash_pointer(self._property_name, self._source_internal_id)
 
-    def store(self):
+    def store(self, write_buffer=None):
         """Push a sensitive value to remote storage
 
+            if a SensitiveWriteBuffer is provided, the value is queued on it and written when the buffer is flushed,
+                and the pointer is returned without waiting on the write
+
         Args:
+            write_buffer: the SensitiveWriteBuffer to queue the value on
 
-        Returns: None
+        Returns: the pointer to the stored value
 
         Raises:
             ClientError: the update operation could not take place
 
         """
-        import boto3
+        if write_buffer is not None:
+            return write_buffer.add(self)
         from botocore.exceptions import ClientError
         sensitive_table_name = os.environ['SENSITIVE_TABLE_NAME']
         resource = boto3.resource('dynamodb')
         table = resource.Table(sensitive_table_name)
-        pointer = self._create_pointer()
+        pointer = self.pointer
         try:
             table.update_item(
                 Key={'insensitive': pointer},
-                UpdateExpression='SET sensitive_entry = if_not_exists(sensitive_entry, :s)',
+                UpdateExpression=_UPDATE_EXPRESSION,
                 ExpressionAttributeValues={':s': self._sensitive_value},
                 ReturnValues='NONE'
             )
@@ -93,3 +125,136 @@ class SensitivePropertyValue:
         except ClientError as e:
             logging.error(f'failed to update a sensitive data entry: {e}')
             raise e
+
+
+class SensitiveWriteBuffer:
+    """holds sensitive values until flush is called, then writes them with as few calls as possible
+
+        pointers are deterministic, so the pointer for a value is returned as soon as it is added, the values are
+            written on flush with TransactWriteItems, batch_size (SENSITIVE_WRITE_BATCH_SIZE, default 25, at most the
+            DynamoDB limit of 100) at a time, each as the same if_not_exists update made by
+            SensitivePropertyValue.store, so that an existing value is never overwritten. a pointer added more than
+            once is written once, with the first value added. note that DynamoDB charges a transactional write twice
+            the write capacity of a plain update_item, the buffer trades that capacity for far fewer round trips
+
+        a buffer may be shared between threads, but a failed flush is raised to whichever caller made it, so a
+            buffer should not be shared between units of work that fail separately, such as the leeches of a batch
+    """
+    def __init__(self, table_name: str = None, batch_size: int = None, max_attempts: int = 5, client=None):
+        if batch_size is None:
+            batch_size = int(os.getenv('SENSITIVE_WRITE_BATCH_SIZE', 25))
+        self._table_name = table_name
+        self._batch_size = max(1, min(batch_size, _MAX_TRANSACT_ITEMS))
+        self._max_attempts = max_attempts
+        self._client = client
+        self._serializer = TypeSerializer()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def table_name(self):
+        if self._table_name is None:
+            self._table_name = os.environ['SENSITIVE_TABLE_NAME']
+        return self._table_name
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = boto3.client('dynamodb')
+        return self._client
+
+    @property
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def add(self, sensitive_property: SensitivePropertyValue) -> str:
+        pointer = sensitive_property.pointer
+        with self._lock:
+            self._pending.setdefault(pointer, sensitive_property.sensitive_value)
+        return pointer
+
+    def flush(self):
+        """writes every queued value
+
+            the queued values are swapped out of the buffer under the lock and written outside of it, so values can
+                be added while a flush is writing. flushes are made one at a time, so a flush does not return while
+                values queued before it are still being written by another flush
+
+            a batch that fails with a retryable error after max_attempts is put back for the next flush. a batch
+                that fails with any other error (ValidationException, etc) is written again one value at a time, so
+                that a single bad value does not hold up the rest. values that still can not be written are logged and
+                dropped, they would fail every later flush if they were kept. either way, the remaining batches are
+                still written before the first error is raised
+
+        Returns: None
+
+        Raises:
+            ClientError: a value could not be written, the first error met during the flush
+
+        """
+        from botocore.exceptions import ClientError
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            pending = list(pending.items())
+            errors = []
+            for start in range(0, len(pending), self._batch_size):
+                batch = pending[start:start + self._batch_size]
+                try:
+                    self._write_batch(batch)
+                except ClientError as e:
+                    if e.response['Error']['Code'] in _retried_codes:
+                        self._requeue(batch)
+                    elif len(batch) > 1:
+                        self._write_singly(batch)
+                    else:
+                        _log_dropped(batch[0], e)
+                    errors.append(e)
+            if errors:
+                raise errors[0]
+
+    def _write_batch(self, batch):
+        from botocore.exceptions import ClientError
+        transact_items = [{
+            'Update': {
+                'TableName': self.table_name,
+                'Key': {'insensitive': {'S': pointer}},
+                'UpdateExpression': _UPDATE_EXPRESSION,
+                'ExpressionAttributeValues': {':s': self._serializer.serialize(sensitive_value)}
+            }
+        } for pointer, sensitive_value in batch]
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                self.client.transact_write_items(TransactItems=transact_items)
+                return
+            except ClientError as e:
+                if e.response['Error']['Code'] not in _retried_codes or attempt == self._max_attempts:
+                    logging.error(f'failed to write a batch of sensitive data entries: {e}')
+                    raise e
+                logging.warning(f'could not write a batch of sensitive data entries, attempt {attempt}: {e}')
+                time.sleep(min(0.05 * 2 ** attempt, 2.0))
+
+    def _write_singly(self, batch):
+        from botocore.exceptions import ClientError
+        for entry in batch:
+            try:
+                self._write_batch([entry])
+            except ClientError as e:
+                if e.response['Error']['Code'] in _retried_codes:
+                    self._requeue([entry])
+                    continue
+                _log_dropped(entry, e)
+
+    def _requeue(self, batch):
+        with self._lock:
+            for pointer, sensitive_value in batch:
+                self._pending[pointer] = sensitive_value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+        return False
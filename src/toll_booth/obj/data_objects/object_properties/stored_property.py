@@ -3,23 +3,11 @@ import re
 import boto3
 
 from algernon import ajson
-from botocore.exceptions import ClientError
 
+from toll_booth.obj.s3_writes import put_if_absent
 from toll_booth.obj.utils import set_property_data_type
 
 
-def _check_for_object(bucket_name, object_key):
-    s3_resource = boto3.resource('s3')
-    s3_object = s3_resource.Object(bucket_name, object_key)
-    try:
-        s3_object.load()
-        return True
-    except ClientError as e:
-        if e.response['Error']['Code'] != '404':
-            raise e
-        return False
-
-
 class StoredPropertyValue:
     """
         not all object_properties can easily fit into the graph. large objects such as web scrapings or extracted PDF
@@ -52,6 +40,10 @@ class S3StoredPropertyValue(StoredPropertyValue):
         bucket_name, object_key = results.group('bucket'), results.group('key')
         stored_object_data = boto3.resource('s3').Object(bucket_name, object_key).get()
         object_data = stored_object_data['Body'].read()
+        return self.decode(object_data)
+
+    def decode(self, object_data):
+        """converts the body of the stored object, fetched elsewhere, into the value it holds"""
         stored_data = ajson.loads(object_data)
         return set_property_data_type(self._data_type, stored_data)
 
@@ -60,8 +52,7 @@ class S3StoredPropertyValue(StoredPropertyValue):
         data_type = kwargs['data_type']
         bucket_name = kwargs['bucket_name']
         object_key = kwargs['object_key']
-        bucket = boto3.resource('s3').Bucket(bucket_name)
-        if not _check_for_object(bucket_name, object_key):
-            bucket.put_object(Key=object_key, Body=ajson.dumps(object_data))
+        s3_object = boto3.resource('s3').Object(bucket_name, object_key)
+        put_if_absent(s3_object, lambda: ajson.dumps(object_data))
         storage_uri = f's3://{bucket_name}/{object_key}'
         return cls(data_type, 's3', storage_uri)
@@ -2,10 +2,9 @@ import json
 from copy import deepcopy
 from decimal import Decimal
 
-import dateutil
-
 from toll_booth.obj.data_objects import SensitivePropertyValue
 from toll_booth.obj.data_objects.object_properties.stored_property import S3StoredPropertyValue
+from toll_booth.obj.utils import coerce_datetime
 
 
 def _set_object_property_value(data_type, obj_value):
@@ -16,7 +15,7 @@ def _set_object_property_value(data_type, obj_value):
     if data_type == 'B':
         return obj_value == 'True'
     if data_type == 'DT':
-        return dateutil.parser.parse(obj_value)
+        return coerce_datetime(obj_value)
     raise NotImplementedError(f'do not understand how to parse {obj_value} with data_type: {data_type}')
 
 
@@ -1,30 +1,44 @@
-import json
-from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Tuple, Dict, Any
 
-import dateutil
+from toll_booth.obj.utils import coerce_datetime
 
 
-def _derive_object_properties(object_properties) -> str:
+def _derive_property_shape(object_properties):
+    ordered_properties = sorted(object_properties, key=lambda x: x['property_name'])
+    property_shape = tuple((x['property_name'], _is_datetime_property(x)) for x in ordered_properties)
+    property_values = [_derive_property_map(x) for x in ordered_properties]
+    return property_shape, property_values
+
+
+def _derive_object_properties(property_shape, binding_prefix) -> str:
     property_commands = []
-    for entry in object_properties:
-        property_commands.append(_derive_property_value(entry))
+    for pointer, shape_entry in enumerate(property_shape):
+        property_name, is_datetime = shape_entry
+        binding_name = f'{binding_prefix}p{pointer}'
+        if is_datetime:
+            binding_name = f'datetime({binding_name})'
+        property_commands.append(f"property('{property_name}', {binding_name})")
+    if not property_commands:
+        return ''
     return f".{'.'.join(property_commands)}"
 
 
-def _derive_property_value(object_property) -> str:
-    property_name = object_property['property_name']
-    stored_property_value = _derive_property_map(object_property)
-    return f"property('{property_name}', {stored_property_value})"
+def _is_datetime_property(object_property) -> bool:
+    if 'pointer' in object_property or 'storage_uri' in object_property:
+        return False
+    return object_property['data_type'] == 'DT'
 
 
-def _derive_property_map(object_property) -> str:
+def _derive_property_map(object_property):
     if 'pointer' in object_property:
         pointer = object_property['pointer']
-        return f"'#SENSITIVE#{pointer}'"
+        return f'#SENSITIVE#{pointer}'
     if 'storage_uri' in object_property:
         storage_class = object_property['storage_class']
         storage_uri = object_property['storage_uri']
-        return f"'#STORED@{storage_class}#{storage_uri}'"
+        return f'#STORED@{storage_class}#{storage_uri}'
     return _derive_local_property_value(object_property)
 
 
@@ -38,70 +52,138 @@ def _derive_stored_property_map(object_property) -> str:
     return property_value
 
 
-def _derive_local_property_value(object_property) -> str:
+def _derive_local_property_value(object_property):
     property_value = object_property['property_value']
     property_data_type = object_property['data_type']
     if property_data_type == 'S':
-        property_value = json.dumps(property_value)
+        return property_value
+    if property_data_type == 'N':
+        return _derive_numeric_value(object_property['property_name'], property_value)
+    if property_data_type == 'B':
+        return str(property_value).lower() == 'true'
     if property_data_type == 'DT':
-        try:
-            datetime_value = dateutil.parser.parse(property_value)
-        except ValueError:
-            datetime_value = datetime.fromisoformat(property_value)
-        iso_format = datetime_value.isoformat(sep='T')
-        property_value = f"datetime('{iso_format}')"
+        return coerce_datetime(property_value).isoformat(sep='T')
     return property_value
 
 
+def _derive_numeric_value(property_name, property_value):
+    """binds a number as an int or a float, as written, so that 1.0 is bound as 1.0 and not as 1"""
+    if isinstance(property_value, bool):
+        raise RuntimeError(f'could not bind {property_value} for property {property_name} as a number')
+    if isinstance(property_value, (int, float)):
+        return property_value
+    if isinstance(property_value, Decimal):
+        if property_value.as_tuple().exponent >= 0:
+            return int(property_value)
+        return float(property_value)
+    try:
+        return int(property_value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(property_value)
+    except (TypeError, ValueError):
+        raise RuntimeError(f'could not bind {property_value} for property {property_name} as a number')
+
+
+def derive_command_shape(object_data: Dict[str, Any], is_edge: bool = False) -> Tuple:
+    """the label and property names/types of an object, which together decide the text of its upsert command"""
+    object_properties = object_data['edge_properties' if is_edge else 'vertex_properties']
+    collected_properties = _collect_properties(object_properties, object_data['id_value'], object_data['identifier'])
+    ordered_properties = sorted(collected_properties, key=lambda x: x['property_name'])
+    property_shape = tuple((x['property_name'], _is_datetime_property(x)) for x in ordered_properties)
+    object_type = object_data['edge_label' if is_edge else 'vertex_type']
+    return is_edge, object_type, property_shape
+
+
+@lru_cache(maxsize=512)
+def _edge_template(edge_label: str, property_shape, binding_prefix: str) -> str:
+    return f"g" \
+        f".E({binding_prefix}internal_id)" \
+        f".fold()" \
+        f".coalesce(unfold()," \
+        f" addE('{edge_label}')" \
+        f".from(g.V({binding_prefix}source_internal_id))" \
+        f".to(g.V({binding_prefix}target_internal_id))" \
+        f".property(id, {binding_prefix}internal_id)" \
+        f"{_derive_object_properties(property_shape, binding_prefix)})"
+
+
+@lru_cache(maxsize=512)
+def _vertex_template(vertex_type: str, property_shape, binding_prefix: str) -> str:
+    return f"g" \
+        f".V({binding_prefix}internal_id)" \
+        f".fold()" \
+        f".coalesce(unfold()," \
+        f" addV('{vertex_type}')" \
+        f".property(id, {binding_prefix}internal_id)" \
+        f"{_derive_object_properties(property_shape, binding_prefix)})"
+
+
+def _collect_properties(object_properties, id_value, identifier):
+    collected_properties = []
+    for property_type, type_properties in object_properties.items():
+        collected_properties.extend(type_properties)
+    collected_properties.append(id_value)
+    collected_properties.append(identifier)
+    return collected_properties
+
+
+def _generate_bindings(binding_prefix, property_values, **kwargs):
+    bindings = {f'{binding_prefix}{x}': y for x, y in kwargs.items()}
+    for pointer, property_value in enumerate(property_values):
+        bindings[f'{binding_prefix}p{pointer}'] = property_value
+    return bindings
+
+
 def create_edge_command(internal_id: str,
                         edge_label: str,
                         id_value,
                         identifier,
                         source_vertex_internal_id: str,
                         target_vertex_internal_id: str,
-                        edge_properties=None) -> str:
-    import re
-    collected_properties = []
-    for property_type, type_properties in edge_properties.items():
-        collected_properties.extend(type_properties)
-    collected_properties.append(id_value)
-    collected_properties.append(identifier)
-    command = f"g" \
-        f".E('{internal_id}')" \
-        f".fold()" \
-        f".coalesce(unfold()," \
-        f" addE('{edge_label}').from(g.V('{source_vertex_internal_id}')).to(g.V('{target_vertex_internal_id}'))" \
-        f".property(id, '{internal_id}')" \
-        f"{_derive_object_properties(collected_properties)})"
-    command = re.sub(r'\s+', ' ', command)
-    return command
+                        edge_properties=None,
+                        binding_prefix: str = '') -> Tuple[str, Dict[str, Any]]:
+    """generates the parameterized upsert for an edge
+
+        the traversal text depends only on the label and the names/types of the properties, so it is drawn from a
+            cache and can be reused by the database, the values themselves are returned as bindings
+
+    Returns:
+        a tuple of the gremlin traversal and the bindings for it
+
+    """
+    collected_properties = _collect_properties(edge_properties, id_value, identifier)
+    property_shape, property_values = _derive_property_shape(collected_properties)
+    command = _edge_template(edge_label, property_shape, binding_prefix)
+    bindings = _generate_bindings(
+        binding_prefix, property_values, internal_id=internal_id,
+        source_internal_id=source_vertex_internal_id, target_internal_id=target_vertex_internal_id)
+    return command, bindings
 
 
 def create_vertex_command(internal_id: str,
                           vertex_type: str,
                           id_value,
                           identifier,
-                          vertex_properties) -> str:
-    import re
-    collected_properties = []
-    for property_type, type_properties in vertex_properties.items():
-        collected_properties.extend(type_properties)
-    collected_properties.append(id_value)
-    collected_properties.append(identifier)
-    command = f"g" \
-        f".V('{internal_id}')" \
-        f".fold()" \
-        f".coalesce(unfold()," \
-        f" addV('{vertex_type}')" \
-        f".property(id, '{internal_id}')" \
-        f"{_derive_object_properties(collected_properties)})"
-    command = re.sub(r'\s+', ' ', command)
-    return command
+                          vertex_properties,
+                          binding_prefix: str = '') -> Tuple[str, Dict[str, Any]]:
+    """generates the parameterized upsert for a vertex, see create_edge_command
+
+    Returns:
+        a tuple of the gremlin traversal and the bindings for it
+
+    """
+    collected_properties = _collect_properties(vertex_properties, id_value, identifier)
+    property_shape, property_values = _derive_property_shape(collected_properties)
+    command = _vertex_template(vertex_type, property_shape, binding_prefix)
+    bindings = _generate_bindings(binding_prefix, property_values, internal_id=internal_id)
+    return command, bindings
 
 
-def create_vertex_command_from_scalar(vertex_data):
-    return create_vertex_command(**vertex_data)
+def create_vertex_command_from_scalar(vertex_data, binding_prefix: str = ''):
+    return create_vertex_command(binding_prefix=binding_prefix, **vertex_data)
 
 
-def create_edge_command_from_scalar(edge_data):
-    return create_edge_command(**edge_data)
+def create_edge_command_from_scalar(edge_data, binding_prefix: str = ''):
+    return create_edge_command(binding_prefix=binding_prefix, **edge_data)
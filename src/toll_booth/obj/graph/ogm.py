@@ -1,54 +1,128 @@
-from toll_booth.obj.graph.generators import create_vertex_command_from_scalar, create_edge_command_from_scalar
+import os
+import threading
+from typing import List, Tuple, Dict
+
+import rapidjson
+
+from toll_booth.obj.graph.generators import create_vertex_command_from_scalar, create_edge_command_from_scalar, \
+    derive_command_shape
 from toll_booth.obj.graph.trident_driver import TridentDriver
 from toll_booth.obj.data_objects.graph_objects import VertexData, EdgeData
 
+_shape_ids = {}
+_shape_lock = threading.Lock()
+
+
+def _generate_result(status, operation, message, command, bindings):
+    return {
+        'status': status,
+        'operation': operation,
+        'details': {
+            'message': message,
+            'command': command,
+            'bindings': rapidjson.dumps(bindings)
+        }
+    }
+
+
+def _get_shape_id(command_shape) -> int:
+    with _shape_lock:
+        shape_id = _shape_ids.get(command_shape)
+        if shape_id is None:
+            shape_id = len(_shape_ids)
+            _shape_ids[command_shape] = shape_id
+        return shape_id
+
+
+def _generate_binding_prefixes(scalars, is_edge, occurrences):
+    """prefixes the bindings of each command by its shape, and by how many commands of that shape came before it
+
+        the same mix of object shapes always produces the same prefixes, and so the same command text, which keeps
+            the template cache, and the query cache of the database, effective across clusters
+    """
+    prefixes = []
+    for scalar in scalars:
+        shape_id = _get_shape_id(derive_command_shape(scalar, is_edge))
+        occurrence = occurrences.get(shape_id, 0)
+        occurrences[shape_id] = occurrence + 1
+        prefixes.append(f's{shape_id}_{occurrence}_')
+    return prefixes
+
+
+def _chunk_operations(operations, max_statements, max_length):
+    chunk = []
+    chunk_length = 0
+    for operation in operations:
+        command_length = len(operation[1]) + 1
+        if chunk and (len(chunk) >= max_statements or chunk_length + command_length > max_length):
+            yield chunk
+            chunk = []
+            chunk_length = 0
+        chunk.append(operation)
+        chunk_length += command_length
+    if chunk:
+        yield chunk
+
 
 class Ogm:
-    def __init__(self, trident_driver=None):
+    def __init__(self, trident_driver=None, **kwargs):
         if not trident_driver:
             trident_driver = TridentDriver()
         self._trident_driver = trident_driver
+        self._max_statements = kwargs.get('max_statements', int(os.getenv('GRAPH_BULK_MAX_STATEMENTS', 25)))
+        self._max_length = kwargs.get('max_length', int(os.getenv('GRAPH_BULK_MAX_LENGTH', 60000)))
 
     def graph_vertex(self, vertex_scalar: VertexData):
-        command = create_vertex_command_from_scalar(vertex_scalar)
+        command, bindings = create_vertex_command_from_scalar(vertex_scalar)
         try:
-            self._trident_driver.execute(command)
-            return {
-                'status': 'succeeded',
-                'operation': 'graph_vertex',
-                'details': {
-                    'message': '',
-                    'command': command
-                }
-            }
+            self._trident_driver.execute(command, bindings=bindings)
+            return _generate_result('succeeded', 'graph_vertex', '', command, bindings)
         except Exception as e:
-            return {
-                'status': 'failed',
-                'operation': 'graph_vertex',
-                'details': {
-                    'message': e.args,
-                    'command': command
-                }
-            }
+            return _generate_result('failed', 'graph_vertex', e.args, command, bindings)
 
     def graph_edge(self, edge_scalar: EdgeData):
-        command = create_edge_command_from_scalar(edge_scalar)
+        command, bindings = create_edge_command_from_scalar(edge_scalar)
         try:
-            self._trident_driver.execute(command)
-            return {
-                'status': 'succeeded',
-                'operation': 'graph_edge',
-                'details': {
-                    'message': '',
-                    'command': command
-                }
-            }
+            self._trident_driver.execute(command, bindings=bindings)
+            return _generate_result('succeeded', 'graph_edge', '', command, bindings)
         except Exception as e:
-            return {
-                'status': 'failed',
-                'operation': 'graph_edge',
-                'details': {
-                    'message': e.args,
-                    'command': command
-                }
-            }
+            return _generate_result('failed', 'graph_edge', e.args, command, bindings)
+
+    def graph_cluster(self, vertexes: List[VertexData], edges: List[EdgeData]) -> Tuple[List[Dict], List[Dict]]:
+        """graphs a collection of vertexes and edges with as few requests to the database as possible
+
+            the parameterized upsert commands, each with a binding prefix derived from its shape, are joined into
+            multi-statement requests, bounded by max_statements and max_length. vertexes are always sent ahead of
+            the edges which may depend on them. each request succeeds or fails as a whole, so every element in a
+            failed request is reported as failed
+
+        Args:
+            vertexes: the vertex scalars to graph
+            edges: the edge scalars to graph
+
+        Returns:
+            a tuple of the results for the vertexes and for the edges, in the order they were provided,
+            each result in the same shape as those returned from graph_vertex and graph_edge
+
+        """
+        operations = []
+        occurrences = {}
+        vertex_prefixes = _generate_binding_prefixes(vertexes, False, occurrences)
+        for vertex_scalar, binding_prefix in zip(vertexes, vertex_prefixes):
+            command, bindings = create_vertex_command_from_scalar(vertex_scalar, binding_prefix=binding_prefix)
+            operations.append(('graph_vertex', command, bindings))
+        edge_prefixes = _generate_binding_prefixes(edges, True, occurrences)
+        for edge_scalar, binding_prefix in zip(edges, edge_prefixes):
+            command, bindings = create_edge_command_from_scalar(edge_scalar, binding_prefix=binding_prefix)
+            operations.append(('graph_edge', command, bindings))
+        results = []
+        for chunk in _chunk_operations(operations, self._max_statements, self._max_length):
+            chunk_bindings = {}
+            for operation in chunk:
+                chunk_bindings.update(operation[2])
+            try:
+                self._trident_driver.execute(';'.join(x[1] for x in chunk), bindings=chunk_bindings)
+                results.extend(_generate_result('succeeded', x[0], '', x[1], x[2]) for x in chunk)
+            except Exception as e:
+                results.extend(_generate_result('failed', x[0], e.args, x[1], x[2]) for x in chunk)
+        return results[:len(vertexes)], results[len(vertexes):]
@@ -4,12 +4,53 @@ import hmac
 import json
 import logging
 import os
+import threading
+from functools import lru_cache
 from typing import Dict, Any
 import urllib.parse
 
 import rapidjson
 import requests
 from algernon.aws import Opossum
+from requests.adapters import HTTPAdapter
+
+_sessions = {}
+_session_lock = threading.Lock()
+
+
+def _sign(key, message):
+    return hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()
+
+
+@lru_cache(maxsize=8)
+def _derive_signing_key(secret_key, date_stamp, region, service):
+    k_date = _sign(f'AWS4{secret_key}'.encode('utf-8'), date_stamp)
+    k_region = _sign(k_date, region)
+    k_service = _sign(k_region, service)
+    return _sign(k_service, 'aws4_request')
+
+
+def get_pooled_session(neptune_endpoint: str) -> requests.Session:
+    """returns the process wide HTTP session for a Neptune endpoint
+
+        sessions are shared across every notary (and so every Ogm) in the process, so TLS connections to Neptune
+            are reused between calls. the size of the connection pool is set by GRAPH_DB_POOL_SIZE, defaulting to 10
+
+    Args:
+        neptune_endpoint:
+
+    Returns:
+
+    """
+    with _session_lock:
+        session = _sessions.get(neptune_endpoint)
+        if session is None:
+            pool_size = int(os.getenv('GRAPH_DB_POOL_SIZE', 10))
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            _sessions[neptune_endpoint] = session
+        return session
 
 
 class TridentNotary:
@@ -20,7 +61,7 @@ class TridentNotary:
         if neptune_endpoint is None:
             raise RuntimeError('must specify neptune endpoint when calling the trident_notary')
         if not session:
-            session = requests.session()
+            session = get_pooled_session(neptune_endpoint)
         self._session = session
         self._neptune_endpoint = neptune_endpoint
         self._uri = '/gremlin/'
@@ -48,11 +89,11 @@ class TridentNotary:
         endpoint = kwargs.get('graph_db_reader_endpoint', os.getenv('GRAPH_DB_READER_ENDPOINT', None))
         return cls(endpoint)
 
-    def send(self, command: str) -> Dict[str, Any]:
+    def send(self, command: str, bindings: Dict[str, Any] = None) -> Dict[str, Any]:
         t = datetime.datetime.utcnow()
         amz_date = t.strftime('%Y%m%dT%H%M%SZ')
         date_stamp = t.strftime('%Y%m%d')
-        canonical_request, request_parameters = self._generate_canonical_request(amz_date, command)
+        canonical_request, request_parameters = self._generate_canonical_request(amz_date, command, bindings)
         credential_scope = self._generate_scope(date_stamp)
         string_to_sign = self._generate_string_to_sign(canonical_request, amz_date, credential_scope)
         signature = self._generate_signature(string_to_sign, date_stamp)
@@ -67,8 +108,11 @@ class TridentNotary:
         logging.debug(f'after parsing and transforming the response from the graph database, results: {results}')
         return results
 
-    def _generate_canonical_request(self, amz_date, command):
-        payload = json.dumps({'gremlin': command})
+    def _generate_canonical_request(self, amz_date, command, bindings=None):
+        payload = {'gremlin': command}
+        if bindings:
+            payload['bindings'] = bindings
+        payload = json.dumps(payload)
         canonical_headers = f'host:{self._host}\nx-amz-date:{amz_date}\n'
         payload_hash = hashlib.sha256(payload.encode('utf-8')).hexdigest()
         canon_request = f"{self._method}\n{self._uri}\n\n{canonical_headers}\n{self._signed_headers}\n{payload_hash}"
@@ -82,11 +126,7 @@ class TridentNotary:
         return f"{date_stamp}/{self._region}/{self._service}/aws4_request"
 
     def _get_signature_key(self, date_stamp):
-        k_date = self._sign(f'AWS4{self._secret_key}'.encode('utf-8'), date_stamp)
-        k_region = self._sign(k_date, self._region)
-        k_service = self._sign(k_region, self._service)
-        k_signing = self._sign(k_service, 'aws4_request')
-        return k_signing
+        return _derive_signing_key(self._secret_key, date_stamp, self._region, self._service)
 
     def _generate_signature(self, string_to_sign, date_stamp):
         signing_key = self._get_signature_key(date_stamp)
@@ -112,31 +152,40 @@ class TridentNotary:
 
     @classmethod
     def _sign(cls, key, message):
-        return hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()
+        return _sign(key, message)
 
 
 class TridentDriver:
     def __init__(self, **kwargs):
-        self._read_notary = kwargs.get('read_notary', TridentNotary.get_for_reader(**kwargs))
-        self._write_notary = kwargs.get('write_notary', TridentNotary.get_for_writer(**kwargs))
+        read_notary = kwargs.get('read_notary')
+        if read_notary is None:
+            read_notary = TridentNotary.get_for_reader(**kwargs)
+        write_notary = kwargs.get('write_notary')
+        if write_notary is None:
+            write_notary = TridentNotary.get_for_writer(**kwargs)
+        self._read_notary = read_notary
+        self._write_notary = write_notary
         self._batch_mode = False
 
     def get(self, internal_id):
-        command = "g.V('%s')" % internal_id
-        return self.execute(command, True)
+        command = "g.V(internal_id)"
+        return self.execute(command, True, bindings={'internal_id': internal_id})
 
-    def execute(self, query_text: str, read_only: bool = False):
+    def execute(self, query_text: str, read_only: bool = False, bindings: Dict[str, Any] = None):
         if self._batch_mode is True:
             self._batch_commands.append(query_text)
+            if bindings:
+                self._batch_bindings.update(bindings)
             return
         notary = self._write_notary
         if read_only:
             notary = self._read_notary
-        results = notary.send(query_text)
+        results = notary.send(query_text, bindings)
         return results
 
     def __enter__(self):
         self._batch_commands = []
+        self._batch_bindings = {}
         self._batch_mode = True
         return self
 
@@ -145,7 +194,8 @@ class TridentDriver:
             self._batch_mode = False
             if self._batch_commands:
                 commands = ';'.join(self._batch_commands)
-                self.execute(commands)
+                self.execute(commands, bindings=self._batch_bindings)
             self._batch_commands = []
+            self._batch_bindings = {}
             return True
         raise (exc_type(exc_val))
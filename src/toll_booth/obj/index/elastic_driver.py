@@ -1,44 +1,130 @@
 import os
+import threading
 
 from elasticsearch import Elasticsearch, RequestsHttpConnection
+from requests.adapters import HTTPAdapter
 from requests_aws4auth import AWS4Auth
 import boto3
 
+_clients = {}
+_client_lock = threading.Lock()
+
+
+class PooledRequestsHttpConnection(RequestsHttpConnection):
+    """a RequestsHttpConnection whose underlying session keeps a connection pool of a configurable size"""
+    def __init__(self, *args, pool_maxsize=10, **kwargs):
+        super().__init__(*args, **kwargs)
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+
+def _build_client(es_host, aws_auth):
+    return Elasticsearch(
+        hosts=[{'host': es_host, 'port': 443}],
+        http_auth=aws_auth,
+        use_ssl=True,
+        verify_certs=True,
+        connection_class=PooledRequestsHttpConnection,
+        pool_maxsize=int(os.getenv('ELASTIC_POOL_SIZE', 10)),
+        timeout=int(os.getenv('ELASTIC_TIMEOUT', 10)),
+        max_retries=int(os.getenv('ELASTIC_MAX_RETRIES', 3)),
+        retry_on_timeout=True,
+        http_compress=True
+    )
+
+
+def _get_shared_client(es_host, access_key, secret_key, session_token, region):
+    """returns the process wide client for a host and set of credentials
+
+        a client holds its own connection pool, so building one per call means a new TLS handshake per call,
+            instead one client is kept per (host, credentials). when the session token rotates a new client is
+            built, and the client for the expired credentials is dropped
+    """
+    client_key = (es_host, access_key, session_token)
+    with _client_lock:
+        cached = _clients.get(client_key)
+        if cached is not None:
+            return cached
+        auth_kwargs = {}
+        if session_token:
+            auth_kwargs['session_token'] = session_token
+        aws_auth = AWS4Auth(access_key, secret_key, region, 'es', **auth_kwargs)
+        expired = [x for x in _clients if x[0] == es_host]
+        for expired_key in expired:
+            del _clients[expired_key]
+        _clients[client_key] = (aws_auth, _build_client(es_host, aws_auth))
+        return _clients[client_key]
+
 
 class ElasticDriver:
-    def __init__(self, es_host, aws_auth):
+    def __init__(self, es_host, aws_auth, es_client=None):
         self._es_host = es_host
         self._aws_auth = aws_auth
+        self._es_client = es_client
 
     @classmethod
     def generate(cls, es_host):
         credentials = boto3.Session().get_credentials()
         region = os.environ.get('AWS_REGION', 'us-east-1')
-        if os.getenv('AWS_SESSION_TOKEN', None):
-            session_token = os.environ['AWS_SESSION_TOKEN']
-            auth = AWS4Auth(credentials.access_key, credentials.secret_key, region, 'es', session_token=session_token)
-            return cls(es_host, auth)
-        aws_auth = AWS4Auth(credentials.access_key, credentials.secret_key, region, 'es')
-        return cls(es_host, aws_auth)
+        session_token = os.getenv('AWS_SESSION_TOKEN', None)
+        aws_auth, es_client = _get_shared_client(
+            es_host, credentials.access_key, credentials.secret_key, session_token, region)
+        return cls(es_host, aws_auth, es_client)
 
     @property
     def es_client(self):
-        return Elasticsearch(
-            hosts=[{'host': self._es_host, 'port': 443}],
-            http_auth=self._aws_auth,
-            use_ssl=True,
-            verify_certs=True,
-            connection_class=RequestsHttpConnection
-        )
+        if self._es_client is None:
+            self._es_client = _build_client(self._es_host, self._aws_auth)
+        return self._es_client
 
     def index_document(self, index_name, document_type, document_id, document):
         return self.es_client.create(index=index_name, doc_type=document_type, id=document_id, body=document)
 
+    def bulk_create(self, documents):
+        """creates many documents with a single _bulk request
+
+        Args:
+            documents: a list of (index_name, document_type, document_id, document) tuples
+
+        Returns:
+            the result of the create operation for each document, in the order provided
+
+        """
+        body = []
+        for index_name, document_type, document_id, document in documents:
+            body.append({'create': {'_index': index_name, '_type': document_type, '_id': document_id}})
+            body.append(document)
+        response = self.es_client.bulk(body=body)
+        return [x['create'] for x in response['items']]
+
     def get_document(self, index_name, document_type, document_id):
         return self.es_client.get(index=index_name, doc_type=document_type, id=document_id)
 
-    def search(self, index_name, query_body):
-        return self.es_client.search(index_name, body={'query': query_body})
+    def search(self, index_name, query_body, **kwargs):
+        body = {'query': query_body}
+        body.update(kwargs)
+        return self.es_client.search(index_name, body=body)
+
+    def multi_search(self, searches, **kwargs):
+        """runs many searches with a single _msearch request
+
+        Args:
+            searches: a list of (index_name, query_body) tuples
+            **kwargs: additional options added to the body of every search, such as version
+
+        Returns:
+            the response for each search, in the order provided
+
+        """
+        body = []
+        for index_name, query_body in searches:
+            body.append({'index': index_name})
+            search_body = {'query': query_body}
+            search_body.update(kwargs)
+            body.append(search_body)
+        response = self.es_client.msearch(body=body)
+        return response['responses']
 
     def get_max_id_value(self, id_source, object_type):
         body = {
@@ -1,5 +1,6 @@
+import logging
 import os
-from typing import Dict
+from typing import Dict, List, Tuple, Union
 
 import rapidjson
 from algernon.serializers import ExplosionJson
@@ -55,13 +56,52 @@ class IndexManager:
                 specified by the index
 
         """
-        for index in self._indexes:
-            if index.check_object_type(scalar_object['object_type']):
-                missing_properties = index.check_for_missing_object_properties(scalar_object)
-                if missing_properties:
-                    raise MissingIndexedPropertyException(index.index_name, index.indexed_fields, missing_properties)
+        self._check_indexed_properties(scalar_object)
         return self._index_object(scalar_object, is_edge)
 
+    @xray_recorder.capture('index_objects')
+    def index_objects(self, index_entries: List[Tuple[Dict, bool]]) -> List[Union[Dict, Exception]]:
+        """indexes many objects with a single bulk request
+
+        Args:
+            index_entries: a list of (scalar_object, is_edge) tuples
+
+        Returns:
+            for each entry, in order, either the indexed scalar_object, or the exception that index_object
+            would have raised for it. if the bulk request itself fails, its exception is returned for every
+            entry which was sent in it
+
+        """
+        outcomes = [None] * len(index_entries)
+        documents = []
+        for pointer, index_entry in enumerate(index_entries):
+            scalar_object, is_edge = index_entry
+            try:
+                self._check_indexed_properties(scalar_object)
+            except MissingIndexedPropertyException as e:
+                outcomes[pointer] = e
+                continue
+            documents.append((pointer, self._generate_document(scalar_object, is_edge)))
+        if not documents:
+            return outcomes
+        try:
+            created = self._elastic_driver.bulk_create([x[1] for x in documents])
+        except Exception as e:
+            logging.error(f'the bulk request to the index failed: {e}')
+            for pointer, _ in documents:
+                outcomes[pointer] = e
+            return outcomes
+        for document, create_result in zip(documents, created):
+            pointer = document[0]
+            scalar_object = index_entries[pointer][0]
+            outcomes[pointer] = scalar_object
+            if create_result.get('status') == 409:
+                outcomes[pointer] = UniqueIndexViolationException('InternalIdIndex', scalar_object)
+                continue
+            if 'error' in create_result:
+                outcomes[pointer] = RuntimeError(create_result['error'])
+        return outcomes
+
     @xray_recorder.capture('find_potential_vertexes')
     def find_potential_vertexes(self,
                                 object_type: str,
@@ -81,11 +121,40 @@ class IndexManager:
         potential_vertexes = []
         search_results = self._search_vertexes(object_type, vertex_properties)
         for entry in search_results.get('hits', []):
-            source_data = entry['_source']
-            potential_vertex = mission.rebuild_vertex(source_data, schema)
+            potential_vertex = mission.rebuild_vertex_from_hit(entry, schema)
             potential_vertexes.append(potential_vertex)
         return potential_vertexes
 
+    @xray_recorder.capture('find_potential_vertexes_many')
+    def find_potential_vertexes_many(self,
+                                     lookups: List[Tuple[str, Dict]],
+                                     schema: Schema) -> List[Union[List[VertexData], Exception]]:
+        """checks the index for many potential vertexes with a single multi-search request
+
+        Args:
+            lookups: a list of (object_type, vertex_properties) tuples, as passed to find_potential_vertexes
+            schema:
+
+        Returns:
+            for each lookup, in order, a list of the potential vertexes that were found in the index, or a
+                RuntimeError if the search for that lookup failed, so that one bad search does not fail the rest
+
+        """
+        if not lookups:
+            return []
+        searches = [self._generate_vertex_search(object_type, vertex_properties)
+                    for object_type, vertex_properties in lookups]
+        responses = self._elastic_driver.multi_search(searches, version=True)
+        found_vertexes = []
+        for search, response in zip(searches, responses):
+            if 'error' in response:
+                logging.error(f'error searching the index with {search}: {response["error"]}')
+                found_vertexes.append(RuntimeError(f'error searching the index with {search}: {response["error"]}'))
+                continue
+            hits = response['hits'].get('hits', [])
+            found_vertexes.append([mission.rebuild_vertex_from_hit(x, schema) for x in hits])
+        return found_vertexes
+
     def get_object_key(self, internal_id: str):
         response = self._table.query(
             IndexName=self._internal_id_index.index_name,
@@ -118,13 +187,23 @@ class IndexManager:
         self._push_to_index(scalar_object, is_edge)
         return scalar_object
 
-    def _push_to_index(self, scalar_object, is_edge):
+    def _check_indexed_properties(self, scalar_object):
+        for index in self._indexes:
+            if index.check_object_type(scalar_object['object_type']):
+                missing_properties = index.check_for_missing_object_properties(scalar_object)
+                if missing_properties:
+                    raise MissingIndexedPropertyException(index.index_name, index.indexed_fields, missing_properties)
+
+    @staticmethod
+    def _generate_document(scalar_object, is_edge):
         index_name = scalar_object['object_type'].lower()
         if is_edge:
             index_name = 'edge' + index_name
-        document_id = scalar_object['internal_id']
+        return index_name, '_doc', scalar_object['internal_id'], scalar_object
+
+    def _push_to_index(self, scalar_object, is_edge):
         try:
-            results = self._elastic_driver.index_document(index_name, '_doc', document_id, scalar_object)
+            results = self._elastic_driver.index_document(*self._generate_document(scalar_object, is_edge))
             return results
         except ConflictError as e:
             if e.info['status'] != 409:
@@ -144,6 +223,13 @@ class IndexManager:
         Returns:
             a list of the items found in the index for the assigned segment
         """
+        index_name, query_body = self._generate_vertex_search(object_type, vertex_properties)
+        response = self._elastic_driver.search(index_name, query_body, version=True)
+        hit_response = response['hits']
+        return hit_response
+
+    @staticmethod
+    def _generate_vertex_search(object_type, vertex_properties) -> Tuple[str, Dict]:
         index_name = object_type.lower()
         filter_body = []
         if 'local_properties' in vertex_properties:
@@ -156,6 +242,4 @@ class IndexManager:
                 "term": {property_name: mission.set_data_type(data_type, property_value, True)}
             }
             filter_body.append(filter_entry)
-        response = self._elastic_driver.search(index_name, {'bool': {'filter': filter_body}})
-        hit_response = response['hits']
-        return hit_response
+        return index_name, {'bool': {'filter': filter_body}}
@@ -1,15 +1,18 @@
 import os
+import threading
+from collections import OrderedDict
 from _pydecimal import Decimal
-from datetime import datetime
+from datetime import datetime, timezone
 
-import dateutil
-import pytz
+import rapidjson
 
-from toll_booth.obj.data_objects import SensitivePropertyValue, MissingObjectProperty
+from toll_booth.obj.data_objects import SensitivePropertyValue, SensitiveWriteBuffer, MissingObjectProperty
 from toll_booth.obj.data_objects.graph_objects import VertexData
 from toll_booth.obj.data_objects.object_properties.stored_property import S3StoredPropertyValue
+from toll_booth.obj.property_resolver import PropertyResolver
 from toll_booth.obj.schemata.entry_property import SchemaPropertyEntry
 from toll_booth.obj.schemata.schema import Schema
+from toll_booth.obj.utils import coerce_datetime
 from toll_booth.tasks import aws_utils
 
 data_type_map = {
@@ -23,11 +26,28 @@ type_map = {
     'sensitive_properties': 'SensitivePropertyValue',
     'stored_properties': 'StoredPropertyValue'
 }
+_rebuilt_vertexes = OrderedDict()
+_rebuilt_lock = threading.Lock()
 
 
-def _store_s3_property_value(entry_property, property_name, property_value, data_type, source_internal_id):
+def _generate_s3_location(entry_property, property_name, source_internal_id):
     bucket_name = _generate_s3_bucket_name(entry_property.stored['bucket_name_source'])
     object_key = f'{property_name}/{source_internal_id}_{property_name}.json'
+    return bucket_name, object_key
+
+
+def _locate_s3_property_value(entry_property, property_name, data_type, source_internal_id):
+    bucket_name, object_key = _generate_s3_location(entry_property, property_name, source_internal_id)
+    return {
+        'data_type': data_type,
+        'property_name': property_name,
+        'storage_class': 's3',
+        'storage_uri': f's3://{bucket_name}/{object_key}'
+    }
+
+
+def _store_s3_property_value(entry_property, property_name, property_value, data_type, source_internal_id):
+    bucket_name, object_key = _generate_s3_location(entry_property, property_name, source_internal_id)
     s3_args = {
         'data_type': data_type,
         'bucket_name': bucket_name,
@@ -78,9 +98,14 @@ def _rebuild_identifier(identifier_vertex_property):
     }
 
 
-def _rebuild_sensitive_property(property_name, vertex_property, data_type, internal_id):
+def _rebuild_sensitive_property(property_name,
+                                vertex_property,
+                                data_type,
+                                internal_id,
+                                read_only=False,
+                                sensitive_writes: SensitiveWriteBuffer = None):
     sensitive_entry = SensitivePropertyValue(internal_id, property_name, vertex_property)
-    pointer = sensitive_entry.store()
+    pointer = sensitive_entry.pointer if read_only else sensitive_entry.store(sensitive_writes)
     gql_entry = {
         'data_type': data_type,
         'property_name': property_name,
@@ -89,29 +114,50 @@ def _rebuild_sensitive_property(property_name, vertex_property, data_type, inter
     return 'sensitive_properties', gql_entry
 
 
-def _rebuild_stored_property(property_name, vertex_property, data_type, internal_id, property_schema):
+def _rebuild_stored_property(property_name, vertex_property, data_type, internal_id, property_schema, read_only=False):
     storage_class = property_schema.stored['storage_class']
     if storage_class == 's3':
+        if read_only:
+            return 'stored_properties', _locate_s3_property_value(property_schema, property_name, data_type, internal_id)
         s3_args = (property_schema, property_name, vertex_property, data_type, internal_id)
         return 'stored_properties', _store_s3_property_value(*s3_args)
     raise NotImplementedError(f'can not store {vertex_property} per storage_class: {storage_class},'
                               f'this class is unknown to the system')
 
 
-def build_vertex_property(property_name, vertex_property, property_schema: SchemaPropertyEntry, source_internal_id):
+def build_vertex_property(property_name,
+                          vertex_property,
+                          property_schema: SchemaPropertyEntry,
+                          source_internal_id,
+                          read_only=False,
+                          sensitive_writes: SensitiveWriteBuffer = None):
+    """converts a property value into the form it is stored on the graph, per the schema
+
+        sensitive and stored values are pushed to their remote storage, unless read_only is set, in which case the
+            pointer or storage_uri they would have been stored under is computed without any remote writes. if
+            sensitive_writes is given, sensitive values are queued on it, and are not stored until it is flushed
+
+    """
     if isinstance(vertex_property, MissingObjectProperty):
         return 'missing', None
     data_type = data_type_map[property_schema.property_data_type]
     if property_schema.sensitive:
-        return _rebuild_sensitive_property(property_name, vertex_property, data_type, source_internal_id)
+        sensitive_args = (property_name, vertex_property, data_type, source_internal_id, read_only, sensitive_writes)
+        return _rebuild_sensitive_property(*sensitive_args)
     if property_schema.stored:
-        return _rebuild_stored_property(property_name, vertex_property, data_type, source_internal_id, property_schema)
+        stored_args = (property_name, vertex_property, data_type, source_internal_id, property_schema, read_only)
+        return _rebuild_stored_property(*stored_args)
     rebuilt_property = {'property_name': property_name}
     rebuilt_property.update({'data_type': data_type, 'property_value': str(vertex_property)})
     return 'local_properties', rebuilt_property
 
 
-def rebuild_vertex(elastic_hit, schema: Schema):
+def rebuild_vertex(elastic_hit, schema: Schema, read_only=True):
+    """rebuilds a VertexData from the source of a document in the index
+
+        the vertex has already been stored, so by default its sensitive and stored properties are not written back
+
+    """
     excluded_entries = (
         'object_class', 'sid_value',
         'internal_id', 'object_type', 'numeric_id_value')
@@ -134,13 +180,36 @@ def rebuild_vertex(elastic_hit, schema: Schema):
             continue
         vertex_property_entry = schema.vertex_entries[object_type].vertex_properties[property_name]
         source_internal_id = elastic_hit['internal_id']
-        build_args = (property_name, vertex_property, vertex_property_entry, source_internal_id)
+        build_args = (property_name, vertex_property, vertex_property_entry, source_internal_id, read_only)
         property_class, rebuilt_property = build_vertex_property(*build_args)
         rebuilt_property['__typename'] = type_map[property_class]
         potential_vertex['vertex_properties'].append(rebuilt_property)
     return VertexData.from_gql(potential_vertex)
 
 
+def rebuild_vertex_from_hit(search_hit, schema: Schema):
+    """rebuilds a VertexData from an index search hit, memoized on the internal_id and version of the document
+
+        the same existing vertex is often found for many rules across many leeches, the rebuilt vertex is kept in a
+            bounded LRU (REBUILT_VERTEX_CACHE_SIZE, default 1024), and is returned frozen
+
+    """
+    source_data = search_hit['_source']
+    cache_key = (source_data['internal_id'], search_hit.get('_version'))
+    with _rebuilt_lock:
+        rebuilt_vertex = _rebuilt_vertexes.get(cache_key)
+        if rebuilt_vertex is not None:
+            _rebuilt_vertexes.move_to_end(cache_key)
+            return rebuilt_vertex
+    rebuilt_vertex = rebuild_vertex(source_data, schema).freeze()
+    max_size = int(os.getenv('REBUILT_VERTEX_CACHE_SIZE', 1024))
+    with _rebuilt_lock:
+        _rebuilt_vertexes[cache_key] = rebuilt_vertex
+        while len(_rebuilt_vertexes) > max_size:
+            _rebuilt_vertexes.popitem(last=False)
+    return rebuilt_vertex
+
+
 def derive_data_type(property_value):
     if isinstance(property_value, str):
         return 'S', str(property_value)
@@ -163,9 +232,9 @@ def set_data_type(data_type, property_value, for_search=False):
             return float(property_value)
         return Decimal(property_value)
     if data_type == 'DT':
-        date_time_property = dateutil.parser.parse(property_value)
+        date_time_property = coerce_datetime(property_value)
         if date_time_property.tzinfo is None:
-            date_time_property = pytz.utc.localize(date_time_property)
+            date_time_property = date_time_property.replace(tzinfo=timezone.utc)
         return date_time_property.isoformat()
     if data_type == 'S':
         return str(property_value)
@@ -174,17 +243,23 @@ def set_data_type(data_type, property_value, for_search=False):
     raise RuntimeError(f'system is not equipped to handle property: {property_value} with data type: {data_type}')
 
 
-def format_object_property(property_type, object_property, for_index=False):
+def format_object_property(property_type, object_property, for_index=False, resolver: PropertyResolver = None):
     data_type = object_property['data_type']
     if property_type == 'stored_properties':
         storage_class = object_property['storage_class']
         storage_uri = object_property['storage_uri']
         if storage_class == 's3':
-            property_value = aws_utils.retrieve_s3_property(storage_uri)
+            if resolver is None:
+                property_value = aws_utils.retrieve_s3_property(storage_uri)
+            else:
+                property_value = rapidjson.loads(resolver.stored_value(storage_uri))
             return set_data_type(data_type, property_value, for_search=for_index)
         raise RuntimeError(f'do not know how to retrieve for stored property class: {storage_class}')
     if property_type == 'sensitive_properties':
-        property_value = aws_utils.retrieve_sensitive_property(object_property['pointer'])
+        if resolver is None:
+            property_value = aws_utils.retrieve_sensitive_property(object_property['pointer'])
+        else:
+            property_value = resolver.sensitive_value(object_property['pointer'])
         return set_data_type(data_type, property_value, for_search=for_index)
     if property_type == 'local_properties':
         property_value = object_property['property_value']
@@ -192,7 +267,16 @@ def format_object_property(property_type, object_property, for_index=False):
     raise RuntimeError(f'do not know how to store object property type: {property_type}')
 
 
-def collect_object_properties(scalar, is_edge=False, for_index=False):
+def collect_object_properties(scalar, is_edge=False, for_index=False, resolver: PropertyResolver = None):
+    """formats each property of the object, the first property of a given name wins
+
+        the sensitive and stored values of the object are fetched through the resolver, if none is given, one is
+            made for this object and all its values are prefetched at once
+
+    """
+    if resolver is None:
+        resolver = PropertyResolver()
+        resolver.prefetch([(scalar, is_edge)])
     collected_properties = {}
     object_property_name = 'edge_properties' if is_edge else 'vertex_properties'
     object_properties = scalar[object_property_name]
@@ -200,12 +284,12 @@ def collect_object_properties(scalar, is_edge=False, for_index=False):
         for type_property in type_properties:
             property_name = type_property['property_name']
             if property_name not in collected_properties:
-                indexed_property = format_object_property(property_type, type_property, for_index=for_index)
-                collected_properties[property_name] = indexed_property
+                format_args = (property_type, type_property, for_index, resolver)
+                collected_properties[property_name] = format_object_property(*format_args)
     return collected_properties
 
 
-def format_object_for_index(scalar, is_edge=False):
+def format_object_for_index(scalar, is_edge=False, resolver: PropertyResolver = None):
     object_type_property = 'edge_label' if is_edge else 'vertex_type'
     identifier = scalar['identifier']['property_value']
     id_value = scalar['id_value']
@@ -219,6 +303,6 @@ def format_object_for_index(scalar, is_edge=False):
     if is_edge:
         object_for_index['from_internal_id'] = scalar['source_vertex_internal_id']
         object_for_index['to_internal_id'] = scalar['target_vertex_internal_id']
-    object_properties = collect_object_properties(scalar, is_edge, for_index=True)
+    object_properties = collect_object_properties(scalar, is_edge, for_index=True, resolver=resolver)
     object_for_index.update(object_properties)
     return object_for_index
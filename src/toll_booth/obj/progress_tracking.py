@@ -1,13 +1,34 @@
+import threading
 from datetime import datetime
 
 import boto3
+import rapidjson
+
+from toll_booth.obj.serializers import FireHoseEncoder
+
+_MAX_UPDATE_BYTES = 350000
+_MAX_EXPRESSION_LENGTH = 4000
 
 
 class Overseer:
-    def __init__(self, table_name, identifier, id_value):
+    def __init__(self, table_name, identifier, id_value, buffered=False, table=None):
+        """
+
+        Args:
+            table_name: the name of the DynamoDB table holding the progress entries
+            identifier:
+            id_value:
+            buffered: if True, stage results are held in memory until flush is called, and then written with
+                as few update_item calls as the DynamoDB size limits allow
+            table: an existing DynamoDB Table resource for table_name, to share one between many Overseers
+        """
         self._table_name = table_name
         self._identifier = identifier
         self._id_value = id_value
+        self._buffered = buffered
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._table = table
 
     @property
     def progress_key(self):
@@ -16,16 +37,28 @@ class Overseer:
             'id_value': int(self._id_value)
         }
 
+    @property
+    def is_buffered(self):
+        return self._buffered
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = boto3.resource('dynamodb').Table(self._table_name)
+        return self._table
+
     def mark_stage_completed(self, stage_name, stage_results=None):
         if not stage_results:
             stage_results = {}
-        dynamo = boto3.resource('dynamodb')
-        table = dynamo.Table(self._table_name)
         update_entry = {
             'completed_at': datetime.now().isoformat(),
             'stage_results': stage_results
         }
-        table.update_item(
+        if self._buffered:
+            with self._lock:
+                self._pending[stage_name] = update_entry
+            return
+        self.table.update_item(
             Key=self.progress_key,
             UpdateExpression='SET #sn=:ue',
             ExpressionAttributeNames={
@@ -36,6 +69,68 @@ class Overseer:
             }
         )
 
+    def flush(self):
+        """writes all buffered stage results, coalesced into as few update_item calls as possible
+
+        each update is kept under the DynamoDB request size and expression length limits, a stage whose results
+            exceed the limits on their own is sent in an update by itself. stages are only dropped from the buffer
+            once their update has been written, so if an update fails, they are kept for the next flush
+
+        Returns: None
+
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            for batch in _batch_stage_updates(dict(self._pending)):
+                self._push_update(batch)
+                for stage_name in batch:
+                    del self._pending[stage_name]
+
+    def _push_update(self, stage_updates):
+        pieces = []
+        attribute_names = {}
+        attribute_values = {}
+        for pointer, stage_name in enumerate(stage_updates):
+            attribute_names[f'#s{pointer}'] = stage_name
+            attribute_values[f':s{pointer}'] = stage_updates[stage_name]
+            pieces.append(f'#s{pointer}=:s{pointer}')
+        self.table.update_item(
+            Key=self.progress_key,
+            UpdateExpression=f"SET {','.join(pieces)}",
+            ExpressionAttributeNames=attribute_names,
+            ExpressionAttributeValues=attribute_values
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+        return False
+
+
+def _batch_stage_updates(pending):
+    batch = {}
+    batch_size = 0
+    expression_length = len('SET ')
+    for stage_name, update_entry in pending.items():
+        entry_size = len(stage_name) + len(rapidjson.dumps(update_entry, default=FireHoseEncoder.default))
+        entry_expression_length = len(f'#s{len(batch)}=:s{len(batch)},')
+        over_size = batch_size + entry_size > _MAX_UPDATE_BYTES
+        over_length = expression_length + entry_expression_length > _MAX_EXPRESSION_LENGTH
+        if batch and (over_size or over_length):
+            yield batch
+            batch = {}
+            batch_size = 0
+            expression_length = len('SET ')
+            entry_expression_length = len('#s0=:s0,')
+        batch[stage_name] = update_entry
+        batch_size += entry_size
+        expression_length += entry_expression_length
+    if batch:
+        yield batch
+
 
 class MigrationStep:
     def __init__(self, step_name, completed_at, **kwargs):
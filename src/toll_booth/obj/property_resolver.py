@@ -0,0 +1,166 @@
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Tuple, Dict, Any, List
+
+import boto3
+
+_MAX_KEYS_PER_BATCH_GET = 100
+_s3_uri_pattern = re.compile(r'(s3://)(?P<bucket>[^/\s]*)(/)(?P<key>[^\s]*)')
+_missing = object()
+
+
+def _parse_s3_uri(storage_uri: str) -> Tuple[str, str]:
+    matches = _s3_uri_pattern.search(storage_uri)
+    return matches.group('bucket'), matches.group('key')
+
+
+def _object_properties(scalar: Dict[str, Any], is_edge: bool) -> Dict[str, List[Dict]]:
+    object_property_name = 'edge_properties' if is_edge else 'vertex_properties'
+    return scalar.get(object_property_name) or {}
+
+
+class PropertyResolver:
+    """fetches the sensitive and stored values behind the properties of a batch of leeched objects
+
+        a resolver is meant to live for a single invocation. prefetch gathers every pointer and storage_uri from the
+            objects it is given, and fetches those it has not seen before, the sensitive values with BatchGetItem
+            (100 keys per call), and the stored values with a pool of up to max_workers (PROPERTY_FETCH_WORKERS,
+            default 10) concurrent S3 GETs. every value is held for the life of the resolver, and a value being
+            fetched by one thread is waited on, not fetched again, by any other
+    """
+    def __init__(self, sensitive_table_name: str = None, max_workers: int = None, s3_client=None, dynamo_resource=None):
+        if max_workers is None:
+            max_workers = int(os.getenv('PROPERTY_FETCH_WORKERS', 10))
+        self._sensitive_table_name = sensitive_table_name
+        self._max_workers = max_workers
+        self._s3_client = s3_client
+        self._dynamo_resource = dynamo_resource
+        self._lock = threading.Lock()
+        self._sensitive_values = {}
+        self._stored_values = {}
+
+    @property
+    def sensitive_table_name(self):
+        if self._sensitive_table_name is None:
+            self._sensitive_table_name = os.environ['SENSITIVE_TABLE_NAME']
+        return self._sensitive_table_name
+
+    @property
+    def s3_client(self):
+        if self._s3_client is None:
+            self._s3_client = boto3.client('s3')
+        return self._s3_client
+
+    @property
+    def dynamo_resource(self):
+        if self._dynamo_resource is None:
+            self._dynamo_resource = boto3.resource('dynamodb')
+        return self._dynamo_resource
+
+    def _claim(self, memo: Dict[str, Future], keys: Iterable[str]) -> List[str]:
+        """registers a pending future for each key not yet held, returning the keys this thread must fetch"""
+        claimed = []
+        with self._lock:
+            for key in keys:
+                if key in memo:
+                    continue
+                memo[key] = Future()
+                claimed.append(key)
+        return claimed
+
+    def prefetch(self, scalars: Iterable[Tuple[Dict[str, Any], bool]]):
+        """fetches every sensitive and stored value referenced by the objects, which is not already held
+
+        Args:
+            scalars: pairs of a leeched object (in its for_gql form) and whether it is an edge
+
+        Returns: None
+
+        """
+        pointers, storage_uris = [], []
+        for scalar, is_edge in scalars:
+            object_properties = _object_properties(scalar, is_edge)
+            for sensitive_property in object_properties.get('sensitive_properties', []):
+                pointers.append(sensitive_property['pointer'])
+            for stored_property in object_properties.get('stored_properties', []):
+                if stored_property.get('storage_class') == 's3':
+                    storage_uris.append(stored_property['storage_uri'])
+        pointers = self._claim(self._sensitive_values, dict.fromkeys(pointers))
+        storage_uris = self._claim(self._stored_values, dict.fromkeys(storage_uris))
+        if not pointers and not storage_uris:
+            return
+        executor = None
+        if storage_uris:
+            executor = ThreadPoolExecutor(max_workers=min(self._max_workers, len(storage_uris)))
+            for storage_uri in storage_uris:
+                executor.submit(self._fetch_stored_value, storage_uri)
+        try:
+            self._fetch_sensitive_values(pointers)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def _fetch_stored_value(self, storage_uri: str):
+        future = self._stored_values[storage_uri]
+        try:
+            bucket_name, file_key = _parse_s3_uri(storage_uri)
+            response = self.s3_client.get_object(Bucket=bucket_name, Key=file_key)
+            future.set_result(response['Body'].read())
+        except Exception as e:
+            future.set_exception(e)
+
+    def _fetch_sensitive_values(self, pointers: List[str]):
+        if not pointers:
+            return
+        try:
+            table_name = self.sensitive_table_name
+            for start in range(0, len(pointers), _MAX_KEYS_PER_BATCH_GET):
+                chunk = pointers[start:start + _MAX_KEYS_PER_BATCH_GET]
+                items = self._batch_get(table_name, [{'insensitive': x} for x in chunk])
+                for pointer in chunk:
+                    self._sensitive_values[pointer].set_result(items.get(pointer, _missing))
+        except Exception as e:
+            for pointer in pointers:
+                future = self._sensitive_values[pointer]
+                if not future.done():
+                    future.set_exception(e)
+
+    def _batch_get(self, table_name: str, keys: List[Dict[str, str]]) -> Dict[str, Any]:
+        items = {}
+        request_items = {table_name: {'Keys': keys}}
+        delay = 0.05
+        while request_items:
+            response = self.dynamo_resource.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(table_name, []):
+                items[item['insensitive']] = item['sensitive_entry']
+            request_items = response.get('UnprocessedKeys')
+            if request_items:
+                logging.warning(f'{len(request_items[table_name]["Keys"])} sensitive values were not returned, retrying')
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+        return items
+
+    def sensitive_value(self, pointer: str):
+        """returns the sensitive_entry stored under the pointer, fetching it if it was not prefetched
+
+        Raises:
+            RuntimeError: no value is stored under the pointer
+
+        """
+        if pointer not in self._sensitive_values:
+            self._fetch_sensitive_values(self._claim(self._sensitive_values, [pointer]))
+        sensitive_value = self._sensitive_values[pointer].result()
+        if sensitive_value is _missing:
+            raise RuntimeError(f'sensitive value cannot be found: {pointer}')
+        return sensitive_value
+
+    def stored_value(self, storage_uri: str) -> bytes:
+        """returns the body of the object at the storage_uri, fetching it if it was not prefetched"""
+        if storage_uri not in self._stored_values:
+            for claimed_uri in self._claim(self._stored_values, [storage_uri]):
+                self._fetch_stored_value(claimed_uri)
+        return self._stored_values[storage_uri].result()
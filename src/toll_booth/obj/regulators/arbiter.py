@@ -1,5 +1,6 @@
 from typing import Union, List, Tuple, Dict
 
+from toll_booth.obj.data_objects import SensitiveWriteBuffer
 from toll_booth.obj.data_objects.graph_objects import VertexData
 from toll_booth.obj.regulators import ObjectRegulator, EdgeRegulator
 from toll_booth.obj.schemata.rules import VertexLinkRuleEntry
@@ -14,8 +15,10 @@ class RuleArbiter:
     def __init__(self,
                  source_vertex: VertexData,
                  schema: Schema,
-                 schema_entry: Union[SchemaVertexEntry, SchemaEdgeEntry]):
+                 schema_entry: Union[SchemaVertexEntry, SchemaEdgeEntry],
+                 sensitive_writes: SensitiveWriteBuffer = None):
         self._schema_entry = schema_entry
+        self._sensitive_writes = sensitive_writes
         self._schema = schema
         self._rules = schema_entry.rules
         self._source_vertex = source_vertex
@@ -32,6 +35,10 @@ class RuleArbiter:
     def schema_entry(self):
         return self._schema_entry
 
+    @property
+    def sensitive_writes(self):
+        return self._sensitive_writes
+
     def process_rules(self, extracted_data: Dict) -> List[Tuple[VertexData, VertexLinkRuleEntry]]:
         """
 
@@ -70,9 +77,9 @@ class ArbiterExecutor:
         self._rule_entry = rule_entry
         self._target_type = rule_entry.target_type
         rule_schema_entry = rule_arbiter.schema[self._target_type]
-        regulator = ObjectRegulator(rule_schema_entry)
+        regulator = ObjectRegulator(rule_schema_entry, rule_arbiter.sensitive_writes)
         if hasattr(rule_entry, 'edge_label'):
-            regulator = EdgeRegulator(rule_schema_entry)
+            regulator = EdgeRegulator(rule_schema_entry, rule_arbiter.sensitive_writes)
         self._regulator = regulator
 
     @property
@@ -1,20 +1,9 @@
 from decimal import Decimal
 from typing import Union, Dict, Any
 
-import dateutil
-
-from toll_booth.obj.data_objects import MissingObjectProperty, InternalId, IdentifierStem
+from toll_booth.obj.data_objects import InternalId, IdentifierStem, SensitiveWriteBuffer
 from toll_booth.obj.data_objects.graph_objects import VertexData
-from toll_booth.obj.index import mission
 from toll_booth.obj.schemata.schema_entry import SchemaVertexEntry, SchemaEdgeEntry
-from toll_booth.obj.utils import set_property_data_type
-
-type_map = {
-    'Number': 'N',
-    'DateTime': 'DT',
-    'String': 'S',
-    'Boolean': 'B'
-}
 
 
 class ObjectRegulator:
@@ -29,10 +18,14 @@ class ObjectRegulator:
         4. we create an identifier stem to associate it with sibling elements on the graph, and in the index
         5. we extract and set the id_value, which is the link back to the original data source (PK, extracted_time, etc)
     """
-    def __init__(self, schema_entry: Union[SchemaVertexEntry, SchemaEdgeEntry]):
+    def __init__(self,
+                 schema_entry: Union[SchemaVertexEntry, SchemaEdgeEntry],
+                 sensitive_writes: SensitiveWriteBuffer = None):
         self._schema_entry = schema_entry
+        self._sensitive_writes = sensitive_writes
         self._internal_id_key = schema_entry.internal_id_key
         self._entry_properties_schema = schema_entry.entry_properties
+        self._plan = schema_entry.regulator_plan
 
     @property
     def schema_entry(self):
@@ -81,17 +74,7 @@ class ObjectRegulator:
             a dictionary of object property values, set by data type per the schema
 
         """
-        returned_properties = {}
-        for property_name, entry_property in self._entry_properties_schema.items():
-            try:
-                test_property = object_data[property_name]
-            except KeyError:
-                returned_properties[property_name] = MissingObjectProperty()
-                continue
-            data_type = type_map[entry_property.property_data_type]
-            test_property = set_property_data_type(data_type, test_property)
-            returned_properties[property_name] = test_property
-        return returned_properties
+        return self._plan.standardize(object_data)
 
     def _convert_object_properties(self, internal_id: str, object_properties: Dict[str, Any]):
         """ turns the standardized object property into the object specific to how it will be stored
@@ -106,17 +89,7 @@ class ObjectRegulator:
             a dictionary of purpose specific object properties
 
         """
-        converted_properties = {}
-        for property_name, entry_property in self._entry_properties_schema.items():
-            object_property = object_properties[property_name]
-            property_type, property_value = mission.build_vertex_property(
-                property_name, object_property, entry_property, internal_id)
-            if property_type == 'missing':
-                continue
-            if property_type not in converted_properties:
-                converted_properties[property_type] = []
-            converted_properties[property_type].append(property_value)
-        return converted_properties
+        return self._plan.convert(internal_id, object_properties, self._sensitive_writes)
 
     def _create_internal_id(self, object_properties: Dict[str, Any], for_known: bool = False):
         """ generate the internal_id for an object
@@ -128,24 +101,8 @@ class ObjectRegulator:
         Returns:
 
         """
-        static_key_fields = {
-            'object_type': self._schema_entry.entry_name,
-            'id_value_field': self._schema_entry.id_value_field
-        }
         try:
-            key_values = []
-            internal_id_key = self._schema_entry.internal_id_key
-            for field_name in internal_id_key:
-                if field_name in static_key_fields:
-                    key_values.append(str(static_key_fields[field_name]))
-                    continue
-                if hasattr(field_name, 'is_missing'):
-                    key_values.append('MISSING_OBJECT_PROPERTY')
-                key_value = object_properties[field_name]
-                key_values.append(str(key_value))
-            id_string = ''.join(key_values)
-            internal_id = InternalId(id_string).id_value
-            return internal_id
+            return self._plan.create_internal_id(object_properties)
         except KeyError:
             if for_known:
                 raise RuntimeError(
@@ -164,29 +121,7 @@ class ObjectRegulator:
         Returns:
 
         """
-        try:
-            paired_identifiers = []
-
-            identifier_stem_key = self._schema_entry.identifier_stem
-            object_type = self._schema_entry.object_type
-            for field_name in identifier_stem_key:
-                try:
-                    key_value = object_properties[field_name]
-                except KeyError:
-                    key_value = object_data[field_name]
-                if isinstance(key_value, MissingObjectProperty):
-                    return self._schema_entry.identifier_stem
-                if key_value is None and '::stub' not in object_type:
-                    object_type = object_type + '::stub'
-                paired_identifiers.append(key_value)
-            identifier_stem = IdentifierStem('vertex', object_type, paired_identifiers)
-            return {
-                'data_type': 'S',
-                'property_value': str(identifier_stem),
-                'property_name': 'identifier_stem'
-            }
-        except KeyError:
-            return self._schema_entry.identifier_stem
+        return self._plan.create_identifier_stem(object_properties, object_data)
 
     def _create_id_value(self, object_properties: Dict[str, Any]):
         """ extract and standardize the id_value property per the schema
@@ -197,17 +132,4 @@ class ObjectRegulator:
         Returns:
 
         """
-        try:
-            id_value = object_properties[self._schema_entry.id_value_field]
-            vertex_properties = self._schema_entry.vertex_properties
-            id_value_properties = vertex_properties[self._schema_entry.id_value_field]
-            if id_value_properties.property_data_type == 'DateTime':
-                remade_date_value = dateutil.parser.parse(id_value)
-                id_value = Decimal(remade_date_value.timestamp())
-            return {
-                'data_type': type_map[id_value_properties.property_data_type],
-                'property_name': 'id_value',
-                'property_value': str(id_value)
-            }
-        except KeyError:
-            return self._schema_entry.id_value_field
+        return self._plan.create_id_value(object_properties)
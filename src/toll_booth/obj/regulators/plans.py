@@ -0,0 +1,158 @@
+from collections import namedtuple
+from decimal import Decimal
+from typing import Union, Dict, Any
+
+from toll_booth.obj.data_objects import MissingObjectProperty, InternalId, IdentifierStem, SensitiveWriteBuffer
+from toll_booth.obj.index import mission
+from toll_booth.obj.schemata.schema_entry import SchemaVertexEntry, SchemaEdgeEntry
+from toll_booth.obj.utils import set_property_data_type, coerce_datetime
+
+PlanStep = namedtuple('PlanStep', ['property_name', 'data_type', 'storage', 'entry_property'])
+
+
+def _derive_storage(entry_property) -> str:
+    if entry_property.sensitive:
+        return 'sensitive'
+    if entry_property.stored:
+        return 'stored'
+    return 'local'
+
+
+class RegulatorPlan:
+    """ the work an ObjectRegulator does for a schema entry, compiled once per entry
+
+        walking the schema entry for every object means repeating the same dictionary walks, data type lookups and
+            storage branching over and over, the plan resolves all of that up front into
+        1. an ordered tuple of steps, one per property: the name, the data type code and the storage strategy
+        2. the internal_id key, with the static fields (object_type, id_value_field) already filled in
+        3. the field names and object type of the identifier stem
+        4. the name and data type of the id_value field
+
+        plans are held by their SchemaEntry, see SchemaEntry.regulator_plan, and are immutable once built
+    """
+    def __init__(self, schema_entry: Union[SchemaVertexEntry, SchemaEdgeEntry]):
+        self._schema_entry = schema_entry
+        self._steps = tuple(
+            PlanStep(x, mission.data_type_map[y.property_data_type], _derive_storage(y), y)
+            for x, y in schema_entry.entry_properties.items())
+        self._id_value_field = None
+        self._id_value_data_type = None
+        self._id_value_error = None
+        self._internal_id_key = ()
+        self._identifier_stem_key = ()
+        if isinstance(schema_entry, SchemaVertexEntry):
+            self._compile_vertex_keys(schema_entry)
+
+    def _compile_vertex_keys(self, schema_entry: SchemaVertexEntry):
+        try:
+            self._id_value_field = schema_entry.id_value_field
+        except NotImplementedError as e:
+            self._id_value_error = e
+        id_value_entry = schema_entry.vertex_properties.get(self._id_value_field)
+        if id_value_entry is not None:
+            self._id_value_data_type = id_value_entry.property_data_type
+        static_key_fields = {
+            'object_type': schema_entry.entry_name,
+            'id_value_field': self._id_value_field
+        }
+        self._internal_id_key = tuple(
+            (x in static_key_fields, str(static_key_fields[x]) if x in static_key_fields else x)
+            for x in schema_entry.internal_id_key)
+        self._identifier_stem_key = tuple(schema_entry.identifier_stem)
+
+    @property
+    def steps(self):
+        return self._steps
+
+    def standardize(self, object_data: Dict[str, Any]) -> Dict[str, Any]:
+        returned_properties = {}
+        for step in self._steps:
+            try:
+                test_property = object_data[step.property_name]
+            except KeyError:
+                returned_properties[step.property_name] = MissingObjectProperty()
+                continue
+            returned_properties[step.property_name] = set_property_data_type(step.data_type, test_property)
+        return returned_properties
+
+    def convert(self,
+                internal_id: str,
+                object_properties: Dict[str, Any],
+                sensitive_writes: SensitiveWriteBuffer = None) -> Dict[str, Any]:
+        converted_properties = {}
+        for step in self._steps:
+            object_property = object_properties[step.property_name]
+            if isinstance(object_property, MissingObjectProperty):
+                continue
+            if step.storage == 'local':
+                property_type = 'local_properties'
+                property_value = {
+                    'property_name': step.property_name,
+                    'data_type': step.data_type,
+                    'property_value': str(object_property)
+                }
+            else:
+                property_type, property_value = mission.build_vertex_property(
+                    step.property_name, object_property, step.entry_property, internal_id,
+                    sensitive_writes=sensitive_writes)
+            if property_type not in converted_properties:
+                converted_properties[property_type] = []
+            converted_properties[property_type].append(property_value)
+        return converted_properties
+
+    def create_internal_id_string(self, object_properties: Dict[str, Any]) -> str:
+        """ joins the internal_id key values for an object, raises KeyError if any of them are missing """
+        if self._id_value_error is not None:
+            raise self._id_value_error
+        key_values = []
+        for is_static, key_field in self._internal_id_key:
+            if is_static:
+                key_values.append(key_field)
+                continue
+            key_values.append(str(object_properties[key_field]))
+        return ''.join(key_values)
+
+    def create_internal_id(self, object_properties: Dict[str, Any]) -> str:
+        return InternalId(self.create_internal_id_string(object_properties)).id_value
+
+    def create_identifier_stem(self, object_properties: Dict[str, Any], object_data: Dict[str, Any]):
+        schema_identifier_stem = self._schema_entry.identifier_stem
+        paired_identifiers = []
+        object_type = self._schema_entry.object_type
+        for field_name in self._identifier_stem_key:
+            try:
+                key_value = object_properties[field_name]
+            except KeyError:
+                try:
+                    key_value = object_data[field_name]
+                except KeyError:
+                    return schema_identifier_stem
+            if isinstance(key_value, MissingObjectProperty):
+                return schema_identifier_stem
+            if key_value is None and '::stub' not in object_type:
+                object_type = object_type + '::stub'
+            paired_identifiers.append(key_value)
+        identifier_stem = IdentifierStem('vertex', object_type, paired_identifiers)
+        return {
+            'data_type': 'S',
+            'property_value': str(identifier_stem),
+            'property_name': 'identifier_stem'
+        }
+
+    def create_id_value(self, object_properties: Dict[str, Any]):
+        if self._id_value_error is not None:
+            raise self._id_value_error
+        try:
+            id_value = object_properties[self._id_value_field]
+        except KeyError:
+            return self._id_value_field
+        if self._id_value_data_type is None:
+            return self._id_value_field
+        if self._id_value_data_type == 'DateTime':
+            remade_date_value = coerce_datetime(id_value)
+            id_value = Decimal(remade_date_value.timestamp())
+        return {
+            'data_type': mission.data_type_map[self._id_value_data_type],
+            'property_name': 'id_value',
+            'property_value': str(id_value)
+        }
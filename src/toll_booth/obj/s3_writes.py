@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Union
+
+from botocore.exceptions import ClientError, ParamValidationError
+
+_existing_codes = ('PreconditionFailed', '412')
+_conflict_codes = ('ConditionalRequestConflict', '409')
+_max_conflict_attempts = 5
+
+_lock = threading.Lock()
+_known_keys = OrderedDict()
+_conditional_puts = {'supported': True}
+
+
+def _cache_size() -> int:
+    return int(os.getenv('S3_KNOWN_KEY_CACHE_SIZE', 65536))
+
+
+def is_known(bucket_name: str, file_key: str) -> bool:
+    """returns True if this process has already written, or seen, the object at file_key"""
+    with _lock:
+        if (bucket_name, file_key) not in _known_keys:
+            return False
+        _known_keys.move_to_end((bucket_name, file_key))
+        return True
+
+
+def remember(bucket_name: str, file_key: str):
+    with _lock:
+        _known_keys[(bucket_name, file_key)] = True
+        _known_keys.move_to_end((bucket_name, file_key))
+        while len(_known_keys) > _cache_size():
+            _known_keys.popitem(last=False)
+
+
+def forget_all():
+    with _lock:
+        _known_keys.clear()
+
+
+def check_for_object(s3_object) -> bool:
+    try:
+        s3_object.load()
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] != '404':
+            raise e
+        return False
+
+
+def _conditional_put(s3_object, body) -> bool:
+    """PUTs the body with If-None-Match: *, returns False if S3 refuses it because the key is taken
+
+        a 409 (ConditionalRequestConflict) only means another conditional write to the key was in flight, it says
+            nothing of whether the object exists, so the PUT is retried, with a short backoff
+    """
+    for attempt in range(1, _max_conflict_attempts + 1):
+        try:
+            s3_object.put(Body=body, IfNoneMatch='*')
+            return True
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code in _existing_codes:
+                return False
+            if error_code not in _conflict_codes or attempt == _max_conflict_attempts:
+                raise e
+            logging.warning(f'conflicting write to {s3_object.key}, attempt {attempt} of {_max_conflict_attempts}')
+            time.sleep(0.1 * 2 ** attempt)
+
+
+def put_if_absent(s3_object,
+                  generate_body: Callable[[], Union[str, bytes]],
+                  check: Callable[[object], bool] = None) -> bool:
+    """writes an object to S3, unless an object is already stored at the same key
+
+        keys this process has written, or found to exist, are held in a bounded LRU (S3_KNOWN_KEY_CACHE_SIZE,
+            default 65536), and are answered without a call to S3. otherwise the body is built and written with a
+            conditional PUT (If-None-Match: *), with no HEAD beforehand, S3 refuses the PUT with a 412 if the key is
+            taken. this spends a body build, and an upload, on objects which turn out to exist, in exchange for one
+            request per object instead of two. if the installed botocore does not know the IfNoneMatch parameter, the
+            existence of the object is checked with check (a HEAD by default), and the PUT is made unconditionally if
+            it is absent, as was done before. the conditional PUT is then not tried again
+
+    Args:
+        s3_object: the boto3 s3.Object to write to
+        generate_body: called to produce the body, only once it is known the object may need writing
+        check: returns True if the s3_object already exists, only used when conditional PUTs are not supported
+
+    Returns:
+        True if the object was written, False if it already existed
+
+    """
+    bucket_name, file_key = s3_object.bucket_name, s3_object.key
+    if is_known(bucket_name, file_key):
+        return False
+    body = None
+    if _conditional_puts['supported']:
+        body = generate_body()
+        try:
+            written = _conditional_put(s3_object, body)
+            remember(bucket_name, file_key)
+            return written
+        except ParamValidationError as e:
+            logging.warning(f'conditional puts are not supported by this botocore, falling back to a plain PUT: {e}')
+            _conditional_puts['supported'] = False
+    if check is None:
+        check = check_for_object
+    if check(s3_object):
+        remember(bucket_name, file_key)
+        return False
+    if body is None:
+        body = generate_body()
+    s3_object.put(Body=body)
+    remember(bucket_name, file_key)
+    return True
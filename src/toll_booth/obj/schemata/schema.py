@@ -1,8 +1,8 @@
+import os
+import threading
+import time
 from typing import Union
 
-import jsonref
-from jsonschema import validate
-
 from algernon import AlgObject
 from toll_booth.obj.schemata.schema_snek import SchemaSnek
 
@@ -55,10 +55,19 @@ class Schema(AlgObject):
         schema_writer = SchemaSnek(bucket_name, **kwargs)
         json_schema = schema_writer.get_schema(**kwargs)
         vertex_entries, edge_entries = SchemaParer.parse(json_schema)
-        return cls(vertex_entries, edge_entries)
+        schema = cls(vertex_entries, edge_entries)
+        schema.compile_plans()
+        return schema
+
+    @classmethod
+    def retrieve_cached(cls, bucket_name, **kwargs):
+        """retrieves the schema through the process wide SchemaCache, see SchemaCache for revalidation rules"""
+        return schema_cache.get(bucket_name, **kwargs)
 
     @classmethod
     def post(cls, schema_file_path, validation_schema_file_path, **kwargs):
+        import jsonref
+        from jsonschema import validate
         schema_snek = SchemaSnek(**kwargs)
         with open(schema_file_path) as schema_file, open(validation_schema_file_path) as validation_file:
             working_schema = jsonref.load(schema_file)
@@ -74,8 +83,74 @@ class Schema(AlgObject):
     def parse_json(cls, json_dict):
         return cls(json_dict['vertex_entries'], json_dict['edge_entries'])
 
+    def compile_plans(self):
+        """builds the RegulatorPlan for every entry, so the cost is paid once when the schema is loaded"""
+        for schema_entry in list(self._vertex_entries.values()) + list(self._edge_entries.values()):
+            _ = schema_entry.regulator_plan
+
     def add_vertex_entry(self, vertex_entry):
         self._vertex_entries[vertex_entry.vertex_name] = vertex_entry
 
     def add_edge_entry(self, edge_entry):
         self._edge_entries[edge_entry.edge_label] = edge_entry
+
+
+class SchemaCache:
+    """holds parsed Schema objects for the life of the container
+
+        retrieving and parsing the schema from S3 is costly, and the schema rarely changes, so parsed schemas are
+            kept at the module level, keyed by bucket/folder/schema name. once an entry is older than the ttl, it is
+            revalidated with a conditional GET against the ETag of the stored object, and only re-parsed if changed
+    """
+    def __init__(self, ttl: float = None):
+        """
+
+        Args:
+            ttl: seconds before a cached schema is revalidated, defaults to the SCHEMA_CACHE_TTL variable or 300
+        """
+        self._ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._counts = {'hits': 0, 'misses': 0, 'revalidations': 0}
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is not None:
+            return self._ttl
+        return float(os.getenv('SCHEMA_CACHE_TTL', 300))
+
+    @property
+    def stats(self):
+        """hits are served without touching S3, misses are full retrievals, revalidations are 304 responses"""
+        with self._lock:
+            return dict(self._counts)
+
+    def get(self, bucket_name, **kwargs) -> Schema:
+        schema_name = kwargs.get('schema_name', 'schema.json')
+        schema_snek = SchemaSnek(bucket_name, **kwargs)
+        cache_key = (bucket_name, schema_snek.folder_name, schema_name)
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            now = time.monotonic()
+            if cached and now - cached['checked_at'] < self.ttl:
+                self._counts['hits'] += 1
+                return cached['schema']
+            etag = cached['etag'] if cached else None
+            json_schema, etag = schema_snek.get_schema_version(etag=etag, schema_name=schema_name)
+            if json_schema is None:
+                self._counts['revalidations'] += 1
+                cached['checked_at'] = now
+                return cached['schema']
+            self._counts['misses'] += 1
+            vertex_entries, edge_entries = SchemaParer.parse(json_schema)
+            schema = Schema(vertex_entries, edge_entries)
+            schema.compile_plans()
+            self._entries[cache_key] = {'schema': schema, 'etag': etag, 'checked_at': now}
+            return schema
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = {}
+
+
+schema_cache = SchemaCache()
@@ -29,6 +29,7 @@ class SchemaEntry(AlgObject):
         self._entry_properties = entry_properties
         self._indexes = indexes
         self._rules = rules
+        self._regulator_plan = None
 
     @classmethod
     def parse_json(cls, json_dict: dict):
@@ -64,6 +65,14 @@ class SchemaEntry(AlgObject):
     def rules(self):
         return self._rules
 
+    @property
+    def regulator_plan(self):
+        """the compiled RegulatorPlan for this entry, built on first access and held for the life of the entry"""
+        if self._regulator_plan is None:
+            from toll_booth.obj.regulators.plans import RegulatorPlan
+            self._regulator_plan = RegulatorPlan(self)
+        return self._regulator_plan
+
 
 class SchemaVertexEntry(SchemaEntry):
     def __init__(self, vertex_name, vertex_properties, internal_id_key, identifier_stem, indexes, rules, extract):
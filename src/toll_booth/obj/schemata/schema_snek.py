@@ -1,7 +1,7 @@
 import os
 
 import boto3
-import jsonref
+from botocore.exceptions import ClientError
 
 from algernon.serializers import AlgDecoder
 
@@ -14,6 +14,14 @@ class SchemaSnek:
         self._bucket_name = bucket_name
         self._folder_name = folder_name
 
+    @property
+    def bucket_name(self):
+        return self._bucket_name
+
+    @property
+    def folder_name(self):
+        return self._folder_name
+
     def get_validation_schema(self, schema_name=None):
         if not schema_name:
             schema_name = 'master_schema.json'
@@ -25,13 +33,39 @@ class SchemaSnek:
         return self.put_schema(file_path, master_schema_name)
 
     def get_schema(self, **kwargs):
+        schema, _ = self.get_schema_version(**kwargs)
+        return schema
+
+    def get_schema_version(self, etag=None, **kwargs):
+        """retrieves the stored schema along with the ETag of the stored object
+
+        when an etag is provided, the GET is made conditional on the stored object having changed,
+            if it has not, no body is transferred and (None, etag) is returned
+
+        Args:
+            etag: the ETag of a previously retrieved copy of the schema
+            **kwargs:
+
+        Returns:
+            a tuple of the parsed json schema (or None if unchanged) and the current ETag
+
+        """
         schema_name = kwargs.get('schema_name', 'schema.json')
         s3 = boto3.resource('s3')
         object_key = f'{self._folder_name}/{schema_name}'
-        stored_object = s3.Object(self._bucket_name, object_key).get()
+        get_kwargs = {}
+        if etag:
+            get_kwargs['IfNoneMatch'] = etag
+        try:
+            stored_object = s3.Object(self._bucket_name, object_key).get(**get_kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('304', 'NotModified'):
+                raise e
+            return None, etag
+        import jsonref
         stored_schema_string = stored_object['Body'].read()
         schema = jsonref.loads(stored_schema_string, cls=AlgDecoder)
-        return schema
+        return schema, stored_object.get('ETag')
 
     def put_schema(self, file_path, schema_name=None):
         if not schema_name:
@@ -1,23 +1,102 @@
+import os
 from datetime import datetime
 from decimal import Decimal
-from typing import Union
+from functools import lru_cache
+from typing import Union, Tuple
 
-import dateutil
+_datetime_formats = (
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%m/%d/%Y %I:%M:%S %p',
+    '%m/%d/%Y %I:%M %p',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y'
+)
+_cache_size = int(os.getenv('COERCION_CACHE_SIZE', 4096))
 
 
-def set_property_data_type(data_type: str, property_value: str, **kwargs) -> Union[None, Decimal, str, bool, datetime]:
-    if not property_value:
-        return None
-    if property_value == '':
-        return None
+def _shape(datetime_string: str) -> Tuple[int, int, int, bool]:
+    """the separators of a datetime string, a failed strptime costs more than dateutil, so only formats of the
+        same shape are tried"""
+    return (
+        datetime_string.count(':'), datetime_string.count('/'), datetime_string.count(' '),
+        datetime_string[-1:].isalpha()
+    )
+
+
+_formats_by_shape = {}
+for _datetime_format in _datetime_formats:
+    _sample = datetime(2000, 1, 1, 12).strftime(_datetime_format)
+    _formats_by_shape.setdefault(_shape(_sample), []).append(_datetime_format)
+
+
+def _parse_datetime(datetime_string: str) -> datetime:
+    iso_string = datetime_string
+    if iso_string.endswith('Z'):
+        iso_string = f'{iso_string[:-1]}+00:00'
+    try:
+        return datetime.fromisoformat(iso_string)
+    except ValueError:
+        pass
+    for datetime_format in _formats_by_shape.get(_shape(datetime_string), ()):
+        try:
+            return datetime.strptime(datetime_string, datetime_format)
+        except ValueError:
+            continue
+    from dateutil import parser
+    return parser.parse(datetime_string)
+
+
+@lru_cache(maxsize=_cache_size)
+def _parse_datetime_cached(datetime_string: str) -> datetime:
+    return _parse_datetime(datetime_string)
+
+
+def coerce_datetime(datetime_value: Union[str, datetime]) -> datetime:
+    """converts a raw datetime string to a datetime, without going through dateutil where it can be avoided
+
+        ISO-8601 strings (the vast majority of what passes through the system) are handled by fromisoformat, a short
+            list of fixed formats is tried next, and only strings which match none of those fall back to the dateutil
+            parser. results are memoized per raw string, in a bounded cache (COERCION_CACHE_SIZE, default 4096)
+
+    Args:
+        datetime_value: the raw string to convert, datetime values are returned as they are
+
+    Returns:
+        the parsed datetime
+
+    """
+    if isinstance(datetime_value, datetime):
+        return datetime_value
+    return _parse_datetime_cached(datetime_value)
+
+
+@lru_cache(maxsize=_cache_size)
+def _set_string_property_data_type(data_type: str, property_value: str):
+    return _set_property_data_type(data_type, property_value)
+
+
+def _set_property_data_type(data_type: str, property_value):
     if data_type == 'N':
         return Decimal(property_value)
     if data_type == 'S':
         return str(property_value)
     if data_type == 'DT':
-        datetime_value = dateutil.parser.parse(property_value)
+        datetime_value = coerce_datetime(property_value)
         return datetime_value.isoformat(sep='T')
     if data_type == 'B':
         return property_value == 'True'
     raise NotImplementedError(
         f'data type {data_type} is unknown to the system')
+
+
+def set_property_data_type(data_type: str, property_value: str, **kwargs) -> Union[None, Decimal, str, bool, datetime]:
+    if not property_value:
+        return None
+    if property_value == '':
+        return None
+    if isinstance(property_value, str):
+        return _set_string_property_data_type(data_type, property_value)
+    return _set_property_data_type(data_type, property_value)
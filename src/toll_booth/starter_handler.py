@@ -1,11 +1,15 @@
+import codecs
+import json
 import logging
 import os
-import re
-import uuid
+from json.decoder import WHITESPACE
+from typing import Iterator, Iterable, Dict, Any
 
 import boto3
-import rapidjson
-from algernon.aws import lambda_logged, ruffians, StoredData
+from algernon.aws import lambda_logged
+
+from toll_booth.obj import config
+from toll_booth.tasks.starter import StartCursor, start_objects
 
 
 ENVIRON_VARIABLES = [
@@ -22,34 +26,63 @@ ENVIRON_VARIABLES = [
 ]
 
 
-def _load_config(variable_names):
-    client = boto3.client('ssm')
-    response = client.get_parameters(Names=[x for x in variable_names])
-    results = [(x['Name'], x['Value']) for x in response['Parameters']]
-    for entry in results:
-        os.environ[entry[0]] = entry[1]
+def _decode_buffered(decoder: json.JSONDecoder, buffer: str, final: bool = False):
+    parsed_objects = []
+    position = WHITESPACE.match(buffer, 0).end()
+    while position < len(buffer):
+        try:
+            parsed_object, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            break
+        parsed_objects.append(parsed_object)
+        position = WHITESPACE.match(buffer, position).end()
+    return parsed_objects, buffer[position:]
+
+
+def _iterate_json_objects(chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """yields the objects held in a stream of concatenated or newline delimited JSON, as each one is completed
+
+        bytes are decoded incrementally, so a multi-byte character split across two chunks is handled, and only the
+            text of the objects in the current chunk is held in memory
+
+    Args:
+        chunks: the raw bytes of the stream, in pieces of any size
+
+    Returns:
+        an iterator of the parsed objects, in the order they appear in the stream
+
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    for chunk in chunks:
+        parsed_objects, buffer = _decode_buffered(decoder, buffer + text_decoder.decode(chunk))
+        yield from parsed_objects
+    parsed_objects, _ = _decode_buffered(decoder, buffer + text_decoder.decode(b'', final=True), final=True)
+    yield from parsed_objects
+
+
+def _derive_payload_location(original_payload):
+    request_params = original_payload['detail']['requestParameters']
+    return request_params['bucketName'], request_params['key']
 
 
-def _retrieve_event_driven_payload(original_payload):
-    _load_config(ENVIRON_VARIABLES)
+def _retrieve_event_driven_payload(original_payload) -> Iterator[Dict[str, Any]]:
+    config.load_config(ENVIRON_VARIABLES)
     logging.info(f'received a notice of a new s3_object: {original_payload}')
-    pattern = re.compile(r'#!#')
-    event_detail = original_payload['detail']
-    request_params = event_detail['requestParameters']
-    bucket_name = request_params['bucketName']
-    file_key = request_params['key']
+    bucket_name, file_key = _derive_payload_location(original_payload)
     stored_event_obj = boto3.resource('s3').Object(bucket_name, file_key)
-    stored_event = stored_event_obj.get()['Body'].read().decode()
-    un_joined_pattern = re.compile(r'}(\s*){')
-    prepped_event = un_joined_pattern.sub('}#!#{', stored_event)
-    pieces = pattern.split(prepped_event)
-    return [rapidjson.loads(x) for x in pieces if x]
+    stored_event_body = stored_event_obj.get()['Body']
+    chunk_size = int(os.getenv('STARTER_CHUNK_SIZE', 1024 * 1024))
+    return _iterate_json_objects(stored_event_body.iter_chunks(chunk_size=chunk_size))
 
 
 @lambda_logged
 def starter_handler(event, context):
     stored_objects = _retrieve_event_driven_payload(event)
-    for stored_object in stored_objects:
-        logging.info(f'after parsing, the following object is ready for leeching: {stored_object}')
-        stored_data = StoredData.from_object(uuid.uuid4(), stored_object, full_unpack=True)
-        ruffians.start_machine('aio_sfn', stored_data)
+    bucket_name, file_key = _derive_payload_location(event)
+    cursor = StartCursor(os.environ['PROGRESS_TABLE_NAME'], bucket_name, file_key)
+    results = start_objects(stored_objects, cursor, context)
+    logging.info(f'started the machines for s3_object: {bucket_name}/{file_key}, {results}')
@@ -1,7 +1,41 @@
-from toll_booth.tasks.leech import leech
-from toll_booth.tasks.push_to_graph import push_graph
-from toll_booth.tasks.push_to_index import push_index
-from toll_booth.tasks.push_to_s3 import push_s3
-from toll_booth.tasks.push_event import push_event
-from toll_booth.tasks.mark_push import mark_push_complete
-from toll_booth.tasks.get_local_max import get_local_max
+"""the tasks which can be invoked through toll_booth.handler
+
+    task modules pull in heavy dependencies (elasticsearch, the graph driver, the schema machinery), and most
+        invocations need only one of them, so each task is imported from its module on first use
+"""
+import importlib
+
+_task_modules = {
+    'leech': 'toll_booth.tasks.leech',
+    'leech_batch': 'toll_booth.tasks.leech',
+    'push_graph': 'toll_booth.tasks.push_to_graph',
+    'push_index': 'toll_booth.tasks.push_to_index',
+    'push_index_batch': 'toll_booth.tasks.push_to_index',
+    'push_s3': 'toll_booth.tasks.push_to_s3',
+    'push_event': 'toll_booth.tasks.push_event',
+    'push_all': 'toll_booth.tasks.push_all',
+    'mark_push_complete': 'toll_booth.tasks.mark_push',
+    'get_local_max': 'toll_booth.tasks.get_local_max'
+}
+
+__all__ = list(_task_modules.keys())
+
+
+def resolve_task(task_name: str):
+    """imports the module holding the named task, and returns the task function
+
+    Raises:
+        AttributeError: if no task of that name is registered
+
+    """
+    try:
+        module_name = _task_modules[task_name]
+    except KeyError:
+        raise AttributeError(f'no task named: {task_name} is registered with {__name__}')
+    return getattr(importlib.import_module(module_name), task_name)
+
+
+def __getattr__(name):
+    task_fn = resolve_task(name)
+    globals()[name] = task_fn
+    return task_fn
@@ -1,11 +1,53 @@
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 
+import boto3
 from aws_xray_sdk.core import xray_recorder
 
-from toll_booth.obj.aio import AioMaster
+from toll_booth.obj.aio import AioMaster, AsyncAioMaster
+from toll_booth.obj.data_objects import SensitiveWriteBuffer
+from toll_booth.obj.index.index_manager import IndexManager
 from toll_booth.obj.schemata.schema import Schema
 
+_engines = {
+    'threaded': AioMaster,
+    'asyncio': AsyncAioMaster
+}
+
+
+def _generate_aio_master(object_type: str,
+                         identifier: str,
+                         id_value: int,
+                         extracted_data: Dict[str, Any],
+                         schema: Schema,
+                         progress_table_name: str,
+                         **kwargs) -> AioMaster:
+    aio_kwargs = {
+        'identifier': identifier,
+        'id_value': id_value,
+        'source_object_type': object_type,
+        'extracted_data': extracted_data,
+        'schema': schema,
+        'num_potential_workers': kwargs.get('num_potential_workers', 5),
+        'num_identified_workers': kwargs.get('num_identified_workers', 5),
+        'progress_table_name': progress_table_name,
+        'buffer_progress': kwargs.get('buffer_progress', True),
+        'batch_lookups': kwargs.get('batch_lookups', False),
+        'index_manager': kwargs.get('index_manager'),
+        'progress_table': kwargs.get('progress_table'),
+        'buffer_sensitive': kwargs.get('buffer_sensitive', True),
+        'sensitive_writes': kwargs.get('sensitive_writes')
+    }
+    engine = kwargs.get('engine', os.getenv('LEECH_ENGINE', 'threaded'))
+    if engine not in _engines:
+        raise RuntimeError(f'unknown leech engine: {engine}, expected one of {list(_engines.keys())}')
+    if engine == 'asyncio':
+        aio_kwargs['max_concurrency'] = kwargs.get('max_concurrency', 10)
+    return _engines[engine](**aio_kwargs)
+
 
 # @xray_recorder.capture()
 def leech(object_type: str,
@@ -26,17 +68,65 @@ def leech(object_type: str,
     """
     bucket_name = os.environ['STORAGE_BUCKET_NAME']
     progress_table_name = os.environ['PROGRESS_TABLE_NAME']
-    schema = Schema.retrieve(bucket_name)
-    aio_kwargs = {
-        'identifier': identifier,
-        'id_value': id_value,
-        'source_object_type': object_type,
-        'extracted_data': extracted_data,
-        'schema': schema,
-        'num_potential_workers': kwargs.get('num_potential_workers', 5),
-        'num_identified_workers': kwargs.get('num_identified_workers', 5),
-        'progress_table_name': progress_table_name
-    }
-    aio_master = AioMaster(**aio_kwargs)
+    schema = Schema.retrieve_cached(bucket_name)
+    aio_master = _generate_aio_master(
+        object_type, identifier, id_value, extracted_data, schema, progress_table_name, **kwargs)
     results = aio_master.work()
     return [{x: y.for_gql for x, y in a.items()} for a in results]
+
+
+def leech_batch(extractions: List[Dict[str, Any]], **kwargs) -> List[Dict]:
+    """leeches many extracted objects in a single invocation
+
+        the schema, index client and DynamoDB client are set up once and shared between every object in the batch,
+            up to batch_concurrency (default 5) objects are leeched at once. boto3 resources are not thread safe, so
+            each batch thread builds its own progress table from its own session, and reuses it for every object it
+            leeches. each object gets its own sensitive write buffer, so a value that fails to write is reported
+            against the object that queued it. a failure while leeching one object is reported in its result, and
+            does not stop the rest of the batch
+
+    Args:
+        extractions: a list of dicts, each holding the object_type, identifier, id_value and extracted_data for leech
+        kwargs: passed through to each leech, see leech
+
+    Returns:
+        one result per extraction, in the order received, with a status of succeeded or failed
+
+    """
+    bucket_name = os.environ['STORAGE_BUCKET_NAME']
+    progress_table_name = os.environ['PROGRESS_TABLE_NAME']
+    schema = Schema.retrieve_cached(bucket_name)
+    shared_kwargs = dict(kwargs)
+    shared_kwargs.setdefault('index_manager', IndexManager())
+    buffer_sensitive = kwargs.get('buffer_sensitive', True)
+    sensitive_client = boto3.client('dynamodb') if buffer_sensitive else None
+    batch_concurrency = int(kwargs.get('batch_concurrency', 5))
+    thread_resources = threading.local()
+
+    def _progress_table():
+        if 'progress_table' in kwargs:
+            return kwargs['progress_table']
+        if not hasattr(thread_resources, 'progress_table'):
+            session = boto3.session.Session()
+            thread_resources.progress_table = session.resource('dynamodb').Table(progress_table_name)
+        return thread_resources.progress_table
+
+    def _leech_extraction(extraction):
+        details = {'identifier': extraction.get('identifier'), 'id_value': extraction.get('id_value')}
+        try:
+            extraction_kwargs = dict(shared_kwargs, progress_table=_progress_table())
+            if buffer_sensitive:
+                extraction_kwargs.setdefault('sensitive_writes', SensitiveWriteBuffer(client=sensitive_client))
+            aio_master = _generate_aio_master(
+                extraction['object_type'], extraction['identifier'], extraction['id_value'],
+                extraction['extracted_data'], schema, progress_table_name, **extraction_kwargs)
+            results = aio_master.work()
+        except Exception as e:
+            logging.error(f'failed to leech {details} as part of a batch: {e}')
+            details['message'] = str(e)
+            return {'status': 'failed', 'operation': 'leech', 'details': details}
+        details['results'] = [{x: y.for_gql for x, y in a.items()} for a in results]
+        return {'status': 'succeeded', 'operation': 'leech', 'details': details}
+
+    with ThreadPoolExecutor(max_workers=batch_concurrency) as executor:
+        return list(executor.map(_leech_extraction, extractions))
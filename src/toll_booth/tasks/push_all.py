@@ -0,0 +1,115 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from datetime import datetime
+from typing import Dict, Any, List
+
+import boto3
+from aws_xray_sdk.core import xray_recorder
+
+from toll_booth.obj.graph.ogm import Ogm
+from toll_booth.obj.index.index_manager import IndexManager
+from toll_booth.obj.property_resolver import PropertyResolver
+from toll_booth.tasks.mark_push import mark_push_complete
+from toll_booth.tasks.push_event import push_event
+from toll_booth.tasks.push_to_graph import graph_leech
+from toll_booth.tasks.push_to_index import index_leeches
+from toll_booth.tasks.push_to_s3 import push_s3
+
+_sink_operations = {
+    'graph': {'source_vertex': 'graph_vertex', 'other_vertex': 'graph_vertex', 'edge': 'graph_edge'},
+    'index': {'source_vertex': 'index_object', 'other_vertex': 'index_object', 'edge': 'index_object'},
+    's3': {'source_vertex': 'store_to_s3', 'other_vertex': 'store_to_s3', 'edge': 'store_to_s3'}
+}
+
+
+def _generate_failed_results(sink_name: str, leech: Dict[str, Any], message) -> Dict[str, Dict]:
+    """generates a failed result, in the shape the sink would have returned, for each object in the leech"""
+    failed_results = {}
+    for object_name, operation in _sink_operations[sink_name].items():
+        if not leech.get(object_name):
+            continue
+        failed_results[object_name] = {
+            'status': 'failed',
+            'operation': operation,
+            'details': {
+                'message': message
+            }
+        }
+    return failed_results
+
+
+def _collect_sink_result(sink_name: str, future, deadline: float, leech: Dict[str, Any]):
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except TimeoutError:
+        logging.error(f'the {sink_name} push did not complete before its timeout')
+        return _generate_failed_results(sink_name, leech, f'{sink_name} push timed out')
+    except Exception as e:
+        logging.error(f'the {sink_name} push failed: {e}')
+        return _generate_failed_results(sink_name, leech, e.args)
+
+
+@xray_recorder.capture()
+def push_all(leech, **kwargs) -> List[Dict]:
+    """pushes a leeched object to the graph, the index, S3 (if a bucket_name is given) and the event bus at once
+
+        each sink runs in its own thread of this invocation, with the clients built once and shared, and each is
+            given sink_timeout seconds (PUSH_SINK_TIMEOUT, default 30) from the start of the push. the index and S3
+            pushes share a PropertyResolver, so each sensitive and stored value is fetched only once. a sink which
+            fails or times out is reported as a failed result for each of its objects, the progress update is then
+            written with mark_push_complete, as the separate push invocations would have done
+
+        a thread can not be stopped, so a sink which times out is abandoned rather than cancelled: it keeps running
+            after push_all returns, and if the lambda container is reused, it may finish its writes while the next
+            invocation is running, after its objects have been marked failed. the sink writes are idempotent (graph
+            upserts, index documents by internal_id, S3 objects written only if absent), so a late write does no
+            harm beyond the wasted work, though the recorded failed result may then be stale. keep sink_timeout well
+            under the lambda timeout, a sink still running when the invocation is frozen resumes in the next one
+
+    Args:
+        leech: the leeched object, holding the source_vertex, and the other_vertex and edge if present
+        kwargs: bucket_name and base_file_key for the S3 push, sink_timeout
+
+    Returns:
+        the graph, index and (when pushed to S3) s3 results, in the form passed to mark_push_complete
+
+    Raises:
+        RuntimeError: if the events could not be published, raised after the progress update has been written
+
+    """
+    logging.info(f'received a call to push_all: {leech}, {kwargs}')
+    sink_timeout = float(kwargs.get('sink_timeout', os.getenv('PUSH_SINK_TIMEOUT', 30)))
+    bucket_name = kwargs.get('bucket_name')
+    deadline = time.monotonic() + sink_timeout
+    resolver = PropertyResolver()
+    executor = ThreadPoolExecutor(max_workers=4)
+    try:
+        sinks = {
+            'graph': executor.submit(lambda: graph_leech(Ogm(), leech)),
+            'index': executor.submit(lambda: index_leeches(IndexManager(), [leech], resolver)[0])
+        }
+        if bucket_name:
+            s3_kwargs = {
+                'bucket_name': bucket_name,
+                'base_file_key': kwargs.get('base_file_key', 'bulk'),
+                's3_resource': boto3.resource('s3'),
+                'property_resolver': resolver
+            }
+            sinks['s3'] = executor.submit(push_s3, leech, **s3_kwargs)
+        event_future = executor.submit(push_event, leech, event_client=boto3.client('events'))
+        push_results = [_collect_sink_result(x, y, deadline, leech) for x, y in sinks.items()]
+        try:
+            event_future.result(timeout=max(0.0, deadline - time.monotonic()))
+            event_error = None
+        except TimeoutError:
+            event_error = RuntimeError(f'publishing the events for {leech} timed out')
+        except Exception as e:
+            event_error = e
+    finally:
+        executor.shutdown(wait=False)
+    mark_push_complete(push_results, leech, datetime.now().isoformat())
+    if event_error is not None:
+        raise event_error
+    return push_results
@@ -23,8 +23,9 @@ def _generate_new_object_event(new_object, is_edge=False):
 @xray_recorder.capture()
 def push_event(leech, **kwargs):
     logging.info(f'received a call to the event_handler: {leech}, {kwargs}')
-    session = boto3.session.Session()
-    event_client = session.client('events')
+    event_client = kwargs.get('event_client')
+    if event_client is None:
+        event_client = boto3.session.Session().client('events')
     source_vertex = leech['source_vertex']
     entries = [_generate_new_object_event(source_vertex)]
     if leech.get('edge'):
@@ -5,18 +5,23 @@ from aws_xray_sdk.core import xray_recorder
 from toll_booth.obj.graph.ogm import Ogm
 
 
+def graph_leech(ogm: Ogm, leech):
+    graph_results = {}
+    vertexes = {'source_vertex': leech['source_vertex']}
+    edges = {}
+    if leech.get('other_vertex'):
+        vertexes['other_vertex'] = leech['other_vertex']
+    if leech.get('edge'):
+        edges['edge'] = leech['edge']
+    vertex_results, edge_results = ogm.graph_cluster(list(vertexes.values()), list(edges.values()))
+    graph_results.update(zip(vertexes.keys(), vertex_results))
+    graph_results.update(zip(edges.keys(), edge_results))
+    return graph_results
+
+
 @xray_recorder.capture()
 def push_graph(leech, **kwargs):
     logging.info(f'received a call to the graph_handler: {leech}, {kwargs}')
-    graph_results = {}
     ogm = Ogm()
     logging.info(f'created ogm: {ogm}')
-    edge = leech.get('edge')
-    other_vertex = leech.get('other_vertex')
-    source_vertex = leech['source_vertex']
-    graph_results['source_vertex'] = ogm.graph_vertex(source_vertex)
-    if other_vertex:
-        graph_results['other_vertex'] = ogm.graph_vertex(other_vertex)
-    if edge:
-        graph_results['edge'] = ogm.graph_edge(edge)
-    return graph_results
+    return graph_leech(ogm, leech)
@@ -1,53 +1,102 @@
 import logging
+from typing import List, Dict
 
 from aws_xray_sdk.core import xray_recorder
 
 from toll_booth.obj.index.index_manager import IndexManager
 from toll_booth.obj.index.mission import format_object_for_index
 from toll_booth.obj.index.troubles import UniqueIndexViolationException
+from toll_booth.obj.property_resolver import PropertyResolver
 
 
-def _index_object(index_manager: IndexManager, scalar, is_edge=False):
-    index_object = format_object_for_index(scalar, is_edge)
-    try:
-        index_manager.index_object(index_object, is_edge)
-        return {
-            'status': 'succeeded',
-            'operation': 'index_object',
-            'details': {
-                'message': ''
-            }
-        }
-    except UniqueIndexViolationException as e:
-        logging.warning(f'attempted to index {scalar}, it seems it has already been indexed: {e.index_name}')
+def _generate_index_result(scalar, outcome):
+    if isinstance(outcome, UniqueIndexViolationException):
+        logging.warning(f'attempted to index {scalar}, it seems it has already been indexed: {outcome.index_name}')
         return {
             'status': 'failed',
             'operation': 'index_object',
             'details': {
-                'message': f'attempted to index {scalar}, it seems it has already been indexed: {e.index_name}'
+                'message': f'attempted to index {scalar}, it seems it has already been indexed: {outcome.index_name}'
             }
         }
-    except Exception as e:
+    if isinstance(outcome, Exception):
         return {
             'status': 'failed',
             'operation': 'index_object',
             'details': {
-                'message': e.args
+                'message': outcome.args
             }
         }
+    return {
+        'status': 'succeeded',
+        'operation': 'index_object',
+        'details': {
+            'message': ''
+        }
+    }
+
+
+def _collect_leeched_objects(leech):
+    leeched_objects = [('source_vertex', leech['source_vertex'], False)]
+    if leech.get('other_vertex'):
+        leeched_objects.append(('other_vertex', leech['other_vertex'], False))
+    if leech.get('edge'):
+        leeched_objects.append(('edge', leech['edge'], True))
+    return leeched_objects
+
+
+def index_leeches(index_manager: IndexManager, leeches: List[Dict], resolver: PropertyResolver = None) -> List[Dict]:
+    """indexes every object from a collection of leech results with a single bulk request
+
+        the sensitive and stored values of every object are prefetched together before any object is formatted.
+            an object which can not be formatted is reported as failed, and the rest of the objects are still indexed
+
+    Args:
+        index_manager:
+        leeches: the leech results, each containing a source_vertex, and optionally an other_vertex and edge
+        resolver: the PropertyResolver to fetch values through, one is made for the call if not provided
+
+    Returns:
+        for each leech, in order, the index results keyed by the name of the leeched object
+
+    """
+    entries = []
+    for leech_pointer, leech in enumerate(leeches):
+        for object_name, scalar, is_edge in _collect_leeched_objects(leech):
+            entries.append((leech_pointer, object_name, scalar, is_edge))
+    if resolver is None:
+        resolver = PropertyResolver()
+    resolver.prefetch([(x[2], x[3]) for x in entries])
+    outcomes = [None] * len(entries)
+    index_entries = []
+    for pointer, entry in enumerate(entries):
+        _, _, scalar, is_edge = entry
+        try:
+            index_entries.append((pointer, (format_object_for_index(scalar, is_edge, resolver), is_edge)))
+        except Exception as e:
+            logging.error(f'could not format {scalar} for the index: {e}')
+            outcomes[pointer] = e
+    if index_entries:
+        indexed = index_manager.index_objects([x[1] for x in index_entries])
+        for index_entry, outcome in zip(index_entries, indexed):
+            outcomes[index_entry[0]] = outcome
+    index_results = [{} for _ in leeches]
+    for entry, outcome in zip(entries, outcomes):
+        leech_pointer, object_name, scalar, _ = entry
+        index_results[leech_pointer][object_name] = _generate_index_result(scalar, outcome)
+    return index_results
 
 
 @xray_recorder.capture('push_index')
 def push_index(leech, **kwargs):
     logging.info(f'received a call to the index_handler: {leech}, {kwargs}')
-    index_results = {}
     index_manager = IndexManager()
-    source_vertex = leech['source_vertex']
-    edge = leech.get('edge')
-    other_vertex = leech.get('other_vertex')
-    index_results['source_vertex'] = _index_object(index_manager, source_vertex)
-    if other_vertex:
-        index_results['other_vertex'] = _index_object(index_manager, other_vertex)
-    if edge:
-        index_results['edge'] = _index_object(index_manager, edge, is_edge=True)
-    return index_results
+    index_results = index_leeches(index_manager, [leech])
+    return index_results[0]
+
+
+@xray_recorder.capture('push_index_batch')
+def push_index_batch(leeches, **kwargs):
+    logging.info(f'received a call to the batch index_handler: {leeches}, {kwargs}')
+    index_manager = IndexManager()
+    return index_leeches(index_manager, leeches)
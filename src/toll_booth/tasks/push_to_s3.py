@@ -3,27 +3,27 @@ from decimal import Decimal
 import boto3
 import rapidjson
 from aws_xray_sdk.core import xray_recorder
-from botocore.exceptions import ClientError
 
-from toll_booth.obj.data_objects import SensitivePropertyValue
 from toll_booth.obj.data_objects.object_properties.stored_property import S3StoredPropertyValue
+from toll_booth.obj.property_resolver import PropertyResolver
+from toll_booth.obj.s3_writes import put_if_absent, check_for_object, is_known
 from toll_booth.obj.serializers import FireHoseEncoder
 from toll_booth.obj.utils import set_property_data_type
 
 
-def _reconstitute_object_property(property_type, object_property):
+def _reconstitute_object_property(property_type, object_property, resolver: PropertyResolver):
     if property_type == 'stored_properties':
         storage_class = object_property['storage_class']
         if storage_class == 's3':
             data_type = object_property['data_type']
             storage_uri = object_property['storage_uri']
             stored_data = S3StoredPropertyValue(data_type, storage_class, storage_uri)
-            stored_property_value = stored_data.retrieve()
+            stored_property_value = stored_data.decode(resolver.stored_value(storage_uri))
             return stored_property_value
         raise RuntimeError(f'do not know how to reconstitute for storage_class: {storage_class}')
     if property_type == 'sensitive_properties':
         pointer = object_property['pointer']
-        sensitive_data = SensitivePropertyValue.from_insensitive_pointer(pointer)
+        sensitive_data = set_property_data_type('S', resolver.sensitive_value(pointer))
         return sensitive_data
     if property_type == 'local_properties':
         data_type = object_property['data_type']
@@ -32,7 +32,7 @@ def _reconstitute_object_property(property_type, object_property):
     raise RuntimeError(f'do not know how to reconstitute property type: {property_type}')
 
 
-def _format_object_properties_for_s3(scalar, is_edge=False):
+def _format_object_properties_for_s3(scalar, resolver: PropertyResolver, is_edge=False):
     collected_properties = {}
     object_property_name = 'edge_properties' if is_edge else 'vertex_properties'
     object_properties = scalar[object_property_name]
@@ -40,12 +40,12 @@ def _format_object_properties_for_s3(scalar, is_edge=False):
         for type_property in type_properties:
             property_name = type_property['property_name']
             if property_name not in collected_properties:
-                indexed_property = _reconstitute_object_property(property_type, type_property)
+                indexed_property = _reconstitute_object_property(property_type, type_property, resolver)
                 collected_properties[property_name] = indexed_property
     return collected_properties
 
 
-def _format_object_for_s3(scalar, is_edge=False):
+def _format_object_for_s3(scalar, resolver: PropertyResolver, is_edge=False):
     object_type_property = 'edge_label' if is_edge else 'vertex_type'
     identifier = scalar['identifier']['property_value']
     id_value = scalar['id_value']['property_value']
@@ -63,26 +63,32 @@ def _format_object_for_s3(scalar, is_edge=False):
         })
     if isinstance(id_value, int) or isinstance(id_value, Decimal):
         object_for_index['numeric_id_value'] = id_value
-    object_properties = _format_object_properties_for_s3(scalar, is_edge)
+    object_properties = _format_object_properties_for_s3(scalar, resolver, is_edge)
     object_for_index.update(object_properties)
     return object_for_index
 
 
 def _check_for_object(s3_object):
-    try:
-        s3_object.load()
-        return True
-    except ClientError as e:
-        if e.response['Error']['Code'] != '404':
-            raise e
-        return False
-
-
-def _store_to_s3(bucket_name, base_file_key, scalar, is_edge=False):
-    file_key = f'{base_file_key}/{scalar["internal_id"]}.json'
-    s3_resource = boto3.resource('s3')
+    return check_for_object(s3_object)
+
+
+def _generate_file_key(base_file_key, scalar):
+    return f'{base_file_key}/{scalar["internal_id"]}.json'
+
+
+def _store_to_s3(bucket_name, base_file_key, scalar, is_edge=False, s3_resource=None, resolver=None):
+    file_key = _generate_file_key(base_file_key, scalar)
+    if resolver is None:
+        resolver = PropertyResolver()
+    if s3_resource is None:
+        s3_resource = boto3.resource('s3')
     s3_object = s3_resource.Object(bucket_name, file_key)
-    if _check_for_object(s3_object):
+
+    def _generate_body():
+        object_for_s3 = _format_object_for_s3(scalar, resolver, is_edge)
+        return rapidjson.dumps(object_for_s3, default=FireHoseEncoder.default)
+
+    if not put_if_absent(s3_object, _generate_body, _check_for_object):
         return {
             'status': 'failed',
             'operation': 'store_to_s3',
@@ -92,8 +98,6 @@ def _store_to_s3(bucket_name, base_file_key, scalar, is_edge=False):
                 'file_key': file_key
             }
         }
-    object_for_s3 = _format_object_for_s3(scalar, is_edge)
-    s3_object.put(Body=rapidjson.dumps(object_for_s3, default=FireHoseEncoder.default))
     return {
             'status': 'succeeded',
             'operation': 'store_to_s3',
@@ -107,15 +111,33 @@ def _store_to_s3(bucket_name, base_file_key, scalar, is_edge=False):
 
 @xray_recorder.capture()
 def push_s3(leech, **kwargs):
+    """stores each object of the leech into S3 as json, under base_file_key, unless it is already there
+
+        the sensitive and stored values of every object to be written are prefetched together through the
+            property_resolver, if one is given it can be shared with the other pushes of the same leech
+
+    """
     s3_results = {}
     bucket_name = kwargs['bucket_name']
     base_file_key = kwargs['base_file_key']
     source_vertex = leech['source_vertex']
     edge = leech.get('edge')
     other_vertex = leech.get('other_vertex')
-    s3_results['source_vertex'] = _store_to_s3(bucket_name, base_file_key, source_vertex)
+    s3_resource = kwargs.get('s3_resource')
+    if s3_resource is None:
+        s3_resource = boto3.resource('s3')
+    resolver = kwargs.get('property_resolver')
+    if resolver is None:
+        resolver = PropertyResolver()
+    leeched_objects = [('source_vertex', source_vertex, False)]
     if other_vertex:
-        s3_results['other_vertex'] = _store_to_s3(bucket_name, base_file_key, other_vertex)
+        leeched_objects.append(('other_vertex', other_vertex, False))
     if edge:
-        s3_results['edge'] = _store_to_s3(bucket_name, base_file_key, edge, is_edge=True)
+        leeched_objects.append(('edge', edge, True))
+    resolver.prefetch([
+        (scalar, is_edge) for _, scalar, is_edge in leeched_objects
+        if not is_known(bucket_name, _generate_file_key(base_file_key, scalar))])
+    for object_name, scalar, is_edge in leeched_objects:
+        store_args = (bucket_name, base_file_key, scalar, is_edge, s3_resource, resolver)
+        s3_results[object_name] = _store_to_s3(*store_args)
     return s3_results
@@ -0,0 +1,200 @@
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterable, Dict, Any
+
+import boto3
+from algernon.aws import ruffians, StoredData
+from botocore.exceptions import ClientError
+
+_throttling_codes = (
+    'Throttling', 'ThrottlingException', 'TooManyRequestsException', 'RequestLimitExceeded', 'SlowDown',
+    'ProvisionedThroughputExceededException'
+)
+
+
+def _is_throttled(exception: Exception) -> bool:
+    if not isinstance(exception, ClientError):
+        return False
+    return exception.response.get('Error', {}).get('Code') in _throttling_codes
+
+
+class AdaptiveBackoff:
+    """a delay shared by every worker of a starter, which grows while calls are throttled and shrinks as they succeed
+
+        each throttled call doubles the shared delay (up to max_delay), each successful call halves it, every call
+            waits a random (full jitter) fraction of the current delay before going out
+    """
+    def __init__(self, base_delay: float = 0.05, max_delay: float = 5.0):
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._delay = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def delay(self) -> float:
+        with self._lock:
+            return self._delay
+
+    def wait(self):
+        delay = self.delay
+        if delay:
+            time.sleep(random.uniform(0, delay))
+
+    def record_success(self):
+        with self._lock:
+            self._delay = self._delay / 2 if self._delay > self._base_delay else 0.0
+
+    def record_throttle(self):
+        with self._lock:
+            self._delay = min(max(self._delay * 2, self._base_delay), self._max_delay)
+
+
+class StartCursor:
+    """tracks how far into a file the state machines have been started, so a retried invocation can resume
+
+        objects are started concurrently and so finish out of order, the cursor holds the watermark: the count of
+            objects from the start of the file which have all been started. the watermark is kept in the progress
+            table, under the identifier #starter#{bucket_name}#{file_key}, and only ever moves forward
+    """
+    def __init__(self, table_name: str, bucket_name: str, file_key: str, table=None):
+        if table is None:
+            table = boto3.resource('dynamodb').Table(table_name)
+        self._table = table
+        self._key = {'identifier': f'#starter#{bucket_name}#{file_key}', 'id_value': 0}
+        self._lock = threading.Lock()
+        self._watermark = 0
+        self._saved_watermark = 0
+        self._started = set()
+
+    @property
+    def watermark(self) -> int:
+        with self._lock:
+            return self._watermark
+
+    def load(self) -> int:
+        response = self._table.get_item(Key=self._key, ConsistentRead=True)
+        watermark = int(response.get('Item', {}).get('started_count', 0))
+        with self._lock:
+            self._watermark = watermark
+            self._saved_watermark = watermark
+            self._started = set()
+        return watermark
+
+    def mark_started(self, ordinal: int):
+        with self._lock:
+            self._started.add(ordinal)
+            while self._watermark in self._started:
+                self._started.remove(self._watermark)
+                self._watermark += 1
+
+    def save(self):
+        with self._lock:
+            watermark = self._watermark
+            if watermark <= self._saved_watermark:
+                return
+        try:
+            self._table.update_item(
+                Key=self._key,
+                UpdateExpression='SET started_count=:w, updated_at=:u',
+                ConditionExpression='attribute_not_exists(started_count) OR started_count < :w',
+                ExpressionAttributeValues={':w': watermark, ':u': datetime.now().isoformat()}
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+        with self._lock:
+            self._saved_watermark = max(self._saved_watermark, watermark)
+
+
+def _start_machine(stored_object: Dict[str, Any], backoff: AdaptiveBackoff, max_attempts: int):
+    stored_data = StoredData.from_object(uuid.uuid4(), stored_object, full_unpack=True)
+    for attempt in range(1, max_attempts + 1):
+        backoff.wait()
+        try:
+            ruffians.start_machine('aio_sfn', stored_data)
+        except ClientError as e:
+            if not _is_throttled(e) or attempt == max_attempts:
+                raise
+            logging.warning(f'throttled while starting a machine, attempt {attempt} of {max_attempts}: {e}')
+            backoff.record_throttle()
+            continue
+        backoff.record_success()
+        return
+
+
+def start_objects(stored_objects: Iterable[Dict[str, Any]], cursor: StartCursor, context=None, **kwargs):
+    """starts an aio state machine for each object, concurrently, resuming from the cursor
+
+        up to max_workers (STARTER_MAX_WORKERS, default 10) machines are started at once, and objects are only
+            pulled from stored_objects as workers become free, so a streamed payload is never held in full. the
+            cursor is saved every save_interval starts, and again before returning, even if reading stored_objects
+            fails part way through. submission stops once less than time_margin milliseconds remain in the
+            invocation, so the cursor is saved before the function is killed
+
+    Args:
+        stored_objects: the objects to start machines for, in the order they appear in the file
+        cursor: the StartCursor for the file
+        context: the lambda context, if present it is used to stop before the invocation times out
+        kwargs: max_workers, max_attempts, save_interval, time_margin
+
+    Returns:
+        a dict with the count of objects skipped and started, and the final watermark
+
+    Raises:
+        RuntimeError: if any object could not be started, or the invocation ran short of time, so that the
+            invocation is retried from the saved cursor
+
+    """
+    max_workers = int(kwargs.get('max_workers', os.getenv('STARTER_MAX_WORKERS', 10)))
+    max_attempts = int(kwargs.get('max_attempts', os.getenv('STARTER_MAX_ATTEMPTS', 6)))
+    save_interval = int(kwargs.get('save_interval', os.getenv('STARTER_SAVE_INTERVAL', 50)))
+    time_margin = int(kwargs.get('time_margin', os.getenv('STARTER_TIME_MARGIN', 10000)))
+    start_from = cursor.load()
+    backoff = AdaptiveBackoff()
+    slots = threading.BoundedSemaphore(max_workers * 2)
+    failures = []
+    counts = {'skipped': 0, 'started': 0}
+    counts_lock = threading.Lock()
+    out_of_time = False
+
+    def _start(ordinal, stored_object):
+        try:
+            logging.info(f'after parsing, the following object is ready for leeching: {stored_object}')
+            _start_machine(stored_object, backoff, max_attempts)
+            cursor.mark_started(ordinal)
+            with counts_lock:
+                counts['started'] += 1
+                should_save = counts['started'] % save_interval == 0
+            if should_save:
+                cursor.save()
+        except Exception as e:
+            logging.error(f'could not start a machine for object {ordinal}: {e}')
+            failures.append((ordinal, e))
+        finally:
+            slots.release()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for ordinal, stored_object in enumerate(stored_objects):
+                if ordinal < start_from:
+                    counts['skipped'] += 1
+                    continue
+                if context is not None and context.get_remaining_time_in_millis() < time_margin:
+                    out_of_time = True
+                    break
+                slots.acquire()
+                executor.submit(_start, ordinal, stored_object)
+    finally:
+        cursor.save()
+    results = dict(counts, watermark=cursor.watermark)
+    if failures or out_of_time:
+        raise RuntimeError(
+            f'could not start every object in the file, failed: {[x[0] for x in failures]}, '
+            f'out of time: {out_of_time}, progress: {results}')
+    return results
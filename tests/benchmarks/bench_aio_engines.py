@@ -0,0 +1,114 @@
+"""throughput and latency of the threaded and asyncio leech engines, against local stand-in services
+
+    run from the repository root with: PYTHONPATH=src python tests/benchmarks/bench_aio_engines.py
+
+    the stand-ins sleep to mimic the network: each index lookup takes INDEX_LATENCY, each progress update takes
+        PROGRESS_LATENCY, and each edge takes EDGE_LATENCY (the S3 and DynamoDB writes made while converting its
+        properties). rule evaluation and regulation are replaced, so only the scheduling of the engines is measured.
+        latency is measured from the start of the work to the completion of each potential connection
+"""
+import statistics
+import time
+
+from toll_booth.obj.aio import AioMaster, AsyncAioMaster
+
+INDEX_LATENCY = 0.005
+PROGRESS_LATENCY = 0.005
+EDGE_LATENCY = 0.002
+CONNECTION_COUNTS = (10, 100, 1000)
+
+
+class _StandIn:
+    def __init__(self, name):
+        self._name = name
+
+    @property
+    def for_gql(self):
+        return {'internal_id': self._name}
+
+    @property
+    def internal_id(self):
+        return self._name
+
+    @property
+    def vertex_properties(self):
+        return []
+
+    @property
+    def object_type(self):
+        return 'MockVertex'
+
+    @property
+    def edge_type(self):
+        return '_mock_edge_'
+
+    @property
+    def is_create(self):
+        return False
+
+    def is_schema_complete(self, schema_entry):
+        return False
+
+    def freeze(self):
+        return self
+
+
+class _Schema:
+    def __getitem__(self, item):
+        return _StandIn(item)
+
+
+class _IndexManager:
+    def find_potential_vertexes(self, object_type, vertex_properties, schema):
+        time.sleep(INDEX_LATENCY)
+        return [_StandIn(f'found_{object_type}')]
+
+
+class _ProgressTable:
+    def update_item(self, **kwargs):
+        time.sleep(PROGRESS_LATENCY)
+
+
+def _build(engine, connection_count, completed_at):
+    kwargs = {
+        'index_manager': _IndexManager(),
+        'progress_table': _ProgressTable(),
+        'buffer_sensitive': False
+    }
+    aio_master = engine('some_identifier', 1001, 'MockVertex', {'source': {}}, _Schema(), 5, 5, 'some_table', **kwargs)
+    potential_vertexes = [(_StandIn(f'vertex_{x}'), _StandIn(f'rule_{x}')) for x in range(connection_count)]
+
+    def _generate_result_package(rule_entry, identified_vertex):
+        time.sleep(EDGE_LATENCY)
+        completed_at.append(time.perf_counter())
+        return {'edge': _StandIn(f'edge_{rule_entry.internal_id}')}
+
+    aio_master._generate_source_vertex = lambda: None
+    aio_master._derive_potential_vertexes = lambda: potential_vertexes
+    aio_master._generate_result_package = _generate_result_package
+    return aio_master
+
+
+def _run(engine, connection_count):
+    completed_at = []
+    aio_master = _build(engine, connection_count, completed_at)
+    started = time.perf_counter()
+    results = aio_master.work()
+    elapsed = time.perf_counter() - started
+    assert len(results) == connection_count
+    latencies = sorted(x - started for x in completed_at)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return connection_count / elapsed, statistics.median(latencies), p95
+
+
+def main():
+    engines = (('threaded', AioMaster), ('asyncio', AsyncAioMaster))
+    print(f'{"engine":<10}{"connections":>12}{"conn/s":>10}{"p50 ms":>10}{"p95 ms":>10}')
+    for connection_count in CONNECTION_COUNTS:
+        for engine_name, engine in engines:
+            throughput, p50, p95 = _run(engine, connection_count)
+            print(f'{engine_name:<10}{connection_count:>12}{throughput:>10.0f}{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
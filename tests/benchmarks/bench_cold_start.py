@@ -0,0 +1,53 @@
+"""import time of the leech handler per task, measured with python -X importtime in a fresh interpreter
+
+    run from the repository root with: PYTHONPATH=src python tests/benchmarks/bench_cold_start.py
+
+    each task is measured as a cold start would see it: toll_booth.handler is imported, and the task is resolved
+        through toll_booth.tasks.resolve_task. the 'every task' line imports every task module, which is what each
+        invocation paid before task modules were imported on first use, and the 'handler only' line is the floor
+        every task pays, most of it aws_xray_sdk and botocore. the figure is the sum of the cumulative import times
+        of the top level imports, less those of an empty interpreter (site, encodings), the median of RUNS
+        interpreters
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+from toll_booth.tasks import _task_modules
+
+RUNS = 7
+
+
+def _import_time(statement: str) -> float:
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        env=dict(os.environ), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, universal_newlines=True
+    )
+    total = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, package = line[len('import time:'):].split('|')
+        if not package.startswith('  '):
+            total += int(cumulative)
+    return total / 1000
+
+
+def _median_import_time(statement: str) -> float:
+    return statistics.median(_import_time(statement) for _ in range(RUNS))
+
+
+def main():
+    every_module = sorted(set(_task_modules.values()))
+    resolve = 'import toll_booth.handler; from toll_booth.tasks import resolve_task; resolve_task({!r})'
+    statements = [('handler only', 'import toll_booth.handler')]
+    statements.extend((x, resolve.format(x)) for x in _task_modules)
+    statements.append(('every task', 'import toll_booth.handler; ' + '; '.join(f'import {x}' for x in every_module)))
+    interpreter = _median_import_time('pass')
+    for name, statement in statements:
+        print(f'{name:<20} {_median_import_time(statement) - interpreter:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
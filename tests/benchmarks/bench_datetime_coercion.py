@@ -0,0 +1,59 @@
+"""cost of coercing encounter timestamps, dateutil against the fast path and the memoized coercion
+
+    run from the repository root with: PYTHONPATH=src python tests/benchmarks/bench_datetime_coercion.py
+
+    the timestamps mimic encounter payloads: encounter_datetime_in and _out as ISO-8601 with a Z or an offset,
+        the EMR's own MM/DD/YYYY hh:mm AM form, and dates of birth. values repeat, as they do when the same
+        encounter is read for the source vertex, its edges and its index entry. the 4000 distinct values fit in the
+        default COERCION_CACHE_SIZE of 4096
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+from dateutil import parser
+
+from toll_booth.obj import utils
+
+VALUE_COUNT = 20000
+UNIQUE_COUNT = 1000
+
+
+def _encounter_timestamps():
+    random.seed(13)
+    started = datetime(2019, 1, 1)
+    unique_values = []
+    for _ in range(UNIQUE_COUNT):
+        moment = started + timedelta(minutes=random.randrange(60 * 24 * 365))
+        unique_values.extend([
+            moment.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            moment.strftime('%Y-%m-%dT%H:%M:%S-05:00'),
+            moment.strftime('%m/%d/%Y %I:%M %p'),
+            moment.strftime('%m/%d/%Y')
+        ])
+    return [random.choice(unique_values) for _ in range(VALUE_COUNT)]
+
+
+def _time(fn, values):
+    started = time.perf_counter()
+    for value in values:
+        fn(value)
+    return (time.perf_counter() - started) / len(values)
+
+
+def main():
+    values = _encounter_timestamps()
+    utils._parse_datetime_cached.cache_clear()
+    utils._set_string_property_data_type.cache_clear()
+    timings = [
+        ('dateutil.parser.parse', _time(parser.parse, values)),
+        ('fast path, uncached', _time(utils._parse_datetime, values)),
+        ('coerce_datetime', _time(utils.coerce_datetime, values)),
+        ('set_property_data_type DT', _time(lambda x: utils.set_property_data_type('DT', x), values))
+    ]
+    for name, per_value in timings:
+        print(f'{name:<28} {per_value * 1e6:.2f}us per value')
+
+
+if __name__ == '__main__':
+    main()
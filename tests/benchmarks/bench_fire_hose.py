@@ -0,0 +1,116 @@
+"""records per second through format_fire_hosed_extractions, against the previous per-record loop
+
+    run from the repository root with: PYTHONPATH=src python tests/benchmarks/bench_fire_hose.py
+
+    each batch holds 500 Encounter records, the most Firehose passes to a transform at once, with one malformed
+        record in every hundred. the two handlers take turns, so that drift in the machine load falls on both. the
+        per-record loop reproduces the previous handler: a rapidjson.loads per record, and a hand written encounter
+        projection serialized with rapidjson.dumps
+"""
+import base64
+import json
+import time
+
+import rapidjson
+
+from toll_booth.fire_hose_extraction_handler import format_fire_hosed_extractions
+
+BATCH_SIZE = 500
+ROUNDS = 50
+
+
+def _format_encounter_record(record_payload):
+    extracted_data = record_payload.get('extracted_data', {})
+    source_data = extracted_data.get('source', {})
+    patient_data = extracted_data.get('patient_data', [{}])
+    standard_record = {
+        'object_type': record_payload.get('object_type'),
+        'identifier': record_payload.get('identifier'),
+        'id_value': record_payload.get('id_value'),
+        'extracted_data': {
+            'source': {
+                'id_source': source_data.get('id_source'),
+                'encounter_id': source_data.get('encounter_id'),
+                'provider_id': source_data.get('provider_id'),
+                'patient_id': source_data.get('patient_id'),
+                'encounter_type': source_data.get('encounter_type'),
+                'encounter_datetime_in': source_data.get('encounter_datetime_in'),
+                'encounter_datetime_out': source_data.get('encounter_datetime_out'),
+                'documentation': source_data.get('documentation')
+            },
+            'patient_data': [
+                {
+                    'last_name': x.get('last_name'),
+                    'first_name': x.get('first_name'),
+                    'dob': x.get('dob')
+                } for x in patient_data
+            ]
+        }
+    }
+    return rapidjson.dumps(standard_record)
+
+
+def _per_record_loop(event, context):
+    output = []
+    for record in event['records']:
+        record_id = record['recordId']
+        original_payload = base64.b64decode(record['data'])
+        try:
+            record_payload = rapidjson.loads(original_payload)
+            object_type = record_payload['object_type']
+            if object_type != 'Encounter':
+                raise RuntimeError(f'do not know how to manage {record_payload} for object_type: {object_type}')
+            payload = f'{_format_encounter_record(record_payload)}\n'
+            output_record = {'recordId': record_id, 'result': 'Ok', 'data': base64.b64encode(payload.encode())}
+        except (rapidjson.JSONDecodeError, KeyError, RuntimeError):
+            output_record = {
+                'recordId': record_id, 'result': 'ProcessingFailed', 'data': base64.b64encode(original_payload)}
+        output.append(output_record)
+    return {'records': output}
+
+
+def _event():
+    records = []
+    for x in range(BATCH_SIZE):
+        payload = json.dumps({
+            'object_type': 'Encounter',
+            'identifier': '#vertex#Encounter#Algernon#',
+            'id_value': 10000 + x,
+            'extracted_data': {
+                'source': {
+                    'id_source': 'Algernon',
+                    'encounter_id': 10000 + x,
+                    'provider_id': x % 40,
+                    'patient_id': x % 300,
+                    'encounter_type': 'Individual Therapy',
+                    'encounter_datetime_in': '2019-03-01T14:05:00Z',
+                    'encounter_datetime_out': '2019-03-01T14:55:00Z',
+                    'documentation': 'progress note ' * 20,
+                    'extra_field': 'dropped by the projection'
+                },
+                'patient_data': [{'last_name': 'Smith', 'first_name': 'Jo', 'dob': '1970-01-01', 'ssn': 'dropped'}]
+            }
+        }).encode()
+        if x % 100 == 99:
+            payload = payload[:len(payload) // 2]
+        records.append({'recordId': f'record_{x}', 'data': base64.b64encode(payload)})
+    return {'records': records}
+
+
+def main():
+    event = _event()
+    handlers = (('per-record loop', _per_record_loop), ('current', format_fire_hosed_extractions))
+    assert [x['result'] for x in _per_record_loop(event, None)['records']] == \
+        [x['result'] for x in format_fire_hosed_extractions(event, None)['records']]
+    timings = {name: [] for name, _ in handlers}
+    for _ in range(ROUNDS):
+        for name, handler in handlers:
+            started = time.perf_counter()
+            handler(event, None)
+            timings[name].append(time.perf_counter() - started)
+    for name, _ in handlers:
+        print(f'{name:<16} {BATCH_SIZE / min(timings[name]):,.0f} records/s, best of {ROUNDS}')
+
+
+if __name__ == '__main__':
+    main()
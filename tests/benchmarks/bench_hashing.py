@@ -0,0 +1,79 @@
+"""cost of internal id and sensitive pointer hashing over an edge-heavy leech, uncached against memoized
+
+    run from the repository root with: PYTHONPATH=src python tests/benchmarks/bench_hashing.py
+
+    the leech has one source vertex and EDGE_COUNT edges to TARGET_COUNT distinct target vertexes, so the same
+        target keys repeat, as they do when a source is linked to the same providers and patients over and over,
+        while every edge key is distinct. each vertex and edge id is read READS times (regulation, edge id
+        generation, property conversion), and each target holds two sensitive properties whose pointers are read
+        twice. the uncached classes reproduce the previous InternalId, an md5 on every read of id_value, and the
+        previous pointer, a sha3_512 on every read. the memos are cleared at the start of every round, so only the
+        repetition within a leech is credited
+"""
+import hashlib
+import time
+
+from toll_booth.obj.data_objects import InternalId, SensitivePropertyValue
+from toll_booth.obj.data_objects.identifiers import hash_internal_id
+from toll_booth.obj.data_objects.object_properties.sensitive_property import _hash_pointer
+
+EDGE_COUNT = 3000
+TARGET_COUNT = 300
+READS = 3
+ROUNDS = 20
+
+
+class _UncachedInternalId:
+    def __init__(self, internal_id):
+        self._internal_id = internal_id
+
+    @property
+    def id_value(self):
+        return hashlib.md5(self._internal_id.encode('utf-8')).hexdigest()
+
+
+class _UncachedSensitivePropertyValue:
+    def __init__(self, source_internal_id, property_name, sensitive_value):
+        self._source_internal_id = source_internal_id
+        self._property_name = property_name
+        self._sensitive_value = sensitive_value
+
+    @property
+    def pointer(self):
+        pointer_string = ''.join([self._property_name, self._source_internal_id])
+        return hashlib.sha3_512(pointer_string.encode('utf-8')).hexdigest()
+
+
+def _leech(internal_id_class, sensitive_class):
+    source_id = internal_id_class('#Encounter#Algernon#10001')
+    for edge_number in range(EDGE_COUNT):
+        target_number = edge_number % TARGET_COUNT
+        target_id = internal_id_class(f'#Patient#Algernon#{target_number}')
+        for _ in range(READS):
+            target_id.id_value
+        edge_id = internal_id_class(f'_received_{source_id.id_value}{target_id.id_value}{edge_number}')
+        for _ in range(READS):
+            edge_id.id_value
+        for property_name in ('last_name', 'first_name'):
+            sensitive_value = sensitive_class(target_id.id_value, property_name, 'some_value')
+            sensitive_value.pointer
+            sensitive_value.pointer
+
+
+def main():
+    timings = {'uncached': [], 'memoized': []}
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        _leech(_UncachedInternalId, _UncachedSensitivePropertyValue)
+        timings['uncached'].append(time.perf_counter() - started)
+        hash_internal_id.cache_clear()
+        _hash_pointer.cache_clear()
+        started = time.perf_counter()
+        _leech(InternalId, SensitivePropertyValue)
+        timings['memoized'].append(time.perf_counter() - started)
+    for name, round_timings in timings.items():
+        print(f'{name:<10} {EDGE_COUNT} edges: best of {ROUNDS} {min(round_timings) * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
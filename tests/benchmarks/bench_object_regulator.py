@@ -0,0 +1,67 @@
+"""throughput of ObjectRegulator.create_potential_vertex_data over a 1000 object batch
+
+    run from the repository root with: PYTHONPATH=src python tests/benchmarks/bench_object_regulator.py
+
+    the entry is modeled on the Encounter vertex of the surgeon test schema, it mixes String, Number and DateTime
+        properties, and holds no sensitive properties, so no AWS service is touched. only public APIs are used, so
+        the same script can be run against an older checkout, with PYTHONPATH pointed at its src, for the before
+        figure
+"""
+import time
+from datetime import datetime, timedelta
+
+from toll_booth.obj.regulators import ObjectRegulator
+from toll_booth.obj.schemata.entry_property import SchemaPropertyEntry
+from toll_booth.obj.schemata.schema_entry import SchemaVertexEntry, SchemaInternalIdKey, SchemaIdentifierStem
+
+BATCH_SIZE = 1000
+ROUNDS = 5
+
+
+def _schema_entry():
+    vertex_properties = {
+        'encounter_id': SchemaPropertyEntry('encounter_id', 'Number', is_id_value=True),
+        'provider_id': SchemaPropertyEntry('provider_id', 'Number'),
+        'patient_id': SchemaPropertyEntry('patient_id', 'Number'),
+        'encounter_type': SchemaPropertyEntry('encounter_type', 'String'),
+        'encounter_datetime_in': SchemaPropertyEntry('encounter_datetime_in', 'DateTime'),
+        'encounter_datetime_out': SchemaPropertyEntry('encounter_datetime_out', 'DateTime'),
+        'id_source': SchemaPropertyEntry('id_source', 'String'),
+        'documentation': SchemaPropertyEntry('documentation', 'String')
+    }
+    return SchemaVertexEntry(
+        'Encounter', vertex_properties, SchemaInternalIdKey(['object_type', 'id_source', 'encounter_id']),
+        SchemaIdentifierStem(['id_source']), {}, None, {}
+    )
+
+
+def _encounters():
+    started = datetime(2019, 1, 1, 8)
+    return [{
+        'encounter_id': str(10000 + x),
+        'provider_id': str(x % 40),
+        'patient_id': str(x % 300),
+        'encounter_type': 'Individual Therapy',
+        'encounter_datetime_in': (started + timedelta(hours=x)).strftime('%m/%d/%Y %I:%M %p'),
+        'encounter_datetime_out': (started + timedelta(hours=x, minutes=50)).strftime('%m/%d/%Y %I:%M %p'),
+        'id_source': 'Algernon',
+        'documentation': f'progress note {x}'
+    } for x in range(BATCH_SIZE)]
+
+
+def main():
+    schema_entry = _schema_entry()
+    batch = _encounters()
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        regulator = ObjectRegulator(schema_entry)
+        for object_data in batch:
+            regulator.create_potential_vertex_data(object_data)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f'{BATCH_SIZE} objects: best of {ROUNDS} {best * 1000:.1f}ms, {BATCH_SIZE / best:.0f} objects/s')
+
+
+if __name__ == '__main__':
+    main()
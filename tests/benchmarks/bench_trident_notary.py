@@ -0,0 +1,77 @@
+"""signing cost and connection reuse of the TridentNotary, before and after the cached key and pooled sessions
+
+    run from the repository root with: PYTHONPATH=src python tests/benchmarks/bench_trident_notary.py
+
+    the connection benchmark posts to a local HTTP/1.1 stand-in for Neptune, and counts the TCP connections it
+        accepts, one new session per push (as each TridentDriver used to build) against the pooled session
+"""
+import http.server
+import socket
+import threading
+import timeit
+
+import requests
+
+from toll_booth.obj.graph import trident_driver
+
+_SIGN_CALLS = 20000
+_PUSHES = 200
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        _Handler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = b'{"result": {"data": []}}'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _bench_signing():
+    derive = trident_driver._derive_signing_key
+    args = ('some_secret_key', '20261018', 'us-east-1', 'neptune-db')
+    uncached = timeit.timeit(lambda: derive.__wrapped__(*args), number=_SIGN_CALLS)
+    derive.cache_clear()
+    cached = timeit.timeit(lambda: derive(*args), number=_SIGN_CALLS)
+    print(f'signing key, per send: derived {uncached / _SIGN_CALLS * 1e6:.2f}us, '
+          f'cached {cached / _SIGN_CALLS * 1e6:.2f}us')
+
+
+def _bench_sessions(url):
+    def _push(session):
+        session.post(url, data='{"gremlin": "g.V()"}').raise_for_status()
+
+    _Handler.connections = 0
+    fresh = timeit.timeit(lambda: _push(requests.session()), number=_PUSHES)
+    fresh_connections = _Handler.connections
+    _Handler.connections = 0
+    trident_driver._sessions.clear()
+    pooled = timeit.timeit(lambda: _push(trident_driver.get_pooled_session(url)), number=_PUSHES)
+    print(f'{_PUSHES} pushes, new session each: {fresh:.3f}s, {fresh_connections} connections')
+    print(f'{_PUSHES} pushes, pooled session: {pooled:.3f}s, {_Handler.connections} connections')
+
+
+def main():
+    _bench_signing()
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _bench_sessions(f'http://127.0.0.1:{server.server_port}/gremlin/')
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""memory and property lookup latency of VertexData over 10k synthetic vertexes
+
+    run from the repository root with: PYTHONPATH=src python tests/benchmarks/bench_vertex_data.py
+
+    memory is measured after the first lookup, so it includes the property index VertexData builds on first use.
+        the list-scan vertex reproduces the previous VertexData: attributes in an instance __dict__, property dicts
+        holding their own copies of the name and data type strings, and a linear scan of the property list for
+        every lookup. the property names and data types are built at runtime, as they are when parsed from a
+        payload, so they are not interned by the compiler
+"""
+import time
+import tracemalloc
+
+from toll_booth.obj.data_objects.graph_objects import VertexData
+
+VERTEX_COUNT = 10000
+PROPERTY_COUNT = 20
+LOOKUP_ROUNDS = 5
+
+
+class _ListScanVertexData:
+    def __init__(self, object_type, internal_id, identifier, id_value, local_properties=None,
+                 stored_properties=None, sensitive_properties=None):
+        self._object_type = object_type
+        self._internal_id = internal_id
+        self._identifier = identifier
+        self._id_value = id_value
+        self._local_properties = local_properties or []
+        self._stored_properties = stored_properties or []
+        self._sensitive_properties = sensitive_properties or []
+        self._frozen = False
+        self._gql = None
+
+    def get_vertex_property(self, property_type, property_name):
+        for object_property in getattr(self, f'_{property_type}'):
+            if object_property['property_name'] == property_name:
+                return object_property
+        raise KeyError(property_name)
+
+
+def _runtime_string(*pieces):
+    return ''.join(pieces)
+
+
+def _vertex_args(vertex_number):
+    local_properties = [{
+        'property_name': _runtime_string('property_', str(x)),
+        'data_type': _runtime_string('S'),
+        'property_value': f'value_{vertex_number}_{x}'
+    } for x in range(PROPERTY_COUNT)]
+    identifier = {'property_name': 'identifier', 'data_type': 'S', 'property_value': '#vertex#MockVertex#'}
+    id_value = {'property_name': 'id_value', 'data_type': 'N', 'property_value': str(vertex_number)}
+    return 'MockVertex', f'vertex_{vertex_number}', identifier, id_value, local_properties
+
+
+def _measure(vertex_class):
+    property_names = [f'property_{x}' for x in range(PROPERTY_COUNT)]
+    tracemalloc.start()
+    vertexes = [vertex_class(*_vertex_args(x)) for x in range(VERTEX_COUNT)]
+    for vertex in vertexes:
+        vertex.get_vertex_property('local_properties', property_names[0])
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    for _ in range(LOOKUP_ROUNDS):
+        for vertex in vertexes:
+            for property_name in property_names:
+                vertex.get_vertex_property('local_properties', property_name)
+    elapsed = time.perf_counter() - started
+    lookups = LOOKUP_ROUNDS * VERTEX_COUNT * PROPERTY_COUNT
+    return memory, elapsed / lookups
+
+
+def main():
+    for name, vertex_class in (('list scan', _ListScanVertexData), ('VertexData', VertexData)):
+        memory, per_lookup = _measure(vertex_class)
+        print(f'{name:<12} {VERTEX_COUNT} vertexes: {memory / 2 ** 20:.1f}MiB, {per_lookup * 1e9:.0f}ns per lookup')
+
+
+if __name__ == '__main__':
+    main()
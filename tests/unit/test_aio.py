@@ -0,0 +1,84 @@
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from toll_booth.obj.aio import AioMaster, AsyncAioMaster
+
+
+def _identify_vertexes(potential_vertex, rule_entry, index_manager):
+    if potential_vertex == 'bad_vertex':
+        raise RuntimeError('index lookup failed')
+    return {'vertexes': [potential_vertex], 'status': 'fully_ready_to_graph'}
+
+
+def _aio_master(potential_vertexes, engine=AioMaster):
+    aio_master = engine(
+        'some_identifier', 1001, 'MockVertex', {'source': {}}, MagicMock(name='schema'), 2, 2, 'some_table',
+        buffer_progress=False, index_manager=MagicMock(), progress_table=MagicMock(), buffer_sensitive=False)
+    rule_entry = MagicMock(name='rule_entry')
+    aio_master._derive_potential_vertexes = lambda: [(x, rule_entry) for x in potential_vertexes]
+    aio_master._generate_source_vertex = MagicMock()
+    aio_master._generate_result_package = lambda rule, vertex: {'edge': MagicMock(name=vertex)}
+    return aio_master
+
+
+@pytest.mark.aio
+class TestAioMaster:
+    def test_route_found_vertexes(self, caplog):
+        found_vertexes = [MagicMock(name='vertex_data'), MagicMock(name='vertex_data')]
+        with caplog.at_level(logging.INFO):
+            results = AioMaster._route_found_vertexes('potential_vertex', MagicMock(), found_vertexes)
+        assert results == {'vertexes': found_vertexes, 'status': 'found_existing_vertexes'}
+        assert len([x for x in caplog.records if 'existing vertexes' in x.getMessage()]) == 1
+
+    def test_route_unsatisfied_create_rule(self):
+        rule_entry = MagicMock(is_create=True)
+        with pytest.raises(RuntimeError):
+            AioMaster._route_found_vertexes('potential_vertex', rule_entry, [])
+
+    def test_work(self):
+        aio_master = _aio_master(['vertex_0', 'vertex_1', 'vertex_2'])
+        with patch.object(AioMaster, '_identify_vertexes', side_effect=_identify_vertexes):
+            results = aio_master.work()
+        assert len(results) == 3
+
+    def test_work_worker_failure(self):
+        aio_master = _aio_master(['vertex_0', 'bad_vertex', 'vertex_2'])
+        with patch.object(AioMaster, '_identify_vertexes', side_effect=_identify_vertexes):
+            with pytest.raises(RuntimeError, match='index lookup failed'):
+                aio_master.work()
+
+    def test_identify_vertexes_batched_failed_lookup(self):
+        aio_master = _aio_master([])
+        aio_master._schema.__getitem__.return_value = MagicMock(name='schema_entry')
+        potential_vertexes = [(MagicMock(name=f'vertex_{x}'), MagicMock(name=f'rule_{x}', is_create=False))
+                              for x in range(2)]
+        for potential_vertex, _ in potential_vertexes:
+            potential_vertex.is_schema_complete.return_value = False
+        found_vertex = MagicMock(name='found_vertex')
+        found = [RuntimeError('search failed'), [found_vertex]]
+        aio_master.index_manager.find_potential_vertexes_many.return_value = found
+        identified = aio_master._identify_vertexes_batched(potential_vertexes)
+        assert identified[0][1] == {'vertexes': [], 'status': 'lookup_failed', 'message': 'search failed'}
+        assert identified[1][1] == {'vertexes': [found_vertex], 'status': 'found_existing_vertexes'}
+
+    @pytest.mark.parametrize('buffer_progress', [True, False])
+    def test_sensitive_writes_flushed_before_progress(self, buffer_progress):
+        calls = MagicMock(name='calls')
+        aio_master = AioMaster(
+            'some_identifier', 1001, 'MockVertex', {'source': {}}, MagicMock(name='schema'), 1, 1, 'some_table',
+            buffer_progress=buffer_progress, progress_table=calls.progress_table,
+            sensitive_writes=calls.sensitive_writes)
+        aio_master._generate_source_vertex = lambda: aio_master._mark_stage_completed('generate_source_vertex', {})
+        aio_master._derive_potential_vertexes = MagicMock(side_effect=RuntimeError('rules failed'))
+        with pytest.raises(RuntimeError, match='rules failed'):
+            aio_master.work()
+        call_names = [x[0] for x in calls.mock_calls]
+        assert call_names[:2] == ['sensitive_writes.flush', 'progress_table.update_item']
+
+    def test_async_work(self):
+        aio_master = _aio_master(['vertex_0', 'vertex_1', 'vertex_2'], AsyncAioMaster)
+        with patch.object(AioMaster, '_identify_vertexes', side_effect=_identify_vertexes):
+            results = aio_master.work()
+        assert len(results) == 3
@@ -0,0 +1,55 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from toll_booth.obj import config
+
+
+def _get_parameters(Names):
+    return {
+        'Parameters': [{'Name': x, 'Value': f'{x}_value'} for x in Names if not x.startswith('MISSING')],
+        'InvalidParameters': [x for x in Names if x.startswith('MISSING')]
+    }
+
+
+@pytest.fixture
+def ssm_client(monkeypatch):
+    monkeypatch.delenv('CONFIG_TTL', raising=False)
+    config.invalidate()
+    with patch('toll_booth.obj.config.boto3') as mock_boto, patch.dict(os.environ):
+        client = mock_boto.client.return_value
+        client.get_parameters.side_effect = _get_parameters
+        yield client
+    config.invalidate()
+
+
+@pytest.mark.config
+class TestConfig:
+    def test_load_config_chunking(self, ssm_client):
+        variable_names = [f'SOME_VARIABLE_{x}' for x in range(23)]
+        config.load_config(variable_names)
+        assert [len(x[1]['Names']) for x in ssm_client.get_parameters.call_args_list] == [10, 10, 3]
+        assert all(os.environ[x] == f'{x}_value' for x in variable_names)
+
+    def test_load_config_cached(self, ssm_client):
+        config.load_config(['SOME_VARIABLE', 'MISSING_VARIABLE'])
+        config.load_config(['SOME_VARIABLE', 'MISSING_VARIABLE'])
+        assert ssm_client.get_parameters.call_count == 1
+        assert 'MISSING_VARIABLE' not in os.environ
+        assert config.lookup_parameter('SOME_VARIABLE') == 'SOME_VARIABLE_value'
+        with pytest.raises(KeyError):
+            config.lookup_parameter('MISSING_VARIABLE')
+        assert ssm_client.get_parameters.call_count == 1
+
+    def test_load_config_preset_environment(self, ssm_client):
+        os.environ['PRESET_VARIABLE'] = 'preset_value'
+        config.load_config(['PRESET_VARIABLE', 'SOME_VARIABLE'])
+        assert ssm_client.get_parameters.call_args[1]['Names'] == ['SOME_VARIABLE']
+        assert os.environ['PRESET_VARIABLE'] == 'preset_value'
+
+    def test_load_config_ttl(self, ssm_client, monkeypatch):
+        monkeypatch.setenv('CONFIG_TTL', '0')
+        config.load_config(['SOME_VARIABLE'])
+        config.load_config(['SOME_VARIABLE'])
+        assert ssm_client.get_parameters.call_count == 2
@@ -0,0 +1,44 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from toll_booth.obj.index import elastic_driver
+from toll_booth.obj.index.elastic_driver import ElasticDriver
+
+
+@pytest.fixture
+def shared_clients():
+    elastic_driver._clients.clear()
+    with patch('toll_booth.obj.index.elastic_driver._build_client') as mock_build, \
+            patch('toll_booth.obj.index.elastic_driver.AWS4Auth') as mock_auth:
+        mock_build.side_effect = lambda *args: MagicMock(name='es_client')
+        yield mock_build, mock_auth
+    elastic_driver._clients.clear()
+
+
+@pytest.mark.elastic_driver
+@pytest.mark.usefixtures('shared_clients')
+class TestElasticDriver:
+    def test_shared_client(self, shared_clients):
+        mock_build, _ = shared_clients
+        first = elastic_driver._get_shared_client('some_host', 'access', 'secret', 'token_1', 'us-east-1')
+        second = elastic_driver._get_shared_client('some_host', 'access', 'secret', 'token_1', 'us-east-1')
+        assert first is second
+        assert mock_build.call_count == 1
+
+    def test_rotated_credentials(self, shared_clients):
+        mock_build, _ = shared_clients
+        first = elastic_driver._get_shared_client('some_host', 'access', 'secret', 'token_1', 'us-east-1')
+        second = elastic_driver._get_shared_client('some_host', 'access', 'secret', 'token_2', 'us-east-1')
+        assert first is not second
+        assert mock_build.call_count == 2
+        assert list(elastic_driver._clients.keys()) == [('some_host', 'access', 'token_2')]
+
+    def test_generate_reuses_client(self):
+        with patch('toll_booth.obj.index.elastic_driver.boto3.Session') as mock_session:
+            credentials = mock_session.return_value.get_credentials.return_value
+            credentials.access_key = 'access'
+            credentials.secret_key = 'secret'
+            first = ElasticDriver.generate('some_host')
+            second = ElasticDriver.generate('some_host')
+        assert first.es_client is second.es_client
@@ -0,0 +1,64 @@
+import base64
+import json
+
+import pytest
+
+from toll_booth.fire_hose_extraction_handler import _compile_projection, _decode_payloads, _unparsed, \
+    format_fire_hosed_extractions
+
+
+def _record(record_id, payload: bytes):
+    return {'recordId': record_id, 'data': base64.b64encode(payload)}
+
+
+@pytest.mark.fire_hose_extraction
+class TestFireHoseExtraction:
+    def test_compile_projection(self):
+        project = _compile_projection({'object_type': None, 'source': {'id_source': None}, 'patients': [{'dob': None}]})
+        record = {'object_type': 'Encounter', 'extra': 1, 'source': {'id_source': 'Algernon', 'extra': 2},
+                  'patients': [{'dob': '1970-01-01', 'extra': 3}, {}]}
+        assert project(record) == {
+            'object_type': 'Encounter', 'source': {'id_source': 'Algernon'},
+            'patients': [{'dob': '1970-01-01'}, {'dob': None}]
+        }
+        assert project({}) == {'object_type': None, 'source': {'id_source': None}, 'patients': [{'dob': None}]}
+
+    def test_decode_payloads(self):
+        assert _decode_payloads([b'{"id_value": 1}', b'{"id_value": 2}']) == [{'id_value': 1}, {'id_value': 2}]
+
+    def test_decode_payloads_unparsable(self):
+        parsed = _decode_payloads([b'{"id_value": 1}', b'{"id_value": ', b'{"id_value": 3}'])
+        assert parsed == [{'id_value': 1}, _unparsed, {'id_value': 3}]
+
+    def test_decode_payloads_miscounted(self):
+        parsed = _decode_payloads([b'{"id_value": 1}, {"id_value": 2}', b'{"id_value": 3}'])
+        assert parsed == [_unparsed, {'id_value': 3}]
+
+    def test_decode_payloads_split_record(self):
+        parsed = _decode_payloads([b'{"id_value": 1}, {"id_value": 2}', b'{"x": [1', b'2]}'])
+        assert parsed == [_unparsed, _unparsed, _unparsed]
+
+    def test_format_fire_hosed_extractions_split_record(self):
+        records = [
+            _record('record_0', b'{"object_type": "Encounter", "id_value": 1},'
+                                b'{"object_type": "Encounter", "id_value": 2}'),
+            _record('record_1', b'{"object_type": "Encounter", "x": [1'),
+            _record('record_2', b'2]}'),
+            _record('record_3', json.dumps({'object_type': 'Encounter', 'id_value': 3}).encode())
+        ]
+        output = format_fire_hosed_extractions({'records': records}, None)['records']
+        assert [x['result'] for x in output] == ['ProcessingFailed', 'ProcessingFailed', 'ProcessingFailed', 'Ok']
+        assert json.loads(base64.b64decode(output[3]['data']))['id_value'] == 3
+
+    def test_format_fire_hosed_extractions(self):
+        records = [
+            _record('record_0', json.dumps({'object_type': 'Encounter', 'identifier': 'some_identifier'}).encode()),
+            _record('record_1', b'{"object_type": '),
+            _record('record_2', json.dumps({'object_type': 'Unknown'}).encode())
+        ]
+        output = format_fire_hosed_extractions({'records': records}, None)['records']
+        assert [x['result'] for x in output] == ['Ok', 'ProcessingFailed', 'ProcessingFailed']
+        formatted = json.loads(base64.b64decode(output[0]['data']))
+        assert formatted['identifier'] == 'some_identifier'
+        assert formatted['extracted_data']['patient_data'] == [{'last_name': None, 'first_name': None, 'dob': None}]
+        assert base64.b64decode(output[1]['data']) == b'{"object_type": '
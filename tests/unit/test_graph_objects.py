@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from toll_booth.obj.data_objects import MissingObjectProperty
+from toll_booth.obj.data_objects.graph_objects import VertexData, EdgeData
+
+
+def _vertex_data(*local_properties):
+    return VertexData(
+        'MockVertex', 'vertex_0',
+        {'property_name': 'identifier', 'data_type': 'S', 'property_value': '#vertex#MockVertex#'},
+        {'property_name': 'id_value', 'data_type': 'N', 'property_value': '1001'},
+        [{'property_name': x, 'data_type': 'S', 'property_value': y} for x, y in local_properties],
+        sensitive_properties=[{'property_name': 'secret', 'data_type': 'S', 'pointer': 'some_pointer'}]
+    )
+
+
+def _property_schema(sensitive=False, is_stored=False):
+    return MagicMock(sensitive=sensitive, is_stored=is_stored)
+
+
+@pytest.mark.graph_objects
+class TestGraphObjects:
+    def test_frozen_for_gql(self):
+        vertex_data = _vertex_data(('some_property', 'some_value'))
+        assert vertex_data.for_gql is not vertex_data.for_gql
+        frozen = vertex_data.freeze()
+        assert frozen is vertex_data
+        assert frozen.is_frozen
+        assert frozen.for_gql is frozen.for_gql
+        assert frozen.for_gql['vertex_properties']['local_properties'][0]['property_value'] == 'some_value'
+
+    def test_frozen_edge_for_gql(self):
+        edge_data = EdgeData('_mock_edge_', 'edge_0', 'vertex_0', 'vertex_1').freeze()
+        edge_gql = edge_data.for_gql
+        assert edge_gql is edge_data.for_gql
+        assert edge_gql['edge_label'] == '_mock_edge_'
+        assert edge_gql['source_vertex_internal_id'] == 'vertex_0'
+
+    def test_indexed_property_lookup(self):
+        vertex_data = _vertex_data(('some_property', 'first'), ('some_property', 'second'))
+        assert vertex_data.get_vertex_property('local_properties', 'some_property')['property_value'] == 'first'
+        assert vertex_data['some_property'] == 'first'
+        assert vertex_data.contains_vertex_property('sensitive_properties', 'secret')
+        assert not vertex_data.contains_vertex_property('local_properties', 'secret')
+        with pytest.raises(KeyError):
+            vertex_data.get_vertex_property('local_properties', 'other_property')
+
+    def test_is_properties_complete(self):
+        schema_entry = MagicMock(vertex_properties={
+            'some_property': _property_schema(),
+            'secret': _property_schema(sensitive=True)
+        })
+        assert _vertex_data(('some_property', 'some_value')).is_properties_complete(schema_entry)
+        missing = _vertex_data(('some_property', MissingObjectProperty()))
+        assert not missing.is_properties_complete(schema_entry)
+
+    def test_slots(self):
+        edge_data = EdgeData('_mock_edge_', 'edge_0', 'vertex_0', 'vertex_1')
+        assert '_source_vertex_internal_id' in EdgeData.__slots__
+        assert '_property_index' in VertexData.__slots__
+        assert edge_data.target_vertex_internal_id == 'vertex_1'
@@ -0,0 +1,39 @@
+import hashlib
+
+import pytest
+
+from toll_booth.obj.data_objects import InternalId, SensitivePropertyValue
+from toll_booth.obj.data_objects import identifiers
+from toll_booth.obj.data_objects.object_properties import sensitive_property
+
+
+@pytest.mark.hashing
+class TestHashing:
+    def test_internal_id(self):
+        internal_id = InternalId('MockVertex#id_source#1001')
+        expected = hashlib.md5('MockVertex#id_source#1001'.encode('utf-8')).hexdigest()
+        assert internal_id.id_value == expected
+        assert str(internal_id) == expected
+        assert not hasattr(internal_id, '__dict__')
+
+    def test_internal_id_memoized(self):
+        identifiers.hash_internal_id.cache_clear()
+        first = InternalId('MockVertex#id_source#1001')
+        second = InternalId('MockVertex#id_source#1001')
+        assert first.id_value == second.id_value
+        cache_info = identifiers.hash_internal_id.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    def test_sensitive_pointer(self):
+        sensitive_property._hash_pointer.cache_clear()
+        sensitive_value = SensitivePropertyValue('vertex_0', 'last_name', 'some_value')
+        assert sensitive_property._hash_pointer.cache_info().misses == 0
+        expected = hashlib.sha3_512('last_namevertex_0'.encode('utf-8')).hexdigest()
+        assert sensitive_value.pointer == expected
+        assert sensitive_value.pointer == expected
+        other_value = SensitivePropertyValue('vertex_0', 'last_name', 'some_other_value')
+        assert other_value.pointer == expected
+        cache_info = sensitive_property._hash_pointer.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
@@ -0,0 +1,86 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from toll_booth.obj.index.index_manager import IndexManager
+from toll_booth.tasks.push_to_index import index_leeches
+
+
+def _scalar(internal_id, object_type='MockVertex'):
+    return {'internal_id': internal_id, 'object_type': object_type}
+
+
+def _leech(source_internal_id):
+    return {'source_vertex': _scalar(source_internal_id)}
+
+
+@pytest.fixture
+def index_manager():
+    with patch('toll_booth.obj.index.index_manager.ElasticDriver') as mock_driver, \
+            patch.object(IndexManager, '_check_indexed_properties'):
+        mock_driver.generate.return_value = MagicMock(name='elastic_driver')
+        yield IndexManager('some_host')
+
+
+def _format_for_index(scalar, is_edge, resolver):
+    if scalar['internal_id'] == 'bad_vertex':
+        raise RuntimeError('sensitive value cannot be found: some_pointer')
+    return scalar
+
+
+@pytest.mark.index_manager
+class TestIndexManager:
+    def test_index_objects(self, index_manager):
+        driver = index_manager._elastic_driver
+        driver.bulk_create.return_value = [{'status': 201}, {'status': 409}]
+        outcomes = index_manager.index_objects([(_scalar('vertex_0'), False), (_scalar('vertex_1'), False)])
+        assert outcomes[0] == _scalar('vertex_0')
+        assert outcomes[1].index_name == 'InternalIdIndex'
+
+    def test_index_objects_failed_bulk(self, index_manager):
+        driver = index_manager._elastic_driver
+        driver.bulk_create.side_effect = RuntimeError('413 request entity too large')
+        outcomes = index_manager.index_objects([(_scalar('vertex_0'), False), (_scalar('vertex_1'), False)])
+        assert all(isinstance(x, RuntimeError) for x in outcomes)
+
+    def test_index_leeches_failed_bulk(self, index_manager):
+        index_manager._elastic_driver.bulk_create.side_effect = RuntimeError('connection timed out')
+        with patch('toll_booth.tasks.push_to_index.format_object_for_index', side_effect=_format_for_index):
+            results = index_leeches(index_manager, [_leech('vertex_0'), _leech('vertex_1')], MagicMock())
+        assert [x['source_vertex']['status'] for x in results] == ['failed', 'failed']
+
+    def test_index_leeches_failed_format(self, index_manager):
+        driver = index_manager._elastic_driver
+        driver.bulk_create.return_value = [{'status': 201}, {'status': 201}]
+        leeches = [_leech('vertex_0'), _leech('bad_vertex'), _leech('vertex_1')]
+        with patch('toll_booth.tasks.push_to_index.format_object_for_index', side_effect=_format_for_index):
+            results = index_leeches(index_manager, leeches, MagicMock())
+        assert [x['source_vertex']['status'] for x in results] == ['succeeded', 'failed', 'succeeded']
+        sent_documents = driver.bulk_create.call_args[0][0]
+        assert [x[2] for x in sent_documents] == ['vertex_0', 'vertex_1']
+
+    def test_find_potential_vertexes_many(self, index_manager):
+        driver = index_manager._elastic_driver
+        driver.multi_search.return_value = [
+            {'hits': {'hits': [{'_source': {'internal_id': 'vertex_0'}}]}},
+            {'hits': {'hits': []}}
+        ]
+        lookups = [('MockVertex', []), ('OtherVertex', [])]
+        with patch('toll_booth.obj.index.index_manager.mission.rebuild_vertex_from_hit') as mock_rebuild:
+            found = index_manager.find_potential_vertexes_many(lookups, MagicMock())
+        assert driver.multi_search.call_count == 1
+        searches = driver.multi_search.call_args[0][0]
+        assert [x[0] for x in searches] == ['mockvertex', 'othervertex']
+        assert found == [[mock_rebuild.return_value], []]
+
+    def test_find_potential_vertexes_many_error(self, index_manager):
+        driver = index_manager._elastic_driver
+        driver.multi_search.return_value = [
+            {'error': 'index_not_found_exception'},
+            {'hits': {'hits': [{'_source': {'internal_id': 'vertex_0'}}]}}
+        ]
+        lookups = [('MockVertex', []), ('OtherVertex', [])]
+        with patch('toll_booth.obj.index.index_manager.mission.rebuild_vertex_from_hit') as mock_rebuild:
+            found = index_manager.find_potential_vertexes_many(lookups, MagicMock())
+        assert isinstance(found[0], RuntimeError)
+        assert found[1] == [mock_rebuild.return_value]
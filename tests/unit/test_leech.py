@@ -0,0 +1,89 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from toll_booth.obj.aio import AioMaster
+from toll_booth.obj.data_objects import SensitivePropertyValue
+from toll_booth.tasks.leech import leech_batch
+
+
+def _extraction(identifier, potential_vertexes):
+    return {
+        'object_type': 'MockVertex',
+        'identifier': identifier,
+        'id_value': 1001,
+        'extracted_data': {'source': {}, 'potential_vertexes': potential_vertexes}
+    }
+
+
+def _derive_potential_vertexes(self):
+    return [(x, MagicMock(name='rule_entry')) for x in self._extracted_data['potential_vertexes']]
+
+
+def _identify_vertexes(potential_vertex, rule_entry, index_manager):
+    if potential_vertex == 'bad_vertex':
+        raise RuntimeError('index lookup failed')
+    return {'vertexes': [potential_vertex], 'status': 'fully_ready_to_graph'}
+
+
+@pytest.fixture
+def leech_environment():
+    environment = {'STORAGE_BUCKET_NAME': 'some_bucket', 'PROGRESS_TABLE_NAME': 'some_table'}
+    with patch.dict(os.environ, environment), \
+            patch('toll_booth.tasks.leech.Schema') as mock_schema, \
+            patch('toll_booth.tasks.leech.IndexManager'), \
+            patch('toll_booth.tasks.leech.boto3') as mock_boto, \
+            patch.object(AioMaster, '_generate_source_vertex'), \
+            patch.object(AioMaster, '_derive_potential_vertexes', _derive_potential_vertexes), \
+            patch.object(AioMaster, '_identify_vertexes', side_effect=_identify_vertexes), \
+            patch.object(AioMaster, '_generate_result_package', side_effect=lambda x, y: {'edge': MagicMock()}):
+        mock_schema.retrieve_cached.return_value = MagicMock(name='schema')
+        yield mock_boto
+
+
+@pytest.mark.leech
+class TestLeechBatch:
+    def test_leech_batch_worker_failure(self, leech_environment):
+        extractions = [
+            _extraction('identifier_0', ['vertex_0', 'vertex_1']),
+            _extraction('identifier_1', ['vertex_2', 'bad_vertex']),
+            _extraction('identifier_2', ['vertex_3'])
+        ]
+        results = leech_batch(extractions, buffer_sensitive=False, buffer_progress=False, batch_concurrency=2)
+        assert [x['status'] for x in results] == ['succeeded', 'failed', 'succeeded']
+        assert results[1]['details']['message'] == 'index lookup failed'
+        assert [len(x['details'].get('results', [])) for x in results] == [2, 0, 1]
+
+    def test_leech_batch_progress_table_per_thread(self, leech_environment):
+        extractions = [_extraction(f'identifier_{x}', ['vertex_0']) for x in range(4)]
+        leech_batch(extractions, buffer_sensitive=False, buffer_progress=False, batch_concurrency=2)
+        assert 1 <= leech_environment.session.Session.call_count <= 2
+        assert not leech_environment.resource.called
+
+    def test_leech_batch_sensitive_writes_per_leech(self, leech_environment):
+        extractions = [_extraction(f'identifier_{x}', ['vertex_0']) for x in range(3)]
+        with patch.object(AioMaster, '_flush_sensitive_writes', autospec=True) as mock_flush:
+            leech_batch(extractions, buffer_progress=False)
+        aio_masters = {x[0][0] for x in mock_flush.call_args_list}
+        assert len(aio_masters) == 3
+        assert len({id(x._sensitive_writes) for x in aio_masters}) == 3
+        assert {x._sensitive_writes.client for x in aio_masters} == {leech_environment.client.return_value}
+
+    def test_leech_batch_sensitive_failure_contained(self, leech_environment):
+        def _generate_source_vertex(self):
+            value = self._extracted_data.get('sensitive_value', 'some_value')
+            self._sensitive_writes.add(SensitivePropertyValue(value, 'some_property', value))
+
+        def _transact_write_items(TransactItems):
+            if any(x['Update']['ExpressionAttributeValues'][':s'] == {'S': 'bad_value'} for x in TransactItems):
+                raise ClientError({'Error': {'Code': 'ValidationException', 'Message': 'bad'}}, 'TransactWriteItems')
+
+        leech_environment.client.return_value.transact_write_items.side_effect = _transact_write_items
+        extractions = [_extraction(f'identifier_{x}', ['vertex_0']) for x in range(3)]
+        extractions[1]['extracted_data']['sensitive_value'] = 'bad_value'
+        with patch.dict(os.environ, {'SENSITIVE_TABLE_NAME': 'sensitive_table'}), \
+                patch.object(AioMaster, '_generate_source_vertex', _generate_source_vertex):
+            results = leech_batch(extractions, buffer_progress=False, batch_concurrency=3)
+        assert [x['status'] for x in results] == ['succeeded', 'failed', 'succeeded']
@@ -0,0 +1,50 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from toll_booth.obj.index import mission
+
+
+def _search_hit(internal_id, version):
+    return {'_source': {'internal_id': internal_id, 'object_type': 'MockVertex'}, '_version': version}
+
+
+@pytest.fixture
+def rebuilt_vertexes():
+    mission._rebuilt_vertexes.clear()
+    with patch('toll_booth.obj.index.mission.rebuild_vertex') as mock_rebuild:
+        mock_rebuild.side_effect = lambda *args: MagicMock(name='vertex_data')
+        yield mock_rebuild
+    mission._rebuilt_vertexes.clear()
+
+
+@pytest.mark.mission
+class TestMission:
+    def test_rebuild_vertex_from_hit_memoized(self, rebuilt_vertexes):
+        schema = MagicMock(name='schema')
+        first = mission.rebuild_vertex_from_hit(_search_hit('vertex_0', 1), schema)
+        second = mission.rebuild_vertex_from_hit(_search_hit('vertex_0', 1), schema)
+        assert first is second
+        assert rebuilt_vertexes.call_count == 1
+
+    def test_rebuild_vertex_from_hit_new_version(self, rebuilt_vertexes):
+        schema = MagicMock(name='schema')
+        first = mission.rebuild_vertex_from_hit(_search_hit('vertex_0', 1), schema)
+        second = mission.rebuild_vertex_from_hit(_search_hit('vertex_0', 2), schema)
+        assert first is not second
+        assert rebuilt_vertexes.call_count == 2
+
+    def test_rebuild_vertex_from_hit_bounded(self, rebuilt_vertexes, monkeypatch):
+        monkeypatch.setenv('REBUILT_VERTEX_CACHE_SIZE', '2')
+        schema = MagicMock(name='schema')
+        for internal_id in ('vertex_0', 'vertex_1', 'vertex_2'):
+            mission.rebuild_vertex_from_hit(_search_hit(internal_id, 1), schema)
+        assert list(mission._rebuilt_vertexes.keys()) == [('vertex_1', 1), ('vertex_2', 1)]
+
+    def test_read_only_sensitive_property(self):
+        with patch.object(mission.SensitivePropertyValue, 'store') as mock_store:
+            property_class, rebuilt = mission._rebuild_sensitive_property(
+                'some_property', 'some_value', 'S', 'vertex_0', read_only=True)
+        assert property_class == 'sensitive_properties'
+        assert rebuilt['pointer']
+        assert not mock_store.called
@@ -0,0 +1,108 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from toll_booth.obj.graph.generators import create_vertex_command_from_scalar
+from toll_booth.obj.graph.ogm import Ogm
+
+
+def _vertex_scalar(internal_id, vertex_type='MockVertex', **local_properties):
+    return {
+        'internal_id': internal_id,
+        'vertex_type': vertex_type,
+        'id_value': {'property_name': 'id_value', 'data_type': 'N', 'property_value': '1001'},
+        'identifier': {'property_name': 'identifier', 'data_type': 'S', 'property_value': '#vertex#MockVertex#'},
+        'vertex_properties': {
+            'local_properties': [
+                {'property_name': x, 'data_type': 'S', 'property_value': y} for x, y in local_properties.items()]
+        }
+    }
+
+
+def _edge_scalar(internal_id, source_internal_id, target_internal_id, edge_label='_mock_edge_'):
+    return {
+        'internal_id': internal_id,
+        'edge_label': edge_label,
+        'id_value': {'property_name': 'id_value', 'data_type': 'N', 'property_value': '1001'},
+        'identifier': {'property_name': 'identifier', 'data_type': 'S', 'property_value': '#edge#_mock_edge_#'},
+        'source_vertex_internal_id': source_internal_id,
+        'target_vertex_internal_id': target_internal_id,
+        'edge_properties': {}
+    }
+
+
+@pytest.mark.ogm
+class TestOgm:
+    def test_graph_cluster_chunking(self):
+        driver = MagicMock(name='trident_driver')
+        ogm = Ogm(driver, max_statements=2)
+        vertexes = [_vertex_scalar(f'vertex_{x}', some_property=str(x)) for x in range(3)]
+        edges = [_edge_scalar('edge_0', 'vertex_0', 'vertex_1')]
+        vertex_results, edge_results = ogm.graph_cluster(vertexes, edges)
+        assert driver.execute.call_count == 2
+        first_command = driver.execute.call_args_list[0][0][0]
+        assert first_command.count(';') == 1
+        assert len(vertex_results) == 3
+        assert len(edge_results) == 1
+        assert all(x['status'] == 'succeeded' for x in vertex_results + edge_results)
+        assert [x['operation'] for x in vertex_results + edge_results] == ['graph_vertex'] * 3 + ['graph_edge']
+
+    def test_graph_cluster_failed_chunk(self):
+        driver = MagicMock(name='trident_driver')
+        driver.execute.side_effect = [None, RuntimeError('request failed')]
+        ogm = Ogm(driver, max_statements=2)
+        vertexes = [_vertex_scalar(f'vertex_{x}', some_property=str(x)) for x in range(3)]
+        edges = [_edge_scalar('edge_0', 'vertex_0', 'vertex_1')]
+        vertex_results, edge_results = ogm.graph_cluster(vertexes, edges)
+        statuses = [x['status'] for x in vertex_results + edge_results]
+        assert statuses == ['succeeded', 'succeeded', 'failed', 'failed']
+
+    def test_graph_vertex_records_bindings(self):
+        driver = MagicMock(name='trident_driver')
+        driver.execute.side_effect = RuntimeError('request failed')
+        ogm = Ogm(driver)
+        result = ogm.graph_vertex(_vertex_scalar('vertex_0', some_property='some_value'))
+        assert result['status'] == 'failed'
+        bindings = json.loads(result['details']['bindings'])
+        assert bindings['internal_id'] == 'vertex_0'
+        assert 'some_value' in bindings.values()
+
+    @pytest.mark.parametrize('property_value, expected', [
+        ('1001', 1001), ('1.0', 1.0), ('2.5', 2.5), (7, 7), (1.0, 1.0)
+    ])
+    def test_numeric_bindings(self, property_value, expected):
+        vertex_scalar = _vertex_scalar('vertex_0')
+        vertex_scalar['id_value']['property_value'] = property_value
+        _, bindings = create_vertex_command_from_scalar(vertex_scalar)
+        bound_value = [x for x in bindings.values() if x == expected]
+        assert bound_value
+        assert type(bound_value[0]) is type(expected)
+
+    def test_non_numeric_binding(self):
+        vertex_scalar = _vertex_scalar('vertex_0')
+        vertex_scalar['id_value']['property_value'] = 'not_a_number'
+        with pytest.raises(RuntimeError):
+            create_vertex_command_from_scalar(vertex_scalar)
+
+    def test_graph_cluster_reuses_command_text(self):
+        driver = MagicMock(name='trident_driver')
+        ogm = Ogm(driver)
+        first_vertexes = [_vertex_scalar(f'vertex_{x}', some_property=str(x)) for x in range(2)]
+        second_vertexes = [_vertex_scalar(f'vertex_{x}', some_property=str(x)) for x in range(2, 4)]
+        ogm.graph_cluster(first_vertexes, [_edge_scalar('edge_0', 'vertex_0', 'vertex_1')])
+        ogm.graph_cluster(second_vertexes, [_edge_scalar('edge_1', 'vertex_2', 'vertex_3')])
+        first_call, second_call = driver.execute.call_args_list
+        assert first_call[0][0] == second_call[0][0]
+        assert first_call[1]['bindings'] != second_call[1]['bindings']
+        assert len(first_call[1]['bindings']) == len(second_call[1]['bindings']) == 13
+
+    @pytest.mark.parametrize('property_value, expected', [
+        ('True', True), ('true', True), ('TRUE', True), (True, True), ('False', False), ('false', False)
+    ])
+    def test_boolean_bindings(self, property_value, expected):
+        vertex_scalar = _vertex_scalar('vertex_0')
+        vertex_scalar['vertex_properties']['local_properties'].append(
+            {'property_name': 'is_active', 'data_type': 'B', 'property_value': property_value})
+        _, bindings = create_vertex_command_from_scalar(vertex_scalar)
+        assert [x for x in bindings.values() if isinstance(x, bool)] == [expected]
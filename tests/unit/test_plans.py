@@ -0,0 +1,30 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from toll_booth.obj.regulators.plans import RegulatorPlan
+from toll_booth.obj.schemata.schema_entry import SchemaVertexEntry
+
+
+def _schema_entry(vertex_properties):
+    schema_entry = MagicMock(spec=SchemaVertexEntry)
+    schema_entry.entry_name = 'MockVertex'
+    schema_entry.entry_properties = vertex_properties
+    schema_entry.vertex_properties = vertex_properties
+    schema_entry.id_value_field = 'id_source'
+    schema_entry.internal_id_key = ['object_type', 'id_value_field']
+    schema_entry.identifier_stem = []
+    return schema_entry
+
+
+@pytest.mark.regulator_plan
+class TestRegulatorPlan:
+    def test_id_value_without_schema_entry(self):
+        plan = RegulatorPlan(_schema_entry({}))
+        assert plan.create_id_value({'id_source': 'Algernon'}) == 'id_source'
+
+    def test_id_value(self):
+        id_value_entry = MagicMock(property_data_type='Number', sensitive=False, stored=False)
+        plan = RegulatorPlan(_schema_entry({'id_source': id_value_entry}))
+        id_value = plan.create_id_value({'id_source': 1001})
+        assert id_value == {'data_type': 'N', 'property_name': 'id_value', 'property_value': '1001'}
@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from toll_booth.obj.progress_tracking import Overseer
+
+
+@pytest.mark.progress_tracking
+class TestOverseer:
+    def test_buffered_flush(self):
+        table = MagicMock(name='table')
+        overseer = Overseer('some_table', 'some_identifier', 1001, buffered=True, table=table)
+        overseer.mark_stage_completed('first_stage', {'some': 'results'})
+        overseer.mark_stage_completed('second_stage')
+        assert not table.update_item.called
+        overseer.flush()
+        assert table.update_item.call_count == 1
+        update_kwargs = table.update_item.call_args[1]
+        assert set(update_kwargs['ExpressionAttributeNames'].values()) == {'first_stage', 'second_stage'}
+        overseer.flush()
+        assert table.update_item.call_count == 1
+
+    def test_failed_flush_keeps_pending_stages(self):
+        table = MagicMock(name='table')
+        table.update_item.side_effect = [RuntimeError('write failed'), None]
+        overseer = Overseer('some_table', 'some_identifier', 1001, buffered=True, table=table)
+        overseer.mark_stage_completed('first_stage', {'some': 'results'})
+        with pytest.raises(RuntimeError):
+            overseer.flush()
+        overseer.flush()
+        assert table.update_item.call_count == 2
+        update_kwargs = table.update_item.call_args[1]
+        assert list(update_kwargs['ExpressionAttributeNames'].values()) == ['first_stage']
+        overseer.flush()
+        assert table.update_item.call_count == 2
@@ -0,0 +1,97 @@
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from toll_booth.obj import s3_writes
+from toll_booth.obj.property_resolver import PropertyResolver
+from toll_booth.tasks.push_to_index import index_leeches
+from toll_booth.tasks.push_to_s3 import push_s3
+
+
+def _batch_get_response(table_name, pointers, unprocessed=None):
+    response = {'Responses': {table_name: [{'insensitive': x, 'sensitive_entry': f'{x}_value'} for x in pointers]}}
+    if unprocessed:
+        response['UnprocessedKeys'] = {table_name: {'Keys': [{'insensitive': x} for x in unprocessed]}}
+    return response
+
+
+def _resolver():
+    dynamo_resource = MagicMock(name='dynamo_resource')
+    s3_client = MagicMock(name='s3_client')
+    s3_client.get_object.side_effect = lambda Bucket, Key: {'Body': io.BytesIO(b'"some stored value"')}
+    resolver = PropertyResolver('some_table', max_workers=2, s3_client=s3_client, dynamo_resource=dynamo_resource)
+    return resolver, dynamo_resource, s3_client
+
+
+def _s3_object(bucket_name, file_key):
+    s3_object = MagicMock(name='s3_object')
+    s3_object.bucket_name = bucket_name
+    s3_object.key = file_key
+    return s3_object
+
+
+def _vertex_scalar(internal_id):
+    return {
+        'internal_id': internal_id,
+        'vertex_type': 'MockVertex',
+        'id_value': {'property_name': 'id_value', 'data_type': 'N', 'property_value': '1001'},
+        'identifier': {'property_name': 'identifier', 'data_type': 'S', 'property_value': '#vertex#MockVertex#'},
+        'vertex_properties': {
+            'sensitive_properties': [
+                {'property_name': 'last_name', 'data_type': 'S', 'pointer': f'{internal_id}_pointer'}],
+            'stored_properties': [{
+                'property_name': 'documentation', 'data_type': 'S', 'storage_class': 's3',
+                'storage_uri': f's3://some_bucket/{internal_id}/documentation'
+            }]
+        }
+    }
+
+
+@pytest.mark.property_resolver
+class TestPropertyResolver:
+    def test_unprocessed_keys_retried(self):
+        resolver, dynamo_resource, _ = _resolver()
+        dynamo_resource.batch_get_item.side_effect = [
+            _batch_get_response('some_table', ['pointer_0'], unprocessed=['pointer_1']),
+            _batch_get_response('some_table', ['pointer_1'])
+        ]
+        scalar = {'vertex_properties': {'sensitive_properties': [{'pointer': 'pointer_0'}, {'pointer': 'pointer_1'}]}}
+        with patch('toll_booth.obj.property_resolver.time.sleep') as mock_sleep:
+            resolver.prefetch([(scalar, False)])
+        assert dynamo_resource.batch_get_item.call_count == 2
+        retried_keys = dynamo_resource.batch_get_item.call_args[1]['RequestItems']['some_table']['Keys']
+        assert retried_keys == [{'insensitive': 'pointer_1'}]
+        assert mock_sleep.call_count == 1
+        assert resolver.sensitive_value('pointer_0') == 'pointer_0_value'
+        assert resolver.sensitive_value('pointer_1') == 'pointer_1_value'
+
+    def test_missing_pointer(self):
+        resolver, dynamo_resource, _ = _resolver()
+        dynamo_resource.batch_get_item.return_value = _batch_get_response('some_table', [])
+        with pytest.raises(RuntimeError, match='some_pointer'):
+            resolver.sensitive_value('some_pointer')
+        with pytest.raises(RuntimeError):
+            resolver.sensitive_value('some_pointer')
+        assert dynamo_resource.batch_get_item.call_count == 1
+
+    def test_shared_between_pushes(self):
+        s3_writes.forget_all()
+        resolver, dynamo_resource, s3_client = _resolver()
+        dynamo_resource.batch_get_item.side_effect = lambda RequestItems: _batch_get_response(
+            'some_table', [x['insensitive'] for x in RequestItems['some_table']['Keys']])
+        leech = {'source_vertex': _vertex_scalar('vertex_0'), 'other_vertex': _vertex_scalar('vertex_1')}
+        index_manager = MagicMock(name='index_manager')
+        index_manager.index_objects.side_effect = lambda entries: [x[0] for x in entries]
+        s3_resource = MagicMock(name='s3_resource')
+        s3_resource.Object.side_effect = _s3_object
+        with patch('toll_booth.tasks.push_to_s3._check_for_object', return_value=False):
+            index_results = index_leeches(index_manager, [leech], resolver)
+            s3_results = push_s3(leech, bucket_name='some_bucket', base_file_key='bulk',
+                                 s3_resource=s3_resource, property_resolver=resolver)
+        s3_writes.forget_all()
+        assert all(x['status'] == 'succeeded' for x in list(index_results[0].values()) + list(s3_results.values()))
+        assert dynamo_resource.batch_get_item.call_count == 1
+        assert s3_client.get_object.call_count == 2
+        indexed = index_manager.index_objects.call_args[0][0]
+        assert indexed[0][0]['last_name'] == 'vertex_0_pointer_value'
@@ -0,0 +1,63 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from toll_booth.tasks.push_all import push_all
+
+
+def _succeeded(operation):
+    return {'status': 'succeeded', 'operation': operation, 'details': {}}
+
+
+_leech = {'source_vertex': {'internal_id': 'vertex_0'}, 'other_vertex': None, 'edge': None}
+
+
+@pytest.fixture
+def push_sinks():
+    released = threading.Event()
+    with patch('toll_booth.tasks.push_all.Ogm'), \
+            patch('toll_booth.tasks.push_all.IndexManager'), \
+            patch('toll_booth.tasks.push_all.PropertyResolver'), \
+            patch('toll_booth.tasks.push_all.boto3'), \
+            patch('toll_booth.tasks.push_all.graph_leech') as mock_graph, \
+            patch('toll_booth.tasks.push_all.index_leeches') as mock_index, \
+            patch('toll_booth.tasks.push_all.push_s3') as mock_s3, \
+            patch('toll_booth.tasks.push_all.push_event') as mock_event, \
+            patch('toll_booth.tasks.push_all.mark_push_complete') as mock_mark:
+        mock_graph.return_value = {'source_vertex': _succeeded('graph_vertex')}
+        mock_index.return_value = [{'source_vertex': _succeeded('index_object')}]
+        mock_s3.return_value = {'source_vertex': _succeeded('store_to_s3')}
+        yield {'graph': mock_graph, 'index': mock_index, 's3': mock_s3, 'event': mock_event, 'mark': mock_mark,
+               'released': released}
+    released.set()
+
+
+@pytest.mark.push_all
+class TestPushAll:
+    def test_push_all(self, push_sinks):
+        results = push_all(_leech, bucket_name='some_bucket')
+        assert [x['source_vertex']['operation'] for x in results] == ['graph_vertex', 'index_object', 'store_to_s3']
+        assert push_sinks['mark'].call_args[0][0] == results
+        assert push_sinks['event'].called
+
+    def test_push_all_sink_timeout(self, push_sinks):
+        push_sinks['graph'].side_effect = lambda *args: push_sinks['released'].wait(5)
+        results = push_all(_leech, sink_timeout=0.2)
+        failed_details = {'message': 'graph push timed out'}
+        failed_result = {'status': 'failed', 'operation': 'graph_vertex', 'details': failed_details}
+        assert results[0] == {'source_vertex': failed_result}
+        assert results[1]['source_vertex']['status'] == 'succeeded'
+        assert push_sinks['mark'].called
+
+    def test_push_all_sink_failure(self, push_sinks):
+        push_sinks['index'].side_effect = RuntimeError('connection timed out')
+        results = push_all(_leech)
+        assert results[1]['source_vertex']['status'] == 'failed'
+        assert results[1]['source_vertex']['operation'] == 'index_object'
+
+    def test_push_all_event_failure(self, push_sinks):
+        push_sinks['event'].side_effect = RuntimeError('could not publish')
+        with pytest.raises(RuntimeError):
+            push_all(_leech)
+        assert push_sinks['mark'].called
@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError, ParamValidationError
+
+from toll_booth.obj import s3_writes
+
+
+def _client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'PutObject')
+
+
+def _s3_object(file_key='some_key'):
+    s3_object = MagicMock(name='s3_object')
+    s3_object.bucket_name = 'some_bucket'
+    s3_object.key = file_key
+    return s3_object
+
+
+@pytest.fixture
+def known_keys():
+    s3_writes.forget_all()
+    s3_writes._conditional_puts['supported'] = True
+    with patch('toll_booth.obj.s3_writes.time.sleep'):
+        yield
+    s3_writes.forget_all()
+    s3_writes._conditional_puts['supported'] = True
+
+
+@pytest.mark.s3_writes
+@pytest.mark.usefixtures('known_keys')
+class TestS3Writes:
+    def test_put_if_absent(self):
+        s3_object = _s3_object()
+        check = MagicMock()
+        generate_body = MagicMock(return_value='some_body')
+        assert s3_writes.put_if_absent(s3_object, generate_body, check) is True
+        s3_object.put.assert_called_once_with(Body='some_body', IfNoneMatch='*')
+        assert not check.called
+        assert s3_writes.is_known('some_bucket', 'some_key')
+
+    def test_put_if_absent_known_key(self):
+        s3_writes.remember('some_bucket', 'some_key')
+        s3_object = _s3_object()
+        check = MagicMock()
+        generate_body = MagicMock()
+        assert s3_writes.put_if_absent(s3_object, generate_body, check) is False
+        assert not check.called
+        assert not generate_body.called
+        assert not s3_object.put.called
+
+    def test_put_if_absent_existing_object(self):
+        s3_writes._conditional_puts['supported'] = False
+        s3_object = _s3_object()
+        generate_body = MagicMock()
+        assert s3_writes.put_if_absent(s3_object, generate_body, lambda x: True) is False
+        assert not generate_body.called
+        assert not s3_object.put.called
+        assert s3_writes.is_known('some_bucket', 'some_key')
+
+    def test_put_if_absent_precondition_failed(self):
+        s3_object = _s3_object()
+        s3_object.put.side_effect = _client_error('PreconditionFailed')
+        check = MagicMock()
+        assert s3_writes.put_if_absent(s3_object, lambda: 'some_body', check) is False
+        assert s3_object.put.call_count == 1
+        assert not check.called
+        assert s3_writes.is_known('some_bucket', 'some_key')
+
+    def test_put_if_absent_conflict(self):
+        s3_object = _s3_object()
+        s3_object.put.side_effect = [_client_error('ConditionalRequestConflict'), None]
+        assert s3_writes.put_if_absent(s3_object, lambda: 'some_body', lambda x: False) is True
+        assert s3_object.put.call_count == 2
+
+    def test_put_if_absent_persistent_conflict(self):
+        s3_object = _s3_object()
+        s3_object.put.side_effect = _client_error('409')
+        with pytest.raises(ClientError):
+            s3_writes.put_if_absent(s3_object, lambda: 'some_body', lambda x: False)
+        assert s3_object.put.call_count == s3_writes._max_conflict_attempts
+        assert not s3_writes.is_known('some_bucket', 'some_key')
+
+    def test_put_if_absent_fallback(self):
+        s3_object = _s3_object()
+        s3_object.put.side_effect = [ParamValidationError(report='Unknown parameter: IfNoneMatch'), None]
+        check = MagicMock(return_value=False)
+        generate_body = MagicMock(return_value='some_body')
+        assert s3_writes.put_if_absent(s3_object, generate_body, check) is True
+        check.assert_called_once_with(s3_object)
+        assert generate_body.call_count == 1
+        assert s3_object.put.call_args_list[-1][1] == {'Body': 'some_body'}
+        assert s3_writes._conditional_puts['supported'] is False
+        other_object = _s3_object('some_other_key')
+        assert s3_writes.put_if_absent(other_object, lambda: 'some_body', lambda x: False) is True
+        other_object.put.assert_called_once_with(Body='some_body')
@@ -0,0 +1,49 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from toll_booth.obj.schemata.schema import SchemaCache
+
+
+def _mock_snek(*versions):
+    snek = MagicMock(name='schema_snek')
+    snek.folder_name = 'schema'
+    snek.get_schema_version.side_effect = list(versions)
+    return snek
+
+
+@pytest.mark.schema_cache
+class TestSchemaCache:
+    def test_cache_hit(self):
+        snek = _mock_snek(({'vertex': [], 'edge': []}, 'etag_1'))
+        with patch('toll_booth.obj.schemata.schema.SchemaSnek', return_value=snek), \
+                patch('toll_booth.obj.schemata.schema.SchemaParer.parse', return_value=({}, {})) as mock_parse:
+            schema_cache = SchemaCache(ttl=300)
+            first = schema_cache.get('some_bucket')
+            second = schema_cache.get('some_bucket')
+        assert first is second
+        assert snek.get_schema_version.call_count == 1
+        assert mock_parse.call_count == 1
+        assert schema_cache.stats == {'hits': 1, 'misses': 1, 'revalidations': 0}
+
+    def test_cache_revalidation(self):
+        snek = _mock_snek(({'vertex': [], 'edge': []}, 'etag_1'), (None, 'etag_1'))
+        with patch('toll_booth.obj.schemata.schema.SchemaSnek', return_value=snek), \
+                patch('toll_booth.obj.schemata.schema.SchemaParer.parse', return_value=({}, {})) as mock_parse:
+            schema_cache = SchemaCache(ttl=0)
+            first = schema_cache.get('some_bucket')
+            second = schema_cache.get('some_bucket')
+        assert first is second
+        assert mock_parse.call_count == 1
+        snek.get_schema_version.assert_called_with(etag='etag_1', schema_name='schema.json')
+        assert schema_cache.stats == {'hits': 0, 'misses': 1, 'revalidations': 1}
+
+    def test_cache_changed_schema(self):
+        snek = _mock_snek(({'vertex': [], 'edge': []}, 'etag_1'), ({'vertex': [], 'edge': []}, 'etag_2'))
+        with patch('toll_booth.obj.schemata.schema.SchemaSnek', return_value=snek), \
+                patch('toll_booth.obj.schemata.schema.SchemaParer.parse', return_value=({}, {})):
+            schema_cache = SchemaCache(ttl=0)
+            first = schema_cache.get('some_bucket')
+            second = schema_cache.get('some_bucket')
+        assert first is not second
+        assert schema_cache.stats == {'hits': 0, 'misses': 2, 'revalidations': 0}
@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from toll_booth.obj.data_objects import SensitivePropertyValue, SensitiveWriteBuffer
+
+
+def _client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'TransactWriteItems')
+
+
+def _write_buffer(batch_size=2):
+    client = MagicMock(name='dynamo_client')
+    return SensitiveWriteBuffer('some_table', batch_size=batch_size, client=client), client
+
+
+def _add_values(write_buffer, count):
+    return [write_buffer.add(SensitivePropertyValue('vertex_0', f'property_{x}', f'value_{x}')) for x in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch('toll_booth.obj.data_objects.object_properties.sensitive_property.time.sleep') as mock_sleep:
+        yield mock_sleep
+
+
+@pytest.mark.sensitive_writes
+class TestSensitiveWriteBuffer:
+    def test_flush(self):
+        write_buffer, client = _write_buffer()
+        pointers = _add_values(write_buffer, 5)
+        write_buffer.add(SensitivePropertyValue('vertex_0', 'property_0', 'some_other_value'))
+        assert write_buffer.pending_count == 5
+        write_buffer.flush()
+        sent = [x[1]['TransactItems'] for x in client.transact_write_items.call_args_list]
+        assert [len(x) for x in sent] == [2, 2, 1]
+        assert [x['Update']['Key']['insensitive']['S'] for batch in sent for x in batch] == pointers
+        assert sent[0][0]['Update']['ExpressionAttributeValues'] == {':s': {'S': 'value_0'}}
+        assert write_buffer.pending_count == 0
+        write_buffer.flush()
+        assert client.transact_write_items.call_count == 3
+
+    def test_flush_retried(self, no_sleep):
+        write_buffer, client = _write_buffer()
+        client.transact_write_items.side_effect = [_client_error('TransactionCanceledException'), None]
+        _add_values(write_buffer, 2)
+        write_buffer.flush()
+        assert client.transact_write_items.call_count == 2
+        assert no_sleep.call_count == 1
+        assert write_buffer.pending_count == 0
+
+    def test_flush_failed(self):
+        write_buffer, client = _write_buffer()
+        client.transact_write_items.side_effect = [None, _client_error('ValidationException'), None,
+                                                   _client_error('ValidationException'), None]
+        _add_values(write_buffer, 5)
+        with pytest.raises(ClientError):
+            write_buffer.flush()
+        assert [len(x[1]['TransactItems']) for x in client.transact_write_items.call_args_list] == [2, 2, 1, 1, 1]
+        assert write_buffer.pending_count == 0
+        client.transact_write_items.side_effect = None
+        write_buffer.flush()
+        assert client.transact_write_items.call_count == 5
+
+    def test_flush_exhausted_continues(self):
+        write_buffer, client = _write_buffer()
+        client.transact_write_items.side_effect = [_client_error('ThrottlingException')] * 5 + [None]
+        _add_values(write_buffer, 3)
+        with pytest.raises(ClientError):
+            write_buffer.flush()
+        assert client.transact_write_items.call_count == 6
+        assert write_buffer.pending_count == 2
+
+    def test_add_during_flush(self):
+        write_buffer, client = _write_buffer()
+        _add_values(write_buffer, 1)
+        client.transact_write_items.side_effect = lambda **kwargs: write_buffer.add(
+            SensitivePropertyValue('vertex_1', 'property_0', 'value_0'))
+        write_buffer.flush()
+        assert write_buffer.pending_count == 1
+
+    def test_flush_exhausted(self):
+        write_buffer, client = _write_buffer()
+        client.transact_write_items.side_effect = _client_error('ThrottlingException')
+        _add_values(write_buffer, 1)
+        with pytest.raises(ClientError):
+            write_buffer.flush()
+        assert client.transact_write_items.call_count == 5
+        assert write_buffer.pending_count == 1
+
+    def test_batch_size_clamped(self):
+        write_buffer, client = _write_buffer(batch_size=250)
+        _add_values(write_buffer, 150)
+        write_buffer.flush()
+        assert [len(x[1]['TransactItems']) for x in client.transact_write_items.call_args_list] == [100, 50]
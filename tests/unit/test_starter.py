@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from toll_booth.tasks.starter import AdaptiveBackoff, StartCursor, start_objects
+
+
+def _client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'some_operation')
+
+
+def _cursor(started_count=None):
+    table = MagicMock(name='progress_table')
+    table.get_item.return_value = {'Item': {'started_count': started_count}} if started_count is not None else {}
+    return StartCursor('some_table', 'some_bucket', 'some_key', table=table), table
+
+
+@pytest.mark.starter
+class TestStarter:
+    def test_adaptive_backoff(self):
+        backoff = AdaptiveBackoff(base_delay=0.1, max_delay=0.5)
+        backoff.record_throttle()
+        assert backoff.delay == 0.1
+        for _ in range(5):
+            backoff.record_throttle()
+        assert backoff.delay == 0.5
+        backoff.record_success()
+        assert backoff.delay == 0.25
+        for _ in range(3):
+            backoff.record_success()
+        assert backoff.delay == 0.0
+
+    def test_start_cursor_watermark(self):
+        cursor, table = _cursor(started_count=2)
+        assert cursor.load() == 2
+        cursor.mark_started(3)
+        assert cursor.watermark == 2
+        cursor.mark_started(2)
+        assert cursor.watermark == 4
+        cursor.save()
+        assert table.update_item.call_args[1]['ExpressionAttributeValues'][':w'] == 4
+        cursor.save()
+        assert table.update_item.call_count == 1
+
+    def test_start_cursor_stale_save(self):
+        cursor, table = _cursor()
+        table.update_item.side_effect = _client_error('ConditionalCheckFailedException')
+        cursor.load()
+        cursor.mark_started(0)
+        cursor.save()
+        table.update_item.side_effect = _client_error('InternalServerError')
+        cursor.mark_started(1)
+        with pytest.raises(ClientError):
+            cursor.save()
+
+    def test_start_objects_resumes(self):
+        cursor, table = _cursor(started_count=2)
+        with patch('toll_booth.tasks.starter._start_machine') as mock_start:
+            results = start_objects([{'id_value': x} for x in range(5)], cursor, max_workers=2)
+        assert results == {'skipped': 2, 'started': 3, 'watermark': 5}
+        assert sorted(x[0][0]['id_value'] for x in mock_start.call_args_list) == [2, 3, 4]
+
+    def test_start_objects_throttled(self):
+        cursor, _ = _cursor()
+        throttled = [_client_error('ThrottlingException'), None, None]
+        with patch('toll_booth.tasks.starter.ruffians') as mock_ruffians, \
+                patch('toll_booth.tasks.starter.StoredData') as mock_stored_data, \
+                patch('toll_booth.tasks.starter.time.sleep'):
+            mock_ruffians.start_machine.side_effect = throttled
+            results = start_objects([{'id_value': x} for x in range(2)], cursor, max_workers=1)
+        assert results['started'] == 2
+        assert mock_ruffians.start_machine.call_count == 3
+        assert mock_stored_data.from_object.call_count == 2
+
+    def test_start_objects_out_of_time(self):
+        cursor, _ = _cursor()
+        context = MagicMock(name='context')
+        context.get_remaining_time_in_millis.return_value = 1000
+        with patch('toll_booth.tasks.starter._start_machine'):
+            with pytest.raises(RuntimeError):
+                start_objects([{'id_value': 0}], cursor, context)
+
+    def test_start_objects_read_failure(self):
+        cursor, table = _cursor()
+
+        def _stored_objects():
+            yield {'id_value': 0}
+            yield {'id_value': 1}
+            raise RuntimeError('could not read the rest of the file')
+
+        with patch('toll_booth.tasks.starter._start_machine'):
+            with pytest.raises(RuntimeError):
+                start_objects(_stored_objects(), cursor, max_workers=1)
+        assert table.update_item.call_args[1]['ExpressionAttributeValues'][':w'] == 2
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from toll_booth.starter_handler import _iterate_json_objects
+
+
+def _chunked(payload: bytes, chunk_size: int):
+    return [payload[x:x + chunk_size] for x in range(0, len(payload), chunk_size)]
+
+
+@pytest.mark.starter_handler
+class TestStarterHandler:
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1024])
+    def test_iterate_json_objects_chunk_boundaries(self, chunk_size):
+        stored_objects = [{'identifier': f'identifier_{x}', 'name': 'Ünïcødé ✓', 'values': [x]} for x in range(5)]
+        payload = '\n'.join(json.dumps(x, ensure_ascii=False) for x in stored_objects).encode('utf-8')
+        assert list(_iterate_json_objects(_chunked(payload, chunk_size))) == stored_objects
+
+    def test_iterate_concatenated_json_objects(self):
+        payload = b'{"id_value": 1}{"id_value": 2}  {"id_value": 3}\n'
+        assert list(_iterate_json_objects(_chunked(payload, 5))) == [{'id_value': x} for x in range(1, 4)]
+
+    def test_iterate_truncated_json_objects(self):
+        iterated = _iterate_json_objects(_chunked(b'{"id_value": 1}{"id_value": ', 4))
+        assert next(iterated) == {'id_value': 1}
+        with pytest.raises(json.JSONDecodeError):
+            next(iterated)
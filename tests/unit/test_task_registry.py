@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+import pytest
+
+from toll_booth import tasks
+
+
+@pytest.mark.task_registry
+class TestTaskRegistry:
+    def test_tasks_imported_on_demand(self):
+        script = (
+            'import sys\n'
+            'import toll_booth.tasks\n'
+            'assert "toll_booth.tasks.leech" not in sys.modules\n'
+            'assert "toll_booth.tasks.push_to_graph" not in sys.modules\n'
+            'toll_booth.tasks.mark_push_complete\n'
+            'assert "toll_booth.tasks.mark_push" in sys.modules\n'
+            'assert "toll_booth.tasks.push_to_graph" not in sys.modules\n'
+        )
+        subprocess.run([sys.executable, '-c', script], check=True)
+
+    def test_resolve_task(self):
+        from toll_booth.tasks.mark_push import mark_push_complete
+        assert tasks.resolve_task('mark_push_complete') is mark_push_complete
+        assert tasks.mark_push_complete is mark_push_complete
+        assert 'mark_push_complete' in vars(tasks)
+
+    def test_unknown_task(self):
+        with pytest.raises(AttributeError):
+            tasks.resolve_task('some_unknown_task')
+        assert not hasattr(tasks, 'some_unknown_task')
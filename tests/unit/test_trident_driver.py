@@ -0,0 +1,60 @@
+import hashlib
+import hmac
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from toll_booth.obj.graph import trident_driver
+from toll_booth.obj.graph.trident_driver import TridentNotary, get_pooled_session
+
+
+def _reference_signing_key(secret_key, date_stamp, region, service):
+    def _sign(key, message):
+        return hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()
+    k_date = _sign(f'AWS4{secret_key}'.encode('utf-8'), date_stamp)
+    return _sign(_sign(_sign(k_date, region), service), 'aws4_request')
+
+
+def _mock_session():
+    session = MagicMock(name='session')
+    session.post.return_value.status_code = 200
+    session.post.return_value.text = '{"result": {"data": []}}'
+    return session
+
+
+@pytest.mark.trident_driver
+class TestTridentNotary:
+    def test_pooled_session(self):
+        first = get_pooled_session('some_endpoint')
+        assert get_pooled_session('some_endpoint') is first
+        assert get_pooled_session('some_other_endpoint') is not first
+
+    def test_signing_key_reused(self):
+        session = _mock_session()
+        environment = {'AWS_ACCESS_KEY_ID': 'some_access_key', 'AWS_SECRET_ACCESS_KEY': 'some_secret_key'}
+        with patch.dict(os.environ, environment):
+            notary = TridentNotary('some_endpoint', session=session)
+        trident_driver._derive_signing_key.cache_clear()
+        notary.send('g.V(internal_id)', {'internal_id': 'some_id'})
+        notary.send('g.V(internal_id)', {'internal_id': 'some_id'})
+        cache_info = trident_driver._derive_signing_key.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    def test_signature(self):
+        session = _mock_session()
+        environment = {'AWS_ACCESS_KEY_ID': 'some_access_key', 'AWS_SECRET_ACCESS_KEY': 'some_secret_key'}
+        with patch.dict(os.environ, environment):
+            notary = TridentNotary('some_endpoint', session=session)
+        notary.send('g.V(internal_id)', {'internal_id': 'some_id'})
+        headers = session.post.call_args[1]['headers']
+        amz_date = headers['x-amz-date']
+        date_stamp = amz_date[:8]
+        canonical_request, _ = notary._generate_canonical_request(
+            amz_date, 'g.V(internal_id)', {'internal_id': 'some_id'})
+        scope = f'{date_stamp}/{TridentNotary._region}/neptune-db/aws4_request'
+        string_to_sign = notary._generate_string_to_sign(canonical_request, amz_date, scope)
+        signing_key = _reference_signing_key('some_secret_key', date_stamp, TridentNotary._region, 'neptune-db')
+        expected = hmac.new(signing_key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+        assert headers['Authorization'].endswith(f'Signature={expected}')
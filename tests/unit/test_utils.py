@@ -0,0 +1,35 @@
+import pytest
+from dateutil import parser
+
+from toll_booth.obj.utils import coerce_datetime, set_property_data_type
+
+_timestamps = [
+    '2019-03-01T12:30:00',
+    '2019-03-01 12:30:00.123456',
+    '2019-03-01T12:30:00Z',
+    '2019-03-01T12:30:00.5+05:00',
+    '2019-03-01T12:30:00-0500',
+    '2019-03-01',
+    '03/01/2019',
+    '3/1/2019 2:05:00 PM',
+    '03/01/2019 14:05',
+    '03/01/2019 2:05 PM',
+    '3/1/2019 14:05:09',
+    'March 1, 2019 2pm'
+]
+
+
+@pytest.mark.utils
+class TestUtils:
+    @pytest.mark.parametrize('timestamp', _timestamps)
+    def test_coerce_datetime(self, timestamp):
+        coerced = coerce_datetime(timestamp)
+        expected = parser.parse(timestamp)
+        assert coerced == expected
+        assert coerced.isoformat() == expected.isoformat()
+
+    @pytest.mark.parametrize('timestamp', _timestamps)
+    def test_set_datetime_property_data_type(self, timestamp):
+        results = set_property_data_type('DT', timestamp)
+        assert results == parser.parse(timestamp).isoformat(sep='T')
+        assert set_property_data_type('DT', timestamp) == results